@@ -5,12 +5,13 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Optional
 import re
+from importlib.util import find_spec
 
-try:
-    from abacusai import ApiClient
-    ABACUS_AVAILABLE = True
-except ImportError:
-    ABACUS_AVAILABLE = False
+from abacus_pool import get_client, get_client_factory, get_session_pool
+
+# Clients come from abacus_pool; this module only needs to know the SDK is installed
+ABACUS_AVAILABLE = find_spec('abacusai') is not None
+if not ABACUS_AVAILABLE:
     print("⚠️ AbacusAI not installed. Using mock data only.")
 
 # Configure logging
@@ -56,12 +57,12 @@ class AbacusManager:
             List of order dictionaries
         """
         try:
-            if not ABACUS_AVAILABLE:
+            if not ABACUS_AVAILABLE and get_client_factory() is None:
                 logger.warning("Abacus AI not available, using mock data")
                 return self._get_mock_data()
             
-            # Initialize client with API key
-            client = ApiClient(api_key)
+            # Shared process-wide client for this API key
+            client = get_client(api_key)
             logger.info(f"🤖 Connecting to Abacus AI with project {project_id}")
             
             # Try multiple methods to get data, based on your test files
@@ -70,7 +71,7 @@ class AbacusManager:
             # Method 1: Try ChatLLM approach (this worked in your tests)
             try:
                 logger.info("📋 Trying ChatLLM method...")
-                orders_data = self._get_data_via_chatllm(client, project_id)
+                orders_data = self._get_data_via_chatllm(get_session_pool(api_key, project_id))
                 if orders_data:
                     logger.info(f"✅ SUCCESS with ChatLLM: {len(orders_data)} orders")
                     return orders_data
@@ -105,18 +106,13 @@ class AbacusManager:
             logger.error(f"Error getting data from Abacus AI: {e}")
             return self._get_mock_data()
     
-    def _get_data_via_chatllm(self, client, project_id: str) -> List[Dict]:
+    def _get_data_via_chatllm(self, pool) -> List[Dict]:
         """
-        Get data using ChatLLM approach (this worked in your tests)
+        Get data using ChatLLM approach (this worked in your tests) on a pooled chat session
         """
         try:
-            # Create chat session
-            session = client.create_chat_session(project_id)
-            logger.info(f"Created chat session: {session.chat_session_id}")
-            
             # Ask for structured data
-            response = client.get_chat_response(
-                session.chat_session_id,
+            response = pool.ask(
                 "Show me all orders from the Orders sheet. Format the response as a structured list with these fields for each order: Booth #, Exhibitor Name, Item, Status, Date, Quantity, Color, Comments, Section. Include all available orders."
             )
             
@@ -300,3 +296,66 @@ class AbacusManager:
             'exhibitor_name': str(order_dict.get('exhibitor_name', order_dict.get('Exhibitor Name', ''))).strip(),
             'item': str(order_dict.get('item', order_dict.get('Item', ''))).strip(),
             'description': str(order_dict.get('description', f"Order from Abacus AI: {order_dict.get('item', 'Unknown item')}")),
+            'color': str(order_dict.get('color', order_dict.get('Color', ''))).strip(),
+            'quantity': self._safe_int(order_dict.get('quantity', order_dict.get('Quantity', 1))),
+            'status': self._map_status(str(order_dict.get('status', order_dict.get('Status', ''))).strip()),
+            'order_date': str(order_dict.get('order_date', order_dict.get('Date', ''))).strip(),
+            'comments': str(order_dict.get('comments', order_dict.get('Comments', ''))).strip(),
+            'section': str(order_dict.get('section', order_dict.get('Section', ''))).strip(),
+            'abacus_ai_processed': True,
+            'data_source': 'Abacus AI'
+        }
+    
+    def _map_status(self, status: str) -> str:
+        """
+        Map a sheet or ChatLLM status to the API status format
+        """
+        status_mapping = {
+            'delivered': 'delivered',
+            'received': 'delivered',
+            'out for delivery': 'out-for-delivery',
+            'out-for-delivery': 'out-for-delivery',
+            'in route from warehouse': 'in-route',
+            'in-route': 'in-route',
+            'in process': 'in-process',
+            'in-process': 'in-process',
+            'cancelled': 'cancelled'
+        }
+        
+        return status_mapping.get(status.strip().lower(), 'in-process')
+    
+    def _safe_int(self, value, default=1):
+        """Safely convert value to int"""
+        try:
+            return int(float(str(value))) if value else default
+        except (ValueError, TypeError):
+            return default
+    
+    def _get_mock_data(self) -> List[Dict]:
+        """
+        Mock orders used when Abacus AI is unavailable
+        """
+        return [
+            self._normalize_order({
+                'id': 'ORD-2025-001',
+                'booth_number': 'A-245',
+                'exhibitor_name': 'TechFlow Innovations',
+                'item': 'Premium Booth Setup Package',
+                'status': 'Out for delivery',
+                'order_date': 'June 14, 2025',
+                'quantity': 1,
+                'color': 'White',
+                'section': 'Section A'
+            }),
+            self._normalize_order({
+                'id': 'ORD-2025-003',
+                'booth_number': 'B-156',
+                'exhibitor_name': 'GreenWave Energy',
+                'item': 'Marketing Materials Bundle',
+                'status': 'Delivered',
+                'order_date': 'June 12, 2025',
+                'quantity': 5,
+                'color': 'Green',
+                'section': 'Section B'
+            })
+        ]
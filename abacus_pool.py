@@ -0,0 +1,256 @@
+# abacus_pool.py
+# Process-wide Abacus AI clients and a bounded pool of reusable ChatLLM sessions
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+import server_timing
+from metrics import UPSTREAM_ERRORS, UPSTREAM_SECONDS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool limits, shared by every pool in the process
+SESSION_POOL_SIZE = int(os.environ.get('ABACUS_SESSION_POOL_SIZE', 8))
+SESSION_MAX_AGE = int(os.environ.get('ABACUS_SESSION_MAX_AGE', 600))
+SESSION_MAX_USES = int(os.environ.get('ABACUS_SESSION_MAX_USES', 10))
+SESSION_VALIDATE_IDLE = float(os.environ.get('ABACUS_SESSION_VALIDATE_IDLE', 120))
+
+_clients: Dict[str, object] = {}
+_client_factory: Optional[Callable[[str], object]] = None
+_pools: Dict[Tuple[str, str], 'ChatSessionPool'] = {}
+_registry_lock = threading.Lock()
+
+def set_client_factory(factory: Optional[Callable[[str], object]]):
+    """
+    Create clients with factory(api_key) instead of abacusai.ApiClient (None restores it)
+
+    Used to run the app against a local stand-in such as the load-test fake.
+    Clients and session pools already created are dropped.
+    """
+    global _client_factory
+    with _registry_lock:
+        _client_factory = factory
+        _clients.clear()
+        _pools.clear()
+
+def get_client_factory() -> Optional[Callable[[str], object]]:
+    """The factory installed with set_client_factory, or None"""
+    return _client_factory
+
+def get_client(api_key: str):
+    """
+    Get the shared ApiClient for an API key, creating it on first use
+
+    Raises:
+        ImportError: If the abacusai package is not installed and no client factory is set
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        factory = _client_factory
+        if factory is None:
+            from abacusai import ApiClient as factory
+
+        with _registry_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = factory(api_key)
+                logger.info("🤖 Created shared Abacus AI client")
+    return client
+
+def get_session_pool(api_key: str, project_id: str) -> 'ChatSessionPool':
+    """Get the shared chat session pool for an API key and ChatLLM project"""
+    pool = _pools.get((api_key, project_id))
+    if pool is None:
+        client = get_client(api_key)
+        with _registry_lock:
+            pool = _pools.get((api_key, project_id))
+            if pool is None:
+                pool = _pools[(api_key, project_id)] = ChatSessionPool(
+                    client, project_id, max_size=SESSION_POOL_SIZE, max_age=SESSION_MAX_AGE,
+                    max_uses=SESSION_MAX_USES, validate_idle=SESSION_VALIDATE_IDLE)
+    return pool
+
+def pool_stats() -> Dict:
+    """Stats for every session pool, keyed by project ID"""
+    return {project_id: pool.stats() for (_, project_id), pool in list(_pools.items())}
+
+class PooledSession:
+    """A ChatLLM session with the bookkeeping the pool needs to recycle it"""
+
+    def __init__(self, session):
+        self.session = session
+        self.chat_session_id = session.chat_session_id
+        self.created_at = self.released_at = time.monotonic()
+        self.uses = 0
+        self.healthy = True
+
+class ChatSessionPool:
+    """
+    Chat session pool - bounded set of ChatLLM sessions reused across requests
+
+    A session is recycled once it is older than max_age or has answered
+    max_uses questions, because every answer grows the conversation the model
+    sees. A session whose request failed is discarded instead of returned.
+
+    A session left idle for validate_idle seconds may have been expired by
+    the server, so it is probed with a cheap get_chat_session call before it
+    is handed out again; one that fails the probe is discarded.
+    """
+
+    def __init__(self, client, project_id: str, max_size: int = 8, max_age: float = 600,
+                 max_uses: int = 10, acquire_timeout: float = 30, validate_idle: float = 120):
+        """
+        Initialize the pool
+
+        Args:
+            client: Shared ApiClient
+            project_id: ChatLLM project the sessions belong to
+            max_size: Maximum sessions open at once (idle plus in use)
+            max_age: Seconds after which a session is recycled
+            max_uses: Questions after which a session is recycled
+            acquire_timeout: Seconds to wait for a free session before failing
+            validate_idle: Seconds idle after which a session is probed before reuse
+        """
+        self.client = client
+        self.project_id = project_id
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.validate_idle = validate_idle
+
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._created = 0
+        self._reused = 0
+        self._recycled = 0
+        self._discarded = 0
+        self._validated = 0
+        self._expired = 0
+
+    def _is_healthy(self, pooled: PooledSession) -> bool:
+        return (pooled.healthy and pooled.uses < self.max_uses
+                and time.monotonic() - pooled.created_at < self.max_age)
+
+    def _probe(self, pooled: PooledSession) -> bool:
+        """Whether the server still knows a session that sat idle (called without the pool lock)"""
+        with self._cond:
+            self._validated += 1
+        try:
+            self.client.get_chat_session(pooled.chat_session_id)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Pooled chat session {pooled.chat_session_id} failed validation: {e}")
+            return False
+
+    def acquire(self) -> PooledSession:
+        """Take a healthy idle session (probing it if it sat idle), or open a new one if the pool has room"""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            pooled = self._acquire_idle_or_slot(deadline)
+            if pooled is None:
+                break
+            alive = time.monotonic() - pooled.released_at < self.validate_idle or self._probe(pooled)
+            with self._cond:
+                if alive:
+                    self._reused += 1
+                    return pooled
+                self._open -= 1
+                self._expired += 1
+                self._cond.notify()
+
+        try:
+            session = self.client.create_chat_session(self.project_id)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._created += 1
+        logger.info(f"✅ Created pooled chat session: {session.chat_session_id}")
+        return PooledSession(session)
+
+    def _acquire_idle_or_slot(self, deadline: float) -> Optional[PooledSession]:
+        """Pop a healthy idle session, or reserve a slot for a new one (returning None)"""
+        with self._cond:
+            while True:
+                while self._idle:
+                    pooled = self._idle.pop()
+                    if self._is_healthy(pooled):
+                        return pooled
+                    self._open -= 1
+                    self._recycled += 1
+
+                if self._open < self.max_size:
+                    self._open += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No ChatLLM session free within {self.acquire_timeout}s")
+                self._cond.wait(remaining)
+
+    def release(self, pooled: PooledSession):
+        """Return a session to the pool, dropping it if it is no longer healthy"""
+        with self._cond:
+            if self._is_healthy(pooled):
+                pooled.released_at = time.monotonic()
+                self._idle.append(pooled)
+            else:
+                self._open -= 1
+                if pooled.healthy:
+                    self._recycled += 1
+                else:
+                    self._discarded += 1
+            self._cond.notify()
+
+    @contextmanager
+    def session(self):
+        """Borrow a session for one question; a failure discards the session"""
+        pooled = self.acquire()
+        try:
+            yield pooled
+            pooled.uses += 1
+        except Exception:
+            pooled.healthy = False
+            raise
+        finally:
+            self.release(pooled)
+
+    def ask(self, question: str):
+        """Ask one question on a pooled session and return the ChatLLM response"""
+        started = time.perf_counter()
+        try:
+            with self.session() as pooled:
+                return self.client.get_chat_response(pooled.chat_session_id, question)
+        except Exception:
+            UPSTREAM_ERRORS.inc(backend='abacus', operation='chat')
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            UPSTREAM_SECONDS.observe(elapsed, backend='abacus', operation='chat')
+            server_timing.record('abacus', elapsed)
+
+    def stats(self) -> Dict:
+        """Open, idle and lifecycle counters"""
+        with self._cond:
+            return {
+                'open': self._open,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                'created': self._created,
+                'reused': self._reused,
+                'recycled': self._recycled,
+                'discarded': self._discarded,
+                'validated': self._validated,
+                'expired': self._expired
+            }
@@ -1,11 +1,13 @@
-from flask import Flask, jsonify, request, send_from_directory, send_file
+from flask import Flask, g, jsonify, request, send_from_directory, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
 import time
 import logging
 import os
 import json
-import requests
 
 # Import the Google Sheets manager (from your existing code)
 try:
@@ -15,34 +17,170 @@ except ImportError:
     SHEETS_AVAILABLE = False
     print("⚠️ Google Sheets integration not available")
 
+from abacus_pool import get_session_pool, pool_stats
+from cache import create_cache, FRESH, STALE
+from booth_updates import BoothUpdates, TooManySubscribers, format_event
+from checklist_snapshot import ChecklistSnapshot
+from checklist_parser import parse_checklist_table
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from orders_snapshot import OrdersSnapshot
+from profiling import RequestProfiler
+import server_timing
+from pagination import CursorError, ListQuery, StaleCursorError, paginate, project
+from response_encoding import EncodedBodies, IDENTITY, json_default
+from sheets_quota import SheetsQuota, SheetsQuotaExceeded, create_bucket
+from single_flight import SingleFlight
+from snapshot_history import SnapshotHistory
+from versioning import combine_versions
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """jsonify that also serializes compact order records"""
+    
+    @staticmethod
+    def default(o):
+        if callable(getattr(o, 'to_dict', None)):
+            return json_default(o)
+        return DefaultJSONProvider.default(o)
+
 # Initialize Flask app with static folder for React build
 app = Flask(__name__, static_folder='frontend/build', static_url_path='')
-CORS(app)  # Enable CORS for React app
+app.json = RecordJSONProvider(app)
+# Enable CORS for React app; the exposed headers are read by the tablet app (revalidation,
+# data age, quota throttling, phase timings)
+CORS(app, expose_headers=['ETag', 'Age', 'X-Data-Version', 'X-Data-Throttled', 'Server-Timing', 'X-Profile-Id'])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # SMART CACHING SYSTEM - Allows manual refresh override
-CACHE = {}
 CACHE_DURATION = 120  # 2 minutes cache for auto-refresh
 FORCE_REFRESH_PARAM = 'force_refresh'
 
-def get_from_cache(key, allow_cache=True):
-    if not allow_cache:
-        logger.info(f"Cache bypassed for {key} (manual refresh)")
-        return None
-        
-    if key in CACHE:
-        data, timestamp = CACHE[key]
-        if datetime.now() - timestamp < timedelta(seconds=CACHE_DURATION):
-            logger.info(f"Using cached data for {key}")
-            return data
-    return None
+# STALE-WHILE-REVALIDATE - expired entries are served while a background refresh runs,
+# until they are older than CACHE_MAX_STALENESS and a synchronous fetch is forced
+STALE_WHILE_REVALIDATE = os.environ.get('STALE_WHILE_REVALIDATE', 'true').lower() == 'true'
+CACHE_MAX_STALENESS = int(os.environ.get('CACHE_MAX_STALENESS', 900))  # 15 minutes hard limit
+REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+REFRESHING = set()
+REFRESHING_LOCK = threading.Lock()
+
+def cache_namespace(key):
+    """Group a cache key into its namespace (orders, booth, checklist, ...)"""
+    if key == "all_orders":
+        return "orders"
+    if key == "checklist_snapshot":
+        return "checklists"
+    return key.split('_', 1)[0]
+
+# BOUNDED CACHE - LRU by entry count and approximate bytes, entries past the hard
+# staleness limit are swept, and per-booth namespaces are capped so typos can't grow it.
+# CACHE_BACKEND=sqlite (or redis) shares one cache between all gunicorn workers.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+CACHE = create_cache(
+    CACHE_BACKEND,
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', 2048)),
+    max_bytes=int(os.environ.get('CACHE_MAX_MB', 256)) * 1024 * 1024,
+    max_age=CACHE_MAX_STALENESS,
+    namespace_limits={'checklist': int(os.environ.get('CACHE_MAX_CHECKLIST_ENTRIES', 1000))},
+    namespace_of=cache_namespace,
+    path=os.environ.get('CACHE_SQLITE_PATH'),
+    url=os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+)
+UPSTREAM_LEASE_SECONDS = 30  # how long other workers wait on a worker's upstream fetch
+
+# SINGLE-FLIGHT - one upstream fetch per cache key, concurrent misses wait for it
+UPSTREAM_FLIGHTS = SingleFlight(namespace_of=cache_namespace)
+
+# RESPONSE ENCODING - orjson/brotli when installed, encoded bodies cached per snapshot version
+# RESPONSE_CACHE_ENTRIES - bodies shared by every client (/api/orders, list pages, changes)
+# RESPONSE_CACHE_BOOTH_ENTRIES - per-booth bodies, budgeted apart so they cannot evict the shared ones;
+#   size it to booths x 2 booth routes x content codings (br, gzip, identity)
+BOOTH_BODY_PREFIXES = ('/api/orders/booth/', '/api/checklist/booth/')
+RESPONSE_BODIES = EncodedBodies(
+    max_entries=int(os.environ.get('RESPONSE_CACHE_ENTRIES', 256)),
+    max_bytes=int(os.environ.get('RESPONSE_CACHE_MB', 64)) * 1024 * 1024,
+    gzip_level=int(os.environ.get('RESPONSE_GZIP_LEVEL', 6)),
+    brotli_quality=int(os.environ.get('RESPONSE_BROTLI_QUALITY', 5)),
+    scope_of=lambda path: 'booth' if path.startswith(BOOTH_BODY_PREFIXES) else 'shared',
+    scope_entries={'booth': int(os.environ.get('RESPONSE_CACHE_BOOTH_ENTRIES', 2048))}
+)
+
+def get_cache_age(key):
+    """Seconds since key was cached, or None if it is not cached"""
+    return CACHE.age(key)
 
 def set_cache(key, data):
-    CACHE[key] = (data, datetime.now())
+    CACHE.set(key, data)
     logger.info(f"Cached data for {key}")
+    # A refreshed snapshot may carry changes for booths someone is streaming
+    if len(BOOTH_UPDATES):
+        BOOTH_UPDATES.wake()
+
+def load_cached(cache_key, fetch, *args, force_refresh=False, max_age=None):
+    """Serve cache_key from cache (fresh for max_age, default CACHE_DURATION), revalidating expired entries in the background"""
+    if not force_refresh:
+        max_stale = CACHE_MAX_STALENESS if STALE_WHILE_REVALIDATE else None
+        with server_timing.phase('cache') as timed:
+            cached_data, _, state = CACHE.lookup(cache_key, max_age or CACHE_DURATION, max_stale)
+            timed.description = 'hit' if state == FRESH else state
+        if cached_data and state == FRESH:
+            logger.info(f"Using cached data for {cache_key}")
+            return cached_data
+        
+        # Expired but within the hard staleness limit: serve it and refresh off the request path
+        if cached_data and state == STALE:
+            schedule_refresh(cache_key, fetch, *args)
+            return cached_data
+    
+    # Concurrent misses (including force refresh storms) share one upstream fetch
+    with server_timing.phase('fetch') as timed:
+        data, coalesced = UPSTREAM_FLIGHTS.do(cache_key, fetch_shared, cache_key, fetch, *args)
+        timed.description = 'coalesced' if coalesced else 'fetched'
+    if force_refresh and not coalesced:
+        logger.info(f"🔄 FORCE REFRESH: Fresh data loaded for {cache_key}")
+    return data
+
+def fetch_shared(cache_key, fetch, *args):
+    """Run fetch unless another worker holds the refresh lease, then use that worker's result"""
+    started = time.time()
+    if CACHE.acquire_lease(cache_key, UPSTREAM_LEASE_SECONDS):
+        try:
+            return fetch(*args)
+        finally:
+            CACHE.release_lease(cache_key)
+    
+    logger.info(f"⏳ Another worker is fetching {cache_key}, waiting for the shared cache")
+    while time.time() - started < UPSTREAM_LEASE_SECONDS:
+        time.sleep(0.1)
+        age = CACHE.age(cache_key)
+        if age is not None and age <= time.time() - started:
+            data = CACHE.get(cache_key, max_age=CACHE_MAX_STALENESS)
+            if data is not None:
+                return data
+    
+    logger.warning(f"Timed out waiting for another worker's {cache_key} fetch, fetching directly")
+    return fetch(*args)
+
+def schedule_refresh(cache_key, fetch, *args):
+    """Refresh cache_key on the background executor unless a refresh is already running"""
+    with REFRESHING_LOCK:
+        if cache_key in REFRESHING or UPSTREAM_FLIGHTS.in_flight(cache_key):
+            return
+        REFRESHING.add(cache_key)
+    
+    def refresh():
+        try:
+            UPSTREAM_FLIGHTS.do(cache_key, fetch_shared, cache_key, fetch, *args)
+            logger.info(f"♻️ Background refresh finished for {cache_key}")
+        except Exception as e:
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+        finally:
+            with REFRESHING_LOCK:
+                REFRESHING.discard(cache_key)
+    
+    logger.info(f"♻️ Serving stale {cache_key}, refreshing in background")
+    REFRESH_EXECUTOR.submit(refresh)
 
 # Initialize Google Sheets Manager
 def get_credentials():
@@ -65,11 +203,41 @@ def get_credentials():
         logger.error(f"Error setting up credentials: {e}")
         return None
 
-# Initialize Google Sheets Manager
+# SHEETS QUOTA - every Sheets API read is paid from a token bucket refilled at
+# SHEETS_QUOTA_PER_MINUTE (keep it under the project's per-minute read quota). The bucket
+# is per worker unless SHEETS_QUOTA_BACKEND (default CACHE_BACKEND) is sqlite or redis.
+# Below SHEETS_QUOTA_LOW_WATERMARK of capacity the orders TTL is stretched (up to
+# SHEETS_QUOTA_MAX_TTL_FACTOR), forced refreshes of orders younger than
+# SHEETS_QUOTA_FORCE_DEBOUNCE seconds are served from cache, and a read the bucket
+# refuses serves the cached snapshot flagged as throttled instead of mock data
+SHEETS_QUOTA_PER_MINUTE = float(os.environ.get('SHEETS_QUOTA_PER_MINUTE', 60))
+SHEETS_QUOTA = SheetsQuota(
+    create_bucket(
+        os.environ.get('SHEETS_QUOTA_BACKEND', CACHE_BACKEND),
+        'sheets_reads',
+        capacity=float(os.environ.get('SHEETS_QUOTA_BURST', SHEETS_QUOTA_PER_MINUTE)),
+        refill_per_second=SHEETS_QUOTA_PER_MINUTE / 60,
+        path=os.environ.get('SHEETS_QUOTA_SQLITE_PATH'),
+        url=os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    ),
+    low_watermark=float(os.environ.get('SHEETS_QUOTA_LOW_WATERMARK', 0.25)),
+    max_ttl_factor=float(os.environ.get('SHEETS_QUOTA_MAX_TTL_FACTOR', 4)),
+    force_refresh_debounce=float(os.environ.get('SHEETS_QUOTA_FORCE_DEBOUNCE', 30))
+)
+# Responses built from the orders snapshot, which say when it may be older than usual
+THROTTLE_REPORTED_ENDPOINTS = ('get_orders_by_booth', 'get_all_orders', 'get_order_changes',
+                               'get_show_stats', 'get_booth_dashboard')
+
+# Initialize Google Sheets Manager (SHEETS_INCREMENTAL_SYNC keeps one raw copy of the
+# Orders grid per worker, in its sync state, to diff the appended tail against)
 if SHEETS_AVAILABLE:
     credentials_path = get_credentials()
     if credentials_path:
-        gs_manager = GoogleSheetsManager(credentials_path)
+        gs_manager = GoogleSheetsManager(
+            credentials_path,
+            incremental_sync=os.environ.get('SHEETS_INCREMENTAL_SYNC', 'true').lower() == 'true',
+            quota=SHEETS_QUOTA
+        )
     else:
         gs_manager = None
         logger.warning("No valid credentials found - using mock data only")
@@ -82,10 +250,75 @@ ORDERS_SHEET_ID = "1zaRPHP3k-K1L0z3Bi_Wk--S1Xe2erOAAVYp78h18UUI"
 CHECKLIST_SHEET_ID = "1jkeob2XkPLBDgqqQqjKeQXq686EmxQhenEET8yuKvlk"
 
 # Abacus AI Configuration for Checklist - Using ChatLLM approach like orders
-ABACUS_API_BASE = "https://cloud.abacus.ai"
 CHECKLIST_DATASET_ID = "7a88a4bc0"
 CHECKLIST_FEATURE_GROUP_ID = "236a2273a"
 CHECKLIST_PROJECT_ID = "16b4367d2c"  # Same ChatLLM project as orders
+CHECKLIST_COLUMNS = "Booth #, Section, Exhibitor Name, Quantity, Item Name, Special Instructions, Status, Date, Hour"
+
+# BULK CHECKLIST INGESTION - load every booth's checklist in a few parallel paged
+# queries and partition it by booth, instead of one ChatLLM conversation per booth
+CHECKLIST_BULK_INGEST = os.environ.get('CHECKLIST_BULK_INGEST', 'true').lower() == 'true'
+CHECKLIST_PAGE_SIZE = int(os.environ.get('CHECKLIST_PAGE_SIZE', 100))
+CHECKLIST_PAGE_PARALLELISM = int(os.environ.get('CHECKLIST_PAGE_PARALLELISM', 4))
+CHECKLIST_MAX_PAGES = int(os.environ.get('CHECKLIST_MAX_PAGES', 50))
+CHECKLIST_PAGE_RETRIES = int(os.environ.get('CHECKLIST_PAGE_RETRIES', 1))  # extra attempts per failed page
+# A forced refresh re-ingests the whole sheet, so one younger than this is served from cache
+CHECKLIST_FORCE_REFRESH_DEBOUNCE = float(os.environ.get('CHECKLIST_FORCE_REFRESH_DEBOUNCE', 60))
+
+# ORDERS HISTORY - recent orders versions kept as per-order hashes for /api/orders/changes
+ORDERS_HISTORY = SnapshotHistory(
+    key_of=lambda order: order['id'],
+    max_versions=int(os.environ.get('ORDERS_HISTORY_VERSIONS', 10))
+)
+
+# BOOTH STREAMS - Server-Sent Events; one watcher per worker reads the cached snapshots
+# (refreshing them in the background) and pushes booth changes to every subscriber
+BOOTH_UPDATES = BoothUpdates(
+    check=lambda booths: check_booth_updates(booths),
+    interval=float(os.environ.get('STREAM_CHECK_INTERVAL', 30)),
+    heartbeat=float(os.environ.get('STREAM_HEARTBEAT', 15)),
+    max_subscribers=int(os.environ.get('STREAM_MAX_SUBSCRIBERS', 500))
+)
+
+# METRICS - Prometheus text at /api/metrics; request timings and mock fallbacks are counted
+# as they happen, cache, session, stream and snapshot figures are read from their stats
+# when scraped (upstream call timings are recorded in sheets_integration and abacus_pool)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Seconds per request, by route, method and status',
+    ('route', 'method', 'status'))
+MOCK_FALLBACKS = REGISTRY.counter(
+    'mock_fallbacks', 'Times mock data was served in place of upstream data, by source', ('source',))
+SNAPSHOT_CACHE_KEYS = ('all_orders', 'checklist_snapshot')
+
+# SERVER TIMING - every /api/* response carries a Server-Timing header breaking the request
+# into phases (cache, fetch, sheets, abacus, parse, index, filter, aggregate, serialize);
+# SERVER_TIMING=false turns it off
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'true').lower() == 'true'
+TRUTHY_PARAMS = ('1', 'true', 'yes')
+
+# PROFILING - opt-in (PROFILING_ENABLED); a request flagged with ?_profile=1 (or =sampling)
+# and the X-Profile-Token header, or one in every PROFILE_SAMPLE_EVERY, is profiled and
+# its report kept under the ID returned in X-Profile-Id (see /api/profiles)
+PROFILER = RequestProfiler(
+    enabled=os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true',
+    token=os.environ.get('PROFILING_TOKEN') or None,
+    sample_every=int(os.environ.get('PROFILE_SAMPLE_EVERY', 0)),
+    sample_mode=os.environ.get('PROFILE_SAMPLE_MODE', 'sampling'),
+    max_profiles=int(os.environ.get('PROFILE_MAX_STORED', 50))
+)
+# Never profiled: the stream outlives its request, and profiling the profiler is no help
+PROFILE_EXCLUDED_ENDPOINTS = ('stream_booth_updates', 'metrics', 'list_profiles', 'get_profile')
+
+# LIST ENDPOINTS - /api/orders and /api/checklist accept filters, fields= and cursor pagination
+LIST_FILTERS = ('status', 'section', 'date')
+LIST_PAGE_SIZE = int(os.environ.get('LIST_PAGE_SIZE', 500))
+LIST_MAX_PAGE_SIZE = int(os.environ.get('LIST_MAX_PAGE_SIZE', 5000))
+
+# BOOTH DASHBOARD - per-source deadlines; a source that misses its deadline is returned
+# as partial data while its fetch finishes in the background
+DASHBOARD_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='dashboard')
+DASHBOARD_ORDERS_TIMEOUT = float(os.environ.get('DASHBOARD_ORDERS_TIMEOUT', 10))
+DASHBOARD_CHECKLIST_TIMEOUT = float(os.environ.get('DASHBOARD_CHECKLIST_TIMEOUT', 20))
 
 def query_abacus_checklist(booth_number=None, force_refresh=False):
     """Query Abacus AI for checklist data using EXACT same approach as orders"""
@@ -100,22 +333,13 @@ def query_abacus_checklist(booth_number=None, force_refresh=False):
         
         logger.info(f"✅ API Key found: {api_key[:10]}...")
         
-        # Import abacusai client (EXACT same as orders)
+        # Shared client and pooled chat session (EXACT same project as orders)
         try:
-            from abacusai import ApiClient
+            pool = get_session_pool(api_key, CHECKLIST_PROJECT_ID)
         except ImportError:
             logger.error("❌ abacusai package not installed")
             return get_mock_checklist(booth_number)
         
-        client = ApiClient(api_key)
-        
-        # Use EXACT same project ID as orders
-        project_id = "16b4367d2c"  # Same ChatLLM project as orders
-        
-        # Create chat session (EXACT same as orders)
-        session = client.create_chat_session(project_id)
-        logger.info(f"✅ Created chat session: {session.chat_session_id}")
-        
         # Build query - ONLY difference is we ask for "checklist" instead of "orders"
         if booth_number:
             query = f"""Show me all items for booth number {booth_number} from the checklist sheet (not the orders sheet, the checklist sheet). 
@@ -128,8 +352,8 @@ def query_abacus_checklist(booth_number=None, force_refresh=False):
             Return as a simple table format with these columns:
             Booth #, Section, Exhibitor Name, Quantity, Item Name, Special Instructions, Status, Date, Hour"""
         
-        # Get response from ChatLLM (EXACT same as orders)
-        response = client.get_chat_response(session.chat_session_id, query)
+        # Get response from ChatLLM on a pooled session
+        response = pool.ask(query)
         logger.info(f"📋 ChatLLM Response received: {len(response.content)} characters")
         logger.info(f"📋 Response preview: {response.content[:200]}...")
         
@@ -141,110 +365,10 @@ def query_abacus_checklist(booth_number=None, force_refresh=False):
         return get_mock_checklist(booth_number)
 
 def parse_checklist_response(response_content, booth_number=None):
-    """Parse checklist response - EXACT same logic as orders parsing"""
-    logger.info(f"🔍 Parsing checklist response for booth: {booth_number}")
-    
-    checklist_items = []
-    
+    """Parse a complete checklist response with the incremental table parser"""
     try:
-        # Split response into lines (same as orders)
-        lines = response_content.strip().split('\n')
-        
-        # Find header line and data lines (same pattern as orders)
-        header_found = False
-        header_indices = {}
-        
-        for line_idx, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for header line (same logic as orders)
-            if not header_found and ('Booth' in line or 'booth' in line):
-                # Parse header to find column positions
-                headers = [h.strip() for h in line.split('|') if h.strip()]
-                for i, header in enumerate(headers):
-                    header_lower = header.lower().replace('#', '').replace(' ', '')
-                    if 'booth' in header_lower:
-                        header_indices['booth'] = i
-                    elif 'section' in header_lower:
-                        header_indices['section'] = i
-                    elif 'exhibitor' in header_lower or 'name' in header_lower:
-                        header_indices['exhibitor'] = i
-                    elif 'quantity' in header_lower:
-                        header_indices['quantity'] = i
-                    elif 'item' in header_lower:
-                        header_indices['item'] = i
-                    elif 'instruction' in header_lower:
-                        header_indices['instructions'] = i
-                    elif 'status' in header_lower:
-                        header_indices['status'] = i
-                    elif 'date' in header_lower:
-                        header_indices['date'] = i
-                    elif 'hour' in header_lower or 'time' in header_lower:
-                        header_indices['hour'] = i
-                
-                header_found = True
-                logger.info(f"📋 Found header at line {line_idx}: {header_indices}")
-                continue
-            
-            # Process data lines (same logic as orders)
-            if header_found and '|' in line:
-                try:
-                    columns = [col.strip() for col in line.split('|')]
-                    
-                    # Extract booth number
-                    booth_col = header_indices.get('booth', 0)
-                    if booth_col < len(columns):
-                        row_booth = columns[booth_col].strip()
-                        
-                        # Filter by booth number if specified (same as orders)
-                        if booth_number and str(row_booth) != str(booth_number):
-                            continue
-                        
-                        # Extract other fields
-                        section = columns[header_indices.get('section', 1)] if header_indices.get('section', 1) < len(columns) else ''
-                        exhibitor = columns[header_indices.get('exhibitor', 2)] if header_indices.get('exhibitor', 2) < len(columns) else ''
-                        quantity_str = columns[header_indices.get('quantity', 3)] if header_indices.get('quantity', 3) < len(columns) else '1'
-                        item_name = columns[header_indices.get('item', 4)] if header_indices.get('item', 4) < len(columns) else ''
-                        instructions = columns[header_indices.get('instructions', 5)] if header_indices.get('instructions', 5) < len(columns) else ''
-                        status_str = columns[header_indices.get('status', 6)] if header_indices.get('status', 6) < len(columns) else 'FALSE'
-                        date_str = columns[header_indices.get('date', 7)] if header_indices.get('date', 7) < len(columns) else ''
-                        hour_str = columns[header_indices.get('hour', 8)] if header_indices.get('hour', 8) < len(columns) else ''
-                        
-                        # Parse quantity (same as orders)
-                        try:
-                            quantity = int(quantity_str)
-                        except:
-                            quantity = 1
-                        
-                        # Parse status (TRUE/FALSE to boolean)
-                        status_cleaned = status_str.upper().strip()
-                        completed = status_cleaned in ['TRUE', 'CHECKED', 'YES', '1', 'COMPLETE', 'DONE']
-                        
-                        # Create checklist item (same structure as orders)
-                        item = {
-                            'id': f"CHK-{row_booth}-{len(checklist_items) + 1:03d}",
-                            'booth_number': str(row_booth),
-                            'section': section,
-                            'exhibitor_name': exhibitor,
-                            'quantity': quantity,
-                            'item_name': item_name,
-                            'special_instructions': instructions,
-                            'status': completed,
-                            'date': date_str,
-                            'hour': hour_str,
-                            'completed': completed,
-                            'priority': 1 if not completed else 5
-                        }
-                        
-                        checklist_items.append(item)
-                        logger.info(f"✅ Added checklist item: {item_name} (completed: {completed})")
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error parsing checklist line: {line} - {e}")
-                    continue
-        
+        with server_timing.phase('parse'):
+            checklist_items = parse_checklist_table(response_content, booth_number)
         logger.info(f"🎯 Successfully parsed {len(checklist_items)} checklist items for booth {booth_number}")
         return checklist_items
         
@@ -254,6 +378,7 @@ def parse_checklist_response(response_content, booth_number=None):
 
 def get_mock_checklist(booth_number=None):
     """Mock checklist data for testing"""
+    MOCK_FALLBACKS.inc(source='checklist')
     mock_items = [
         {
             'id': 'CHK-100-001',
@@ -317,41 +442,135 @@ def get_mock_checklist(booth_number=None):
         return [item for item in mock_items if item['booth_number'] == str(booth_number)]
     return mock_items
 
-def load_checklist_from_abacus(booth_number=None, force_refresh=False):
-    """Load checklist from Abacus AI with smart caching"""
-    cache_key = f"checklist_{booth_number}" if booth_number else "checklist_all"
+def checklist_cache_key(booth_number=None):
+    """Cache key holding a booth's checklist snapshot outside bulk mode"""
+    return f"checklist_{booth_number}" if booth_number else "checklist_all"
+
+def load_checklist_snapshot(booth_number=None, force_refresh=False):
+    """Load the checklist snapshot holding a booth's items (every booth in bulk mode) with smart caching"""
+    if CHECKLIST_BULK_INGEST:
+        age = get_cache_age("checklist_snapshot")
+        if force_refresh and age is not None and age < CHECKLIST_FORCE_REFRESH_DEBOUNCE:
+            logger.info(f"⏳ Checklist snapshot is {age:.0f}s old, serving it instead of re-ingesting every page")
+            force_refresh = False
+        return load_cached("checklist_snapshot", fetch_checklist_snapshot, force_refresh=force_refresh)
     
-    # Check cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return cached_data
+    cache_key = checklist_cache_key(booth_number)
+    return load_cached(cache_key, fetch_checklist_from_abacus, booth_number, force_refresh=force_refresh)
+
+def fetch_checklist_snapshot():
+    """Bulk-load every booth's checklist and cache the snapshot (last real snapshot, then mock data, on failure)"""
+    cache_key = "checklist_snapshot"
+    
+    try:
+        snapshot = ingest_all_checklists()
+        
+        if snapshot:
+            logger.info(f"Loaded {len(snapshot)} checklist items for {len(snapshot.booths())} booths")
+            set_cache(cache_key, snapshot)
+            return snapshot
+        
+        logger.warning("No checklist data found")
+        
+    except Exception as e:
+        logger.error(f"Error bulk loading checklist: {e}")
+    
+    # A failed refresh must not replace every booth's real checklist with mock rows
+    cached = CACHE.get(cache_key, max_age=CACHE_MAX_STALENESS)
+    if cached is not None and cached.source != 'mock':
+        logger.info(f"Keeping the last checklist snapshot ({len(cached)} items)")
+        return cached
+    
+    logger.info("Falling back to mock checklist data")
+    mock_snapshot = ChecklistSnapshot(get_mock_checklist(), source='mock')
+    set_cache(cache_key, mock_snapshot)
+    return mock_snapshot
+
+def ingest_all_checklists():
+    """Fetch the whole checklist sheet in parallel paged ChatLLM queries"""
+    api_key = os.environ.get('ABACUS_API_KEY')
+    if not api_key:
+        raise Exception("ABACUS_API_KEY not found in environment variables")
+    
+    pool = get_session_pool(api_key, CHECKLIST_PROJECT_ID)
+    
+    def fetch_page(page):
+        # A page that still fails after its retries fails the whole ingest (the caller keeps the old snapshot)
+        for attempt in range(CHECKLIST_PAGE_RETRIES + 1):
+            try:
+                return query_abacus_checklist_page(pool, page)
+            except Exception as e:
+                if attempt == CHECKLIST_PAGE_RETRIES:
+                    raise Exception(f"checklist page {page} failed: {e}") from e
+                logger.warning(f"Checklist page {page} failed, retrying: {e}")
+    
+    items = []
+    page = 0
+    with ThreadPoolExecutor(max_workers=CHECKLIST_PAGE_PARALLELISM, thread_name_prefix='checklist-page') as executor:
+        while page < CHECKLIST_MAX_PAGES:
+            # Query pages in waves; an empty page, or a short last page of a wave, ends the sheet
+            wave = range(page, min(page + CHECKLIST_PAGE_PARALLELISM, CHECKLIST_MAX_PAGES))
+            results = list(executor.map(fetch_page, wave))
+            for page_items in results:
+                items.extend(page_items)
+            page += len(wave)
+            
+            # A short page followed by rows was cut short rather than the end of the sheet
+            for page_number, page_items, next_items in zip(wave, results, results[1:]):
+                if len(page_items) < CHECKLIST_PAGE_SIZE and next_items:
+                    logger.warning(f"Checklist page {page_number} returned {len(page_items)} of "
+                                   f"{CHECKLIST_PAGE_SIZE} rows mid-sheet, the answer may be truncated")
+            if any(not page_items for page_items in results) or len(results[-1]) < CHECKLIST_PAGE_SIZE:
+                break
+    
+    logger.info(f"📋 Bulk checklist ingestion: {len(items)} items from {page} pages")
+    return ChecklistSnapshot(items)
+
+def query_abacus_checklist_page(pool, page):
+    """Ask ChatLLM for one page of checklist rows (pages are numbered from 0)"""
+    first_row = page * CHECKLIST_PAGE_SIZE + 1
+    last_row = first_row + CHECKLIST_PAGE_SIZE - 1
+    
+    # Each page borrows its own pooled session so pages can run in parallel
+    query = f"""Show me rows {first_row} to {last_row} of the checklist sheet (not the orders sheet), counting data rows only. 
+            Return as a simple table format with these columns:
+            {CHECKLIST_COLUMNS}
+            
+            Return an empty table if there are no rows in that range."""
+    
+    response = pool.ask(query)
+    logger.info(f"📋 Checklist page {page} received: {len(response.content)} characters")
+    # Parsed directly: a page that cannot be parsed fails, it is never padded with mock rows
+    with server_timing.phase('parse'):
+        return parse_checklist_table(response.content)
+
+def fetch_checklist_from_abacus(booth_number=None):
+    """Query Abacus AI for checklist items and cache them as a snapshot (mock data on failure)"""
+    cache_key = checklist_cache_key(booth_number)
     
     try:
-        checklist_items = query_abacus_checklist(booth_number, force_refresh)
+        checklist_items = query_abacus_checklist(booth_number)
         
         if checklist_items:
-            # Sort by priority (incomplete items first)
-            checklist_items.sort(key=lambda x: x['priority'])
-            set_cache(cache_key, checklist_items)
-            if force_refresh:
-                logger.info("🔄 FORCE REFRESH: Fresh checklist data loaded from Abacus AI")
-            return checklist_items
+            snapshot = ChecklistSnapshot(checklist_items)
+            set_cache(cache_key, snapshot)
+            return snapshot
         
         logger.warning("No checklist data found, using mock data")
-        mock_data = get_mock_checklist(booth_number)
-        set_cache(cache_key, mock_data)
-        return mock_data
+        mock_snapshot = ChecklistSnapshot(get_mock_checklist(booth_number), source='mock')
+        set_cache(cache_key, mock_snapshot)
+        return mock_snapshot
         
     except Exception as e:
         logger.error(f"Error loading checklist: {e}")
         logger.info("Falling back to mock checklist data")
-        mock_data = get_mock_checklist(booth_number)
-        set_cache(cache_key, mock_data)
-        return mock_data
+        mock_snapshot = ChecklistSnapshot(get_mock_checklist(booth_number), source='mock')
+        set_cache(cache_key, mock_snapshot)
+        return mock_snapshot
 
 # Mock data for testing
 def get_mock_orders():
+    MOCK_FALLBACKS.inc(source='orders')
     return [
         {
             'id': 'ORD-2025-001',
@@ -407,49 +626,59 @@ def get_mock_orders():
         }
     ]
 
-def load_orders_from_sheets(force_refresh=False):
-    """Load orders from Google Sheets with smart caching"""
+def load_orders_snapshot(force_refresh=False):
+    """Load the indexed orders snapshot from Google Sheets with smart caching (stretched while the Sheets quota is low)"""
+    quota_level = SHEETS_QUOTA.level()
+    if force_refresh and not SHEETS_QUOTA.allow_force_refresh(get_cache_age("all_orders"), quota_level):
+        logger.info("⏳ Sheets quota low, serving cached orders instead of forcing a refresh")
+        force_refresh = False
+    snapshot = load_cached("all_orders", fetch_orders_snapshot, force_refresh=force_refresh,
+                           max_age=CACHE_DURATION * SHEETS_QUOTA.ttl_factor(quota_level))
+    # Any version this worker served can be the base of a later delta request
+    ORDERS_HISTORY.record(snapshot)
+    return snapshot
+
+def fetch_orders_snapshot():
+    """Download orders from Google Sheets and cache the snapshot (mock data on failure)"""
     cache_key = "all_orders"
     
-    # Check cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return cached_data
-    
     try:
         if not gs_manager:
             logger.warning("No Google Sheets manager available, using mock data")
-            mock_data = get_mock_orders()
-            set_cache(cache_key, mock_data)
-            return mock_data
+            mock_snapshot = OrdersSnapshot(get_mock_orders(), source='mock')
+            set_cache(cache_key, mock_snapshot)
+            return mock_snapshot
             
         # Get all orders from Google Sheets
-        all_orders = []
-        data = gs_manager.get_data(ORDERS_SHEET_ID, "Orders")
+        snapshot = gs_manager.build_orders_snapshot(ORDERS_SHEET_ID, "Orders")
         
-        if data and len(data) > 0:
-            if isinstance(data, list):
-                all_orders = gs_manager.parse_orders_data(data)
-                logger.info(f"Loaded {len(all_orders)} orders from Google Sheets")
-            
-            if all_orders:
-                set_cache(cache_key, all_orders)
-                if force_refresh:
-                    logger.info("🔄 FORCE REFRESH: Fresh data loaded from Google Sheets")
-                return all_orders
+        if snapshot:
+            logger.info(f"Loaded {len(snapshot)} orders from Google Sheets")
+            set_cache(cache_key, snapshot)
+            return snapshot
         
         logger.warning("No data found in Google Sheets, using mock data")
-        mock_data = get_mock_orders()
-        set_cache(cache_key, mock_data)
-        return mock_data
+        mock_snapshot = OrdersSnapshot(get_mock_orders(), source='mock')
+        set_cache(cache_key, mock_snapshot)
+        return mock_snapshot
+        
+    except SheetsQuotaExceeded as e:
+        # Keep serving the last snapshot rather than replacing real orders with mock ones
+        cached = CACHE.get(cache_key, max_age=CACHE_MAX_STALENESS)
+        if cached is not None:
+            logger.warning(f"⏳ {e}, serving cached orders (throttled)")
+            return cached
+        logger.error(f"{e} and no orders cached, using mock data")
+        mock_snapshot = OrdersSnapshot(get_mock_orders(), source='mock')
+        set_cache(cache_key, mock_snapshot)
+        return mock_snapshot
         
     except Exception as e:
         logger.error(f"Error loading orders from sheets: {e}")
         logger.info("Falling back to mock data")
-        mock_data = get_mock_orders()
-        set_cache(cache_key, mock_data)
-        return mock_data
+        mock_snapshot = OrdersSnapshot(get_mock_orders(), source='mock')
+        set_cache(cache_key, mock_snapshot)
+        return mock_snapshot
 
 # REACT APP SERVING ROUTES
 @app.route('/')
@@ -474,6 +703,138 @@ def serve_static_files(path):
             return "Frontend not built. Please run 'npm run build' in frontend directory.", 404
 
 # API ROUTES
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe the request's latency under its route pattern (not the raw path, which would explode the series)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method,
+                                status=response.status_code)
+    return response
+
+@app.before_request
+def start_server_timing():
+    if SERVER_TIMING and request.path.startswith('/api/'):
+        server_timing.begin()
+
+@app.after_request
+def add_server_timing(response):
+    """Send the request's phase timings; Timing-Allow-Origin lets the tablet app's devtools and JS read them"""
+    timing = server_timing.end()
+    if timing is not None:
+        response.headers['Server-Timing'] = timing.header()
+        response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
+@app.before_request
+def start_request_profile():
+    if PROFILER.enabled and request.path.startswith('/api/') and request.endpoint not in PROFILE_EXCLUDED_ENDPOINTS:
+        g.request_profile = PROFILER.begin(request)
+
+@app.after_request
+def finish_request_profile(response):
+    """Store the request's profile, if it was profiled, and tell the client its ID"""
+    profile = g.pop('request_profile', None)
+    if profile is not None:
+        response.headers['X-Profile-Id'] = PROFILER.finish(profile, response.status_code)
+    return response
+
+@app.after_request
+def add_throttled_header(response):
+    """Tell clients of orders responses that the Sheets quota is holding back refreshes"""
+    if request.endpoint in THROTTLE_REPORTED_ENDPOINTS and SHEETS_QUOTA.throttled():
+        response.headers['X-Data-Throttled'] = 'sheets-quota'
+    return response
+
+@REGISTRY.collector
+def collect_metrics():
+    """Cache, upstream coalescing, session pool, booth stream and snapshot age figures for a scrape"""
+    cache_stats = CACHE.stats()
+    namespaces = cache_stats['namespaces']
+    yield ('cache_lookups_total', 'counter', 'Cache lookups in this worker, by key namespace and result',
+           [({'namespace': namespace, 'result': result}, counters[key])
+            for namespace, counters in namespaces.items()
+            for result, key in (('hit', 'hits'), ('stale', 'stale_hits'), ('miss', 'misses'))])
+    yield ('cache_entries', 'gauge', 'Cached entries, by key namespace',
+           [({'namespace': namespace}, counters['entries']) for namespace, counters in namespaces.items()])
+    yield ('cache_evictions_total', 'counter', 'Entries evicted to stay within the cache limits',
+           [({}, cache_stats['evictions'])])
+    
+    flights = UPSTREAM_FLIGHTS.stats()
+    yield ('upstream_fetches_total', 'counter', 'Upstream loads started, and requests that waited on one instead',
+           [({'result': 'fetched'}, flights['fetches']), ({'result': 'coalesced'}, flights['coalesced'])])
+    
+    yield ('abacus_sessions', 'gauge', 'Pooled ChatLLM sessions, by project and state',
+           [({'project': project, 'state': state}, stats[state])
+            for project, stats in pool_stats().items() for state in ('open', 'idle')])
+    
+    yield ('booth_stream_subscribers', 'gauge', 'Open booth update streams',
+           [({}, BOOTH_UPDATES.stats()['subscribers'])])
+    
+    quota = SHEETS_QUOTA.stats()
+    yield ('sheets_quota_level', 'gauge', 'Fraction of the Sheets read budget available',
+           [({'backend': quota['backend']}, quota['level'])])
+    yield ('sheets_quota_reads_total', 'counter', 'Sheets reads this worker paid for, and reads the budget refused',
+           [({'result': 'spent'}, quota['spent']), ({'result': 'refused'}, quota['refused'])])
+    yield ('sheets_quota_debounced_refreshes_total', 'counter', 'Forced orders refreshes served from cache to save quota',
+           [({}, quota['debounced_force_refreshes'])])
+    
+    ages = [(key, CACHE.age(key)) for key in SNAPSHOT_CACHE_KEYS]
+    yield ('snapshot_age_seconds', 'gauge', 'Seconds since each cached snapshot was loaded',
+           [({'key': key}, age) for key, age in ages if age is not None])
+
+def with_data_age(response, data_age):
+    """Report how old the data in a response is through the standard Age header"""
+    response.headers['Age'] = str(int(data_age))
+    return response
+
+def versioned_json(payload, version, data_age, cache_body=False):
+    """
+    JSON response tagged with a strong ETag, compressed to match Accept-Encoding
+    
+    A client that already has this version gets 304 without the payload being
+    encoded. With cache_body the encoded bytes are kept per version, for
+    payloads that are a pure function of the snapshot they came from.
+    
+    ?_timing=1 adds the request's phase timings to an object payload as
+    _timing; such a body is unique to the request, so it is neither cached
+    nor tagged with the version's ETag.
+    """
+    timing = server_timing.current()
+    if timing is not None and isinstance(payload, dict) and request.args.get('_timing') in TRUTHY_PARAMS:
+        payload = dict(payload, _timing=timing.as_dict())
+        with server_timing.phase('serialize'):
+            response = app.response_class(RESPONSE_BODIES.encode(payload, IDENTITY), mimetype='application/json')
+        response.headers['X-Data-Version'] = version
+        response.cache_control.no_store = True
+        return with_data_age(response, data_age)
+    
+    encoding = RESPONSE_BODIES.negotiate(request.accept_encodings)
+    # Each content coding is a different representation, so it gets its own strong ETag
+    etag = version if encoding == IDENTITY else f"{version}-{encoding}"
+    
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        with server_timing.phase('serialize', encoding):
+            body = RESPONSE_BODIES.encode(payload, encoding, key=request.path if cache_body else None, version=version)
+        response = app.response_class(body, mimetype='application/json')
+        if encoding != IDENTITY:
+            response.headers['Content-Encoding'] = encoding
+    
+    response.set_etag(etag)
+    # The bare version, e.g. for /api/orders/changes?since=, whatever the content coding
+    response.headers['X-Data-Version'] = version
+    response.vary.add('Accept-Encoding')
+    # Browsers revalidate on every poll instead of heuristically reusing their copy
+    response.cache_control.no_cache = True
+    return with_data_age(response, data_age)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -482,9 +843,54 @@ def health_check():
         'timestamp': datetime.now().isoformat(),
         'google_sheets_connected': gs_manager is not None,
         'abacus_checklist_enabled': os.environ.get('ABACUS_API_KEY') is not None,
-        'cache_size': len(CACHE)
+        'cache_size': len(CACHE),
+        'cache_backend': CACHE_BACKEND,
+        'sheets_sync': gs_manager.sync_stats if gs_manager else None,
+        'sheets_quota': SHEETS_QUOTA.stats(),
+        'abacus_sessions': pool_stats(),
+        'cache': CACHE.stats(),
+        'response_bodies': RESPONSE_BODIES.stats(),
+        'booth_streams': BOOTH_UPDATES.stats(),
+        'orders_history': ORDERS_HISTORY.stats(),
+        'upstream_flights': UPSTREAM_FLIGHTS.stats()
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this worker"""
+    return app.response_class(REGISTRY.render(), mimetype=None, content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """Stored request profiles in this worker, newest first"""
+    if not PROFILER.enabled:
+        return jsonify({'error': 'Profiling is not enabled'}), 404
+    if not PROFILER.authorized(request.headers):
+        return jsonify({'error': 'Missing or wrong X-Profile-Token'}), 403
+    return jsonify({'profiles': PROFILER.list(), 'sample_every': PROFILER.sample_every})
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """One request profile as a text report, or with ?format=raw as pstats data (cprofile) or folded stacks (sampling)"""
+    if not PROFILER.enabled:
+        return jsonify({'error': 'Profiling is not enabled'}), 404
+    if not PROFILER.authorized(request.headers):
+        return jsonify({'error': 'Missing or wrong X-Profile-Token'}), 403
+    
+    record = PROFILER.get(profile_id)
+    if record is None:
+        return jsonify({'error': f'No profile {profile_id} in this worker (it may have been dropped or taken on another worker)'}), 404
+    
+    if request.args.get('format') == 'raw':
+        if record['mode'] == 'sampling':
+            return app.response_class(record['data'], mimetype='text/plain')
+        response = app.response_class(record['data'], mimetype='application/octet-stream')
+        response.headers['Content-Disposition'] = f'attachment; filename={profile_id}.pstats'
+        return response
+    
+    header = f"{record['method']} {record['path']} -> {record['status']} in {record['duration_ms']} ms ({record['mode']}, {record['reason']})\n\n"
+    return app.response_class(header + record['report'], mimetype='text/plain')
+
 @app.route('/api/abacus-status', methods=['GET'])
 def abacus_status():
     """System status endpoint"""
@@ -498,62 +904,149 @@ def abacus_status():
         'checklist_integration': 'Abacus AI Enabled'
     })
 
+def list_response(snapshot, records, data_age):
+    """
+    Whole snapshot list, or the filtered, projected and paginated selection the request asks for
+    
+    Paginated responses are an envelope with items and next_cursor; a cursor
+    from an older snapshot version gets 409 so the client restarts from page one.
+    """
+    try:
+        query = ListQuery.from_args(request.args, LIST_FILTERS, LIST_MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if query.is_plain:
+        return versioned_json(records, snapshot.version, data_age, cache_body=True)
+    
+    try:
+        with server_timing.phase('filter'):
+            if query.filters:
+                records = snapshot.select(**query.filters)
+            payload = paginate(records, snapshot.version, query, LIST_PAGE_SIZE) if query.paginated else project(records, query.fields)
+    except StaleCursorError as e:
+        return jsonify({'error': str(e), 'version': snapshot.version}), 409
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return versioned_json(payload, combine_versions(snapshot.version, query.response_key()), data_age, cache_body=True)
+
+# BOOTH PAYLOADS - shared by the booth endpoints and the combined dashboard. Each payload is
+# a pure function of its version (the booth's strong ETag); how old the data is travels
+# separately, in the Age header or via with_data_freshness for unversioned bodies
+def with_data_freshness(payload, data_age):
+    """Copy of a booth payload with last_updated and data_age_seconds, for the dashboard and stream events"""
+    return dict(payload, last_updated=(datetime.now() - timedelta(seconds=data_age)).isoformat(),
+                data_age_seconds=round(data_age, 1))
+
+def build_booth_orders(booth_number, force_refresh=False, snapshot=None):
+    """Orders payload for one booth, looked up in the cached (or given) snapshot's booth index; returns (payload, data age)"""
+    if snapshot is None:
+        snapshot = load_orders_snapshot(force_refresh=force_refresh)
+    with server_timing.phase('filter'):
+        booth_orders = snapshot.for_booth(booth_number)
+        booth_stats = snapshot.booth_stats(booth_number)
+    data_age = (datetime.now() - snapshot.loaded_at).total_seconds()
+    
+    return {
+        'booth': booth_number,
+        'orders': booth_orders,
+        'total_orders': booth_stats['total_orders'],
+        'delivered_orders': booth_stats['delivered_orders'],
+        'status_counts': booth_stats['by_status'],
+        'version': snapshot.booth_version(booth_number)
+    }, data_age
+
+def booth_orders_error(booth_number, error):
+    """Empty orders payload for a booth whose orders could not be loaded"""
+    return {
+        'booth': booth_number,
+        'orders': [],
+        'total_orders': 0,
+        'delivered_orders': 0,
+        'last_updated': datetime.now().isoformat(),
+        'error': error
+    }
+
+def build_booth_checklist(booth_number, force_refresh=False, snapshot=None):
+    """Checklist payload for one booth with completion counts, from the cached (or given) snapshot; returns (payload, data age)"""
+    if snapshot is None:
+        snapshot = load_checklist_snapshot(booth_number, force_refresh=force_refresh)
+    with server_timing.phase('filter'):
+        booth_items = snapshot.for_booth(booth_number)
+        booth_stats = snapshot.booth_stats(booth_number)
+    data_age = (datetime.now() - snapshot.loaded_at).total_seconds()
+    
+    return {
+        'booth': booth_number,
+        'exhibitor_name': booth_stats.get('exhibitor_name') or f'Booth {booth_number} Exhibitor',
+        'checklist_items': booth_items,
+        'total_items': booth_stats['total_items'],
+        'completed_items': booth_stats['completed_items'],
+        'pending_items': booth_stats['pending_items'],
+        'completion_percentage': booth_stats['completion_percentage'],
+        'version': snapshot.booth_version(booth_number)
+    }, data_age
+
+def booth_checklist_error(booth_number, error):
+    """Empty checklist payload for a booth whose checklist could not be loaded"""
+    return {
+        'booth': booth_number,
+        'exhibitor_name': f'Booth {booth_number} Exhibitor',
+        'checklist_items': [],
+        'total_items': 0,
+        'completed_items': 0,
+        'pending_items': 0,
+        'completion_percentage': 0,
+        'last_updated': datetime.now().isoformat(),
+        'error': error
+    }
+
 # ORDERS ENDPOINTS (Keep existing functionality)
 @app.route('/api/orders/booth/<booth_number>', methods=['GET'])
 def get_orders_by_booth(booth_number):
     """Get orders for a specific booth number with smart caching"""
-    cache_key = f"booth_{booth_number}"
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
     
-    # Try cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return jsonify(cached_data)
-    
     try:
-        # Get all orders and filter by booth number
-        all_orders = load_orders_from_sheets(force_refresh=force_refresh)
-        booth_orders = [
-            order for order in all_orders 
-            if order['booth_number'].lower() == booth_number.lower()
-        ]
-        
-        delivered_count = len([o for o in booth_orders if o['status'] == 'delivered'])
-        
-        result = {
-            'booth': booth_number,
-            'orders': booth_orders,
-            'total_orders': len(booth_orders),
-            'delivered_orders': delivered_count,
-            'last_updated': datetime.now().isoformat(),
-            'force_refreshed': force_refresh
-        }
-        
-        set_cache(cache_key, result)
+        result, data_age = build_booth_orders(booth_number, force_refresh=force_refresh)
         
         if force_refresh:
             logger.info(f"🔄 MANUAL REFRESH: Fresh data for booth {booth_number}")
         
-        return jsonify(result)
+        return versioned_json(result, result['version'], data_age, cache_body=True)
         
     except Exception as e:
         logger.error(f"Error getting orders for booth {booth_number}: {e}")
-        return jsonify({
-            'booth': booth_number,
-            'orders': [],
-            'total_orders': 0,
-            'delivered_orders': 0,
-            'last_updated': datetime.now().isoformat(),
-            'error': str(e)
-        }), 500
+        return jsonify(booth_orders_error(booth_number, str(e))), 500
 
 @app.route('/api/orders', methods=['GET'])
 def get_all_orders():
-    """Get all orders with smart caching"""
+    """Get all orders with smart caching (filters, fields= and cursor pagination are optional)"""
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
-    orders = load_orders_from_sheets(force_refresh=force_refresh)
-    return jsonify(orders)
+    snapshot = load_orders_snapshot(force_refresh=force_refresh)
+    data_age = (datetime.now() - snapshot.loaded_at).total_seconds()
+    return list_response(snapshot, snapshot.orders, data_age)
+
+@app.route('/api/orders/changes', methods=['GET'])
+def get_order_changes():
+    """Get orders added, changed or removed since a version, or a resync marker when it is no longer retained"""
+    since = request.args.get('since')
+    if not since:
+        return jsonify({'error': 'since is required (X-Data-Version of the last /api/orders response, or version of the last changes)'}), 400
+    
+    force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
+    snapshot = load_orders_snapshot(force_refresh=force_refresh)
+    data_age = (datetime.now() - snapshot.loaded_at).total_seconds()
+    
+    delta = ORDERS_HISTORY.changes(since, snapshot)
+    if delta is None:
+        logger.info(f"Orders version {since[:8]} is no longer retained, client must resync")
+        payload = {'since': since, 'version': snapshot.version, 'resync': True}
+    else:
+        payload = dict(delta, since=since, version=snapshot.version, resync=False)
+    
+    return versioned_json(payload, combine_versions(since, snapshot.version), data_age, cache_body=True)
 
 # NEW CHECKLIST ENDPOINTS
 @app.route('/api/checklist/test', methods=['GET'])
@@ -575,7 +1068,7 @@ def test_abacus_connection():
         logger.info("🧪 Testing ChatLLM approach for checklist data")
         
         try:
-            from abacusai import ApiClient
+            pool = get_session_pool(api_key, CHECKLIST_PROJECT_ID)
         except ImportError:
             return jsonify({
                 'error': 'abacusai package not installed',
@@ -583,17 +1076,12 @@ def test_abacus_connection():
                 'instructions': 'Install abacusai package: pip install abacusai'
             })
         
-        client = ApiClient(api_key)
-        
-        # Test chat session creation
-        session = client.create_chat_session(CHECKLIST_PROJECT_ID)
-        logger.info(f"✅ Created chat session: {session.chat_session_id}")
-        
-        # Test checklist query
+        # Test checklist query on a pooled chat session
         query = f"""Show me checklist items for booth {booth_number} from the checklist sheet. 
         Format as JSON with fields: Booth #, Section, Exhibitor Name, Quantity, Item Name, Special Instructions, Status, Date, Hour"""
         
-        response = client.get_chat_response(session.chat_session_id, query)
+        with pool.session() as session:
+            response = pool.client.get_chat_response(session.chat_session_id, query)
         
         # Try to parse the response
         parsed_items = []
@@ -638,70 +1126,142 @@ def test_abacus_connection():
 @app.route('/api/checklist/booth/<booth_number>', methods=['GET'])
 def get_checklist_by_booth(booth_number):
     """Get checklist items for a specific booth number"""
-    cache_key = f"checklist_booth_{booth_number}"
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
     
-    # Try cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return jsonify(cached_data)
-    
     try:
-        # Get checklist items for the booth
-        checklist_items = load_checklist_from_abacus(booth_number, force_refresh=force_refresh)
-        
-        completed_count = len([item for item in checklist_items if item['completed']])
-        pending_count = len([item for item in checklist_items if not item['completed']])
-        
-        # Get exhibitor name from first item
-        exhibitor_name = checklist_items[0]['exhibitor_name'] if checklist_items else f'Booth {booth_number} Exhibitor'
-        
-        result = {
-            'booth': booth_number,
-            'exhibitor_name': exhibitor_name,
-            'checklist_items': checklist_items,
-            'total_items': len(checklist_items),
-            'completed_items': completed_count,
-            'pending_items': pending_count,
-            'completion_percentage': round((completed_count / len(checklist_items)) * 100, 1) if checklist_items else 0,
-            'last_updated': datetime.now().isoformat(),
-            'force_refreshed': force_refresh
-        }
-        
-        set_cache(cache_key, result)
+        result, data_age = build_booth_checklist(booth_number, force_refresh=force_refresh)
         
         if force_refresh:
             logger.info(f"🔄 MANUAL REFRESH: Fresh checklist data for booth {booth_number}")
         
-        return jsonify(result)
+        return versioned_json(result, result['version'], data_age, cache_body=True)
         
     except Exception as e:
         logger.error(f"Error getting checklist for booth {booth_number}: {e}")
-        return jsonify({
-            'booth': booth_number,
-            'exhibitor_name': f'Booth {booth_number} Exhibitor',
-            'checklist_items': [],
-            'total_items': 0,
-            'completed_items': 0,
-            'pending_items': 0,
-            'completion_percentage': 0,
-            'last_updated': datetime.now().isoformat(),
-            'error': str(e)
-        }), 500
+        return jsonify(booth_checklist_error(booth_number, str(e))), 500
 
 @app.route('/api/checklist', methods=['GET'])
 def get_all_checklist():
-    """Get all checklist items with smart caching"""
+    """Get all checklist items with smart caching (filters, fields= and cursor pagination are optional)"""
+    force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
+    snapshot = load_checklist_snapshot(force_refresh=force_refresh)
+    data_age = (datetime.now() - snapshot.loaded_at).total_seconds()
+    return list_response(snapshot, snapshot.items, data_age)
+
+# BOOTH UPDATE STREAM - push instead of polling or forced refreshes
+def check_booth_updates(booths):
+    """Push order and checklist changes for the streamed booths (runs on the booth update watcher)"""
+    orders_snapshot = load_orders_snapshot()
+    for booth in booths:
+        BOOTH_UPDATES.publish_if_changed(
+            booth, 'orders', orders_snapshot.booth_version(booth), orders_snapshot.loaded_at,
+            lambda: with_data_freshness(*build_booth_orders(booth, snapshot=orders_snapshot)))
+        checklist_snapshot = load_checklist_snapshot(booth)
+        BOOTH_UPDATES.publish_if_changed(
+            booth, 'checklist', checklist_snapshot.booth_version(booth), checklist_snapshot.loaded_at,
+            lambda: with_data_freshness(*build_booth_checklist(booth, snapshot=checklist_snapshot)))
+
+def booth_update(source, snapshot, build, booth_number):
+    """A booth's payload from source as a queued stream update (see booth_updates.Update)"""
+    payload = with_data_freshness(*build(booth_number, snapshot=snapshot))
+    return (source, snapshot.loaded_at, payload['version'], format_event(source, payload, payload['version']))
+
+@app.route('/api/stream/booth/<booth_number>', methods=['GET'])
+def stream_booth_updates(booth_number):
+    """Stream a booth's orders and checklist as Server-Sent Events, pushing each change as it is detected"""
+    # Subscribe before building the initial payload, so a change published meanwhile is queued, not lost
+    try:
+        subscription = BOOTH_UPDATES.subscribe(booth_number)
+    except TooManySubscribers as e:
+        logger.warning(f"Refusing update stream for booth {booth_number}: {e}")
+        return jsonify({'error': str(e)}), 503
+    
+    try:
+        initial = [booth_update('orders', load_orders_snapshot(), build_booth_orders, booth_number),
+                   booth_update('checklist', load_checklist_snapshot(booth_number), build_booth_checklist, booth_number)]
+    except Exception as e:
+        BOOTH_UPDATES.unsubscribe(subscription)
+        logger.error(f"Error starting update stream for booth {booth_number}: {e}")
+        return jsonify({'error': str(e)}), 500
+    
+    logger.info(f"📡 Booth {booth_number} subscribed to updates ({len(BOOTH_UPDATES)} streams open)")
+    response = app.response_class(BOOTH_UPDATES.stream(subscription, initial), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# SHOW-WIDE STATS - rollups materialized when each snapshot is loaded
+@app.route('/api/stats', methods=['GET'])
+def get_show_stats():
+    """Get show-wide order and checklist progress per booth, section and exhibitor"""
+    force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
+    
+    try:
+        orders_snapshot = load_orders_snapshot(force_refresh=force_refresh)
+        checklist_snapshot = load_checklist_snapshot(force_refresh=force_refresh)
+        data_age = max((datetime.now() - orders_snapshot.loaded_at).total_seconds(),
+                       (datetime.now() - checklist_snapshot.loaded_at).total_seconds())
+        with server_timing.phase('aggregate'):
+            orders_stats = orders_snapshot.stats()
+            checklist_stats = checklist_snapshot.stats()
+        
+        return versioned_json({
+            'orders': orders_stats,
+            'checklist': checklist_stats,
+            'orders_source': orders_snapshot.source,
+            'checklist_source': checklist_snapshot.source
+        }, combine_versions(orders_snapshot.version, checklist_snapshot.version), data_age)
+        
+    except Exception as e:
+        logger.error(f"Error getting show stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# COMBINED BOOTH DASHBOARD - orders and checklist fetched concurrently in one call
+@app.route('/api/booth/<booth_number>/dashboard', methods=['GET'])
+def get_booth_dashboard(booth_number):
+    """Get orders and checklist for a booth in one payload, fetching both sources in parallel"""
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
-    checklist_items = load_checklist_from_abacus(force_refresh=force_refresh)
-    return jsonify(checklist_items)
+    sources = {
+        'orders': (build_booth_orders, booth_orders_error, DASHBOARD_ORDERS_TIMEOUT),
+        'checklist': (build_booth_checklist, booth_checklist_error, DASHBOARD_CHECKLIST_TIMEOUT)
+    }
+    
+    futures = {
+        name: DASHBOARD_EXECUTOR.submit(lambda build=build: with_data_freshness(*build(booth_number, force_refresh)))
+        for name, (build, _, _) in sources.items()
+    }
+    
+    # Both fetches run at once, so each deadline is measured from the same start
+    started = time.monotonic()
+    result = {'booth': booth_number, 'partial': False, 'force_refreshed': force_refresh}
+    for name, (_, error_payload, timeout) in sources.items():
+        try:
+            result[name] = futures[name].result(timeout=max(timeout - (time.monotonic() - started), 0))
+        except FutureTimeoutError:
+            # The fetch keeps running and fills the cache for the next poll
+            logger.warning(f"⏱️ Dashboard {name} for booth {booth_number} timed out after {timeout}s")
+            result[name] = dict(error_payload(booth_number, f'{name} source timed out after {timeout}s'), pending=True)
+            result['partial'] = True
+        except Exception as e:
+            logger.error(f"Error getting dashboard {name} for booth {booth_number}: {e}")
+            result[name] = error_payload(booth_number, str(e))
+            result['partial'] = True
+    
+    if not result['checklist'].get('error'):
+        result['exhibitor_name'] = result['checklist']['exhibitor_name']
+    elif result['orders']['orders']:
+        result['exhibitor_name'] = result['orders']['orders'][0]['exhibitor_name']
+    else:
+        result['exhibitor_name'] = f'Booth {booth_number} Exhibitor'
+    
+    ages = [result[name]['data_age_seconds'] for name in sources if 'data_age_seconds' in result[name]]
+    return with_data_age(jsonify(result), max(ages) if ages else 0)
 
 @app.route('/api/clear-cache', methods=['POST'])
 def clear_cache():
     """Clear all cached data - useful for forcing fresh data"""
-    global CACHE
-    CACHE = {}
+    CACHE.clear()
     logger.info("🗑️ Cache cleared manually")
     return jsonify({'message': 'Cache cleared successfully'})
 
@@ -0,0 +1,5 @@
+# benchmarks
+# Offline benchmarks for the API's hot paths; run from the repository root, e.g.
+#   python -m benchmarks.bench_responses
+# or the whole offline suite, as JSON results comparable across commits:
+#   python -m benchmarks.suite --output results.json --compare baseline.json
@@ -0,0 +1,59 @@
+# benchmarks/baselines.py
+# Earlier implementations of optimized hot paths, kept verbatim so benchmarks can
+# report before/after numbers against the same synthetic input
+
+from typing import Dict, List
+
+def legacy_parse_orders(manager, data: List[List]) -> List[Dict]:
+    """parse_orders_data as it was before compact records: a row_dict per row, a 16-key dict per order"""
+    orders = []
+    if not data or len(data) < 2:
+        return []
+
+    header_row_idx = 0
+    headers = []
+    for i, row in enumerate(data):
+        if any('Booth' in str(cell) for cell in row):
+            headers = [str(cell).strip() for cell in row]
+            header_row_idx = i
+            break
+    if not headers:
+        headers = [str(cell).strip() for cell in data[0]]
+        header_row_idx = 0
+
+    for row_idx, row in enumerate(data[header_row_idx + 1:], start=header_row_idx + 1):
+        if not row or len(row) == 0:
+            continue
+
+        row_dict = {}
+        for i, value in enumerate(row):
+            if i < len(headers):
+                row_dict[headers[i]] = str(value).strip()
+
+        booth_num = row_dict.get('Booth #', '').strip()
+        exhibitor_name = row_dict.get('Exhibitor Name', '').strip()
+        item = row_dict.get('Item', '').strip()
+        if not booth_num or not exhibitor_name:
+            continue
+
+        date = row_dict.get('Date', '').strip()
+        order_id = f"ORD-{date.replace('/', '-')}-{booth_num}-{row_idx}"
+        orders.append({
+            'id': order_id,
+            'booth_number': booth_num,
+            'exhibitor_name': exhibitor_name,
+            'item': item,
+            'description': f"Order from Google Sheets: {item}",
+            'color': row_dict.get('Color', '').strip(),
+            'quantity': manager._safe_int(row_dict.get('Quantity', '1')),
+            'status': manager.map_order_status(row_dict.get('Status', '').strip()),
+            'order_date': date,
+            'comments': row_dict.get('Comments', '').strip(),
+            'section': row_dict.get('Section', '').strip(),
+            'type': row_dict.get('Type', '').strip(),
+            'user': row_dict.get('User', '').strip(),
+            'hour': row_dict.get('Hour', '').strip(),
+            'abacus_ai_processed': True,
+            'data_source': 'Google Sheets via Abacus AI'
+        })
+    return orders
@@ -0,0 +1,58 @@
+# benchmarks/bench_order_memory.py
+# Memory held by parsed orders: per-row dicts (before) versus compact OrderRecords, with the
+# raw rows released (full sync) and kept alive as incremental sync keeps them in its state
+#
+#   python -m benchmarks.bench_order_memory --orders 100000
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.baselines import legacy_parse_orders
+from benchmarks.fixtures import downloaded_rows, sheets_manager
+
+def _retained(parse, orders: int, keep_rows: bool) -> Dict:
+    """Bytes still allocated after parsing: the parsed orders, plus the raw rows when keep_rows"""
+    gc.collect()
+    tracemalloc.start()
+    rows = downloaded_rows(orders)
+    started = time.perf_counter()
+    parsed = parse(rows)
+    elapsed = time.perf_counter() - started
+    if not keep_rows:
+        del rows
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'orders': len(parsed), 'retained_bytes': retained, 'peak_bytes': peak, 'parse_seconds': elapsed}
+
+def run(orders: int = 100000) -> List[Dict]:
+    """Measure both representations under both sync modes; returns one result row each"""
+    manager = sheets_manager()
+    results = []
+    for sync, keep_rows in (('full', False), ('incremental', True)):
+        for name, parse in (('before: dict per order', lambda rows: legacy_parse_orders(manager, rows)),
+                            ('after: OrderRecord', manager.parse_orders_data)):
+            result = _retained(parse, orders, keep_rows)
+            result['representation'] = name
+            result['sync'] = sync
+            result['bytes_per_order'] = result['retained_bytes'] / max(result['orders'], 1)
+            result['mb_per_100k'] = result['bytes_per_order'] * 100000 / 1024 / 1024
+            results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory held by parsed orders")
+    parser.add_argument('--orders', type=int, default=100000, help='Synthetic orders to parse')
+    args = parser.parse_args()
+
+    print(f"{args.orders} synthetic orders, memory retained after parsing; incremental sync also keeps the raw rows")
+    print(f"{'sync':<12} {'representation':<24} {'bytes/order':>12} {'MB/100k':>9} {'peak MB':>9} {'parse s':>8}")
+    for row in run(args.orders):
+        print(f"{row['sync']:<12} {row['representation']:<24} {row['bytes_per_order']:>12.0f} {row['mb_per_100k']:>9.1f} "
+              f"{row['peak_bytes'] / 1024 / 1024:>9.1f} {row['parse_seconds']:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_parser.py
+# Orders sheet parser throughput on synthetic sheets: the row_dict parser (before)
+# versus the precompiled column mapping in parse_orders_data
+#
+#   python -m benchmarks.bench_parser --sizes 10000 100000 1000000
+
+import argparse
+import gc
+import time
+from typing import Dict, List
+
+from benchmarks.baselines import legacy_parse_orders
+from benchmarks.fixtures import downloaded_rows, sheets_manager
+
+def _best_of(parse, rows, repeat: int) -> float:
+    """Fastest of repeat runs in seconds (garbage collection paused, as in a steady worker)"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            parse(rows)
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run(sizes=(10000, 100000), repeat: int = 3) -> List[Dict]:
+    """Measure both parsers at each sheet size; returns one result row per parser and size"""
+    manager = sheets_manager()
+    parsers = (('before: row_dict', lambda rows: legacy_parse_orders(manager, rows)),
+               ('after: column mapping', manager.parse_orders_data))
+    results = []
+    for size in sizes:
+        rows = downloaded_rows(size)
+        for name, parse in parsers:
+            seconds = _best_of(parse, rows, repeat if size < 1000000 else 1)
+            results.append({
+                'parser': name,
+                'rows': size,
+                'seconds': seconds,
+                'rows_per_second': size / seconds
+            })
+        del rows
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Orders sheet parser throughput")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Sheet sizes in rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size (best is reported; 1M rows run once)')
+    args = parser.parse_args()
+
+    print(f"{'parser':<24} {'rows':>9} {'seconds':>9} {'rows/s':>11}")
+    for row in run(args.sizes, args.repeat):
+        print(f"{row['parser']:<24} {row['rows']:>9} {row['seconds']:>9.3f} {row['rows_per_second']:>11.0f}")
+
+if __name__ == '__main__':
+    main()
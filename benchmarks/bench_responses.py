@@ -0,0 +1,147 @@
+# benchmarks/bench_responses.py
+# Bytes on the wire and CPU per /api/orders response: plain jsonify (before) versus
+# the versioned_json path (fast JSON, gzip/brotli, encoded bodies cached per version), and
+# the body cache hit rate when every booth tablet polls its own routes
+#
+#   python -m benchmarks.bench_responses --orders 5000 --repeat 50 --booths 300
+
+import argparse
+import logging
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.fixtures import parsed_orders
+
+def _cpu_per_call(fn, repeat: int) -> float:
+    """Mean CPU milliseconds per call"""
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) * 1000 / repeat
+
+def run(orders: int = 5000, repeat: int = 50) -> List[Dict]:
+    """Measure each response path; returns one result row per path"""
+    logging.disable(logging.CRITICAL)
+    import app
+    from flask import jsonify
+    from orders_snapshot import OrdersSnapshot
+    from response_encoding import EncodedBodies, supported_encodings
+
+    snapshot = OrdersSnapshot(parsed_orders(orders))
+    configured = app.RESPONSE_BODIES
+    results = []
+
+    with app.app.test_request_context('/api/orders'):
+        body = jsonify(snapshot.orders).get_data()
+        results.append({
+            'path': 'before: jsonify',
+            'encoding': 'identity',
+            'bytes': len(body),
+            'cpu_ms_first': _cpu_per_call(lambda: jsonify(snapshot.orders).get_data(), 1),
+            'cpu_ms_repeat': _cpu_per_call(lambda: jsonify(snapshot.orders).get_data(), repeat)
+        })
+
+    for encoding in supported_encodings():
+        headers = {'Accept-Encoding': encoding}
+        with app.app.test_request_context('/api/orders', headers=headers):
+            app.RESPONSE_BODIES = EncodedBodies()
+            respond = lambda: app.versioned_json(snapshot.orders, snapshot.version, 0, cache_body=True).get_data()
+            first = _cpu_per_call(respond, 1)
+            results.append({
+                'path': 'after: versioned_json',
+                'encoding': encoding,
+                'bytes': len(respond()),
+                'cpu_ms_first': first,
+                'cpu_ms_repeat': _cpu_per_call(respond, repeat)
+            })
+
+        etag = snapshot.version if encoding == 'identity' else f'{snapshot.version}-{encoding}'
+        with app.app.test_request_context('/api/orders', headers=dict(headers, **{'If-None-Match': f'"{etag}"'})):
+            respond = lambda: app.versioned_json(snapshot.orders, snapshot.version, 0, cache_body=True).get_data()
+            results.append({
+                'path': 'after: 304 revalidation',
+                'encoding': encoding,
+                'bytes': len(respond()),
+                'cpu_ms_first': _cpu_per_call(respond, 1),
+                'cpu_ms_repeat': _cpu_per_call(respond, repeat)
+            })
+
+    app.RESPONSE_BODIES = configured
+    logging.disable(logging.NOTSET)
+    return results
+
+def run_hit_rate(orders: int = 5000, booths: int = 300, rounds: int = 5, seed: int = 7) -> List[Dict]:
+    """
+    Replay booth tablets polling one snapshot version through each body cache configuration
+
+    Every round, each booth polls its orders and checklist routes and one in
+    ten polls is a console fetching /api/orders; each client keeps one
+    content coding. Returns one result row per configuration.
+    """
+    logging.disable(logging.CRITICAL)
+    import app
+    from orders_snapshot import OrdersSnapshot
+    from response_encoding import EncodedBodies, supported_encodings
+
+    snapshot = OrdersSnapshot(parsed_orders(orders, booths=booths))
+    rng = random.Random(seed)
+    requests = []
+    for booth in snapshot.booths():
+        encoding = rng.choice(supported_encodings())
+        requests.append((f'/api/orders/booth/{booth}', snapshot.for_booth(booth), encoding))
+        requests.append((f'/api/checklist/booth/{booth}', snapshot.booth_stats(booth), encoding))
+    consoles = [('/api/orders', snapshot.orders, encoding) for encoding in supported_encodings()]
+
+    configurations = (
+        ('before: one 64-entry LRU', EncodedBodies(max_entries=64)),
+        ('after: app configuration', EncodedBodies(max_entries=app.RESPONSE_BODIES.max_entries,
+                                                   scope_of=app.RESPONSE_BODIES.scope_of,
+                                                   scope_entries=app.RESPONSE_BODIES.scope_entries))
+    )
+    results = []
+    for name, bodies in configurations:
+        served = {'booth': [0, 0], 'shared': [0, 0]}
+        for _ in range(rounds):
+            polls = list(requests)
+            rng.shuffle(polls)
+            for i, (path, payload, encoding) in enumerate(polls):
+                batch = [(path, payload, encoding)] + ([rng.choice(consoles)] if i % 10 == 0 else [])
+                for key, body_payload, coding in batch:
+                    encodes = bodies.encodes
+                    bodies.encode(body_payload, coding, key=key, version=snapshot.version)
+                    counts = served['shared' if key == '/api/orders' else 'booth']
+                    counts[0] += bodies.encodes == encodes
+                    counts[1] += 1
+        results.append({
+            'configuration': name,
+            'booth_hit_rate': served['booth'][0] / served['booth'][1],
+            'orders_hit_rate': served['shared'][0] / served['shared'][1],
+            'encodes': bodies.encodes
+        })
+
+    logging.disable(logging.NOTSET)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/orders response encoding")
+    parser.add_argument('--orders', type=int, default=5000, help='Synthetic orders in the snapshot')
+    parser.add_argument('--repeat', type=int, default=50, help='Requests measured per path')
+    parser.add_argument('--booths', type=int, default=300, help='Booth tablets polling in the hit rate replay')
+    parser.add_argument('--rounds', type=int, default=5, help='Polls per tablet in the hit rate replay')
+    args = parser.parse_args()
+
+    print(f"/api/orders with {args.orders} orders, {args.repeat} requests per path")
+    print(f"{'path':<26} {'encoding':<9} {'bytes':>10} {'first ms':>9} {'repeat ms':>10}")
+    for row in run(args.orders, args.repeat):
+        print(f"{row['path']:<26} {row['encoding']:<9} {row['bytes']:>10} "
+              f"{row['cpu_ms_first']:>9.2f} {row['cpu_ms_repeat']:>10.3f}")
+
+    print(f"\nBody cache hit rate, {args.booths} booths polling orders and checklist {args.rounds} times each")
+    print(f"{'configuration':<26} {'booth hits':>11} {'/api/orders hits':>17} {'encodes':>8}")
+    for row in run_hit_rate(args.orders, args.booths, args.rounds):
+        print(f"{row['configuration']:<26} {row['booth_hit_rate']:>11.1%} {row['orders_hit_rate']:>17.1%} "
+              f"{row['encodes']:>8}")
+
+if __name__ == '__main__':
+    main()
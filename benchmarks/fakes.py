@@ -0,0 +1,266 @@
+# benchmarks/fakes.py
+# Local stand-ins for Google Sheets (a gspread client) and Abacus AI (an ApiClient),
+# with configurable latency, jitter, error rate, data volume and live sheet edits
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from gspread.utils import a1_range_to_grid_range
+
+from benchmarks.fixtures import SHEET_STATUSES, chatllm_orders, checklist_rows, markdown_table, sheet_rows
+
+class FakeUpstreamError(Exception):
+    """Error injected by a fake upstream call"""
+
+class FakeUpstream:
+    """
+    Fake upstream - latency, jitter and failures for one remote service, and a count of its calls
+
+    Every fake API method calls call() first, so the counters report exactly
+    how many upstream round trips the app made.
+    """
+
+    def __init__(self, name: str, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 7):
+        """
+        Initialize the upstream
+
+        Args:
+            name: Service name used in reports ('sheets', 'abacus')
+            latency: Mean seconds per call
+            jitter: Seconds of uniform jitter either side of latency
+            error_rate: Fraction of calls that raise FakeUpstreamError
+            seed: Random seed for jitter and injected errors
+        """
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = Counter()
+        self.errors = Counter()
+
+    def call(self, method: str, scale: float = 1.0):
+        """Record a call to method, wait out its latency and maybe fail it"""
+        with self._lock:
+            self.calls[method] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter)) * scale
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors[method] += 1
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise FakeUpstreamError(f"Injected {self.name} failure in {method}")
+
+    def stats(self) -> Dict:
+        """Calls and injected errors by method"""
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'errors': dict(self.errors),
+                'total_calls': sum(self.calls.values()),
+                'total_errors': sum(self.errors.values())
+            }
+
+# GOOGLE SHEETS
+
+class FakeWorksheet:
+    """In-memory worksheet; its spreadsheet applies the scheduled edits before every read"""
+
+    def __init__(self, spreadsheet: 'FakeSpreadsheet', title: str, rows: List[List[str]]):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.rows = rows
+
+    def get_all_values(self) -> List[List[str]]:
+        self.spreadsheet.upstream.call('get_all_values')
+        with self.spreadsheet.lock:
+            self.spreadsheet.apply_edits()
+            return [list(row) for row in self.rows]
+
+class FakeSpreadsheet:
+    """In-memory spreadsheet serving the gspread calls GoogleSheetsManager makes, edited every edit_every seconds"""
+
+    def __init__(self, upstream: FakeUpstream, worksheets: Dict[str, List[List[str]]], edit_every: float = 0,
+                 edit_rows: int = 5, seed: int = 7):
+        self.upstream = upstream
+        self.lock = threading.Lock()
+        self.edit_every = edit_every
+        self.edit_rows = edit_rows
+        self.revision = datetime.now(timezone.utc).isoformat()
+        self.edits = 0
+        self._rng = random.Random(seed)
+        self._edited_at = time.monotonic()
+        self._worksheets = {title: FakeWorksheet(self, title, [list(row) for row in rows])
+                            for title, rows in worksheets.items()}
+
+    def apply_edits(self):
+        """Apply the edits due since the last call: status changes plus one appended row per edit"""
+        if not self.edit_every:
+            return
+        due = int((time.monotonic() - self._edited_at) / self.edit_every)
+        if not due:
+            return
+        self._edited_at += due * self.edit_every
+        for _ in range(due):
+            for worksheet in self._worksheets.values():
+                rows = worksheet.rows
+                if len(rows) < 2:
+                    continue
+                status = rows[0].index('Status') if 'Status' in rows[0] else None
+                for _ in range(self.edit_rows if status is not None else 0):
+                    rows[self._rng.randrange(1, len(rows))][status] = self._rng.choice(SHEET_STATUSES)
+                rows.append(list(rows[self._rng.randrange(1, len(rows))]))
+            self.edits += 1
+        self.revision = datetime.now(timezone.utc).isoformat()
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.upstream.call('worksheet', scale=0.5)
+        return self._worksheets[title]
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self.upstream.call('worksheets', scale=0.5)
+        return list(self._worksheets.values())
+
+    def get_lastUpdateTime(self) -> str:
+        self.upstream.call('get_lastUpdateTime', scale=0.5)
+        with self.lock:
+            self.apply_edits()
+            return self.revision
+
+    def values_batch_get(self, ranges: List[str]) -> Dict:
+        self.upstream.call('values_batch_get')
+        with self.lock:
+            self.apply_edits()
+            return {'valueRanges': [{'range': name, 'values': self._values(name)} for name in ranges]}
+
+    def _values(self, range_name: str) -> List[List[str]]:
+        # Like the Sheets API: trailing empty cells and rows are left out
+        title, _, cells = range_name.rpartition('!') if '!' in range_name else (range_name, '', '')
+        rows = self._worksheets[title.strip("'")].rows
+        grid = a1_range_to_grid_range(cells) if cells else {}
+        start_col, end_col = grid.get('startColumnIndex', 0), grid.get('endColumnIndex')
+        values = []
+        for row in rows[grid.get('startRowIndex', 0):grid.get('endRowIndex')]:
+            row = row[start_col:end_col]
+            while row and row[-1] == '':
+                row = row[:-1]
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+class FakeGspreadClient:
+    """
+    Fake gspread client - pass as GoogleSheetsManager(client=...)
+
+    Every sheet ID opens the same spreadsheet: an Orders worksheet of
+    synthetic rows that keeps changing while the load test runs.
+    """
+
+    def __init__(self, upstream: FakeUpstream, orders: int = 5000, booths: Optional[int] = None,
+                 edit_every: float = 30, edit_rows: int = 5, seed: int = 7):
+        """
+        Initialize the client
+
+        Args:
+            upstream: Latency, errors and call counts for Sheets calls
+            orders: Rows in the Orders worksheet
+            booths: Distinct booths among the orders
+            edit_every: Seconds between sheet edits (0 keeps the sheet fixed)
+            edit_rows: Status cells changed per edit (each edit also appends a row)
+            seed: Random seed for the rows and the edits
+        """
+        self.upstream = upstream
+        self.spreadsheet = FakeSpreadsheet(upstream, {'Orders': sheet_rows(orders, booths, seed)},
+                                           edit_every=edit_every, edit_rows=edit_rows, seed=seed)
+
+    def open_by_key(self, sheet_id: str) -> FakeSpreadsheet:
+        self.upstream.call('open_by_key', scale=0.5)
+        return self.spreadsheet
+
+# ABACUS AI
+
+class FakeChatSession:
+    def __init__(self, chat_session_id: str):
+        self.chat_session_id = chat_session_id
+
+class FakeChatResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+class FakeAbacus:
+    """
+    Fake Abacus AI - a ChatLLM project that answers the app's checklist and orders questions
+
+    Install with abacus_pool.set_client_factory(fake.client_factory). Paged
+    checklist questions get the requested rows, booth questions get that
+    booth's rows, anything else about orders gets the field-per-line list
+    AbacusManager parses.
+    """
+
+    _PAGE = re.compile(r'rows (\d+) to (\d+)')
+    _BOOTH = re.compile(r'booth number (\S+)')
+
+    def __init__(self, upstream: FakeUpstream, checklist_items: int = 2000, orders: int = 500,
+                 booths: Optional[int] = None, seed: int = 7):
+        """
+        Initialize the project
+
+        Args:
+            upstream: Latency, errors and call counts for ChatLLM calls
+            checklist_items: Rows in the checklist sheet
+            orders: Orders listed when asked for the Orders sheet
+            booths: Distinct booths among the checklist rows
+            seed: Random seed for the rows
+        """
+        self.upstream = upstream
+        self.rows = checklist_rows(checklist_items, booths, seed)
+        self.orders_content = chatllm_orders(orders, booths, seed)
+        self._sessions = 0
+        self._lock = threading.Lock()
+
+    def client_factory(self, api_key: str) -> 'FakeApiClient':
+        return FakeApiClient(self)
+
+    def answer(self, question: str) -> str:
+        page = self._PAGE.search(question)
+        if page:
+            first, last = int(page.group(1)), int(page.group(2))
+            return markdown_table([self.rows[0]] + self.rows[first:last + 1])
+        booth = self._BOOTH.search(question)
+        if booth:
+            return markdown_table([self.rows[0]] + [row for row in self.rows[1:] if row[0] == booth.group(1)])
+        if 'orders' in question.lower():
+            return self.orders_content
+        return "I can only answer questions about the checklist and orders sheets."
+
+    def new_session_id(self) -> str:
+        with self._lock:
+            self._sessions += 1
+            return f"fake-session-{self._sessions}"
+
+class FakeApiClient:
+    """The abacusai.ApiClient calls the app makes, answered by a FakeAbacus"""
+
+    def __init__(self, project: FakeAbacus):
+        self.project = project
+
+    def create_chat_session(self, project_id: str) -> FakeChatSession:
+        self.project.upstream.call('create_chat_session', scale=0.2)
+        return FakeChatSession(self.project.new_session_id())
+
+    def get_chat_session(self, chat_session_id: str) -> FakeChatSession:
+        self.project.upstream.call('get_chat_session', scale=0.1)
+        return FakeChatSession(chat_session_id)
+
+    def get_chat_response(self, chat_session_id: str, question: str) -> FakeChatResponse:
+        self.project.upstream.call('get_chat_response')
+        return FakeChatResponse(self.project.answer(question))
@@ -0,0 +1,131 @@
+# benchmarks/fixtures.py
+# Synthetic Orders sheets and ChatLLM responses shaped like the real ones, reproducible from a seed
+
+import json
+import logging
+import random
+from typing import Dict, List
+
+ORDER_HEADERS = ['Booth #', 'Section', 'Exhibitor Name', 'Item', 'Color', 'Quantity',
+                 'Date', 'Hour', 'Status', 'Type', 'Boomers Quantity', 'Comments', 'User']
+
+SHEET_STATUSES = ['Delivered', 'Received', 'Out for delivery', 'In route from warehouse',
+                  'In Process', 'cancelled']
+
+ITEMS = ['White Side Chair', 'Round Table 30" high', '3m x 4m Corner Booth', 'Company Name Sign 24"W x 16"H',
+         'BeMatrix Structure with White Double Fabric Walls', '75" 4K touchscreen display',
+         'Wastebasket', 'Power Strip 6 outlets', 'Carpet 10x10 Grey', 'Counter with Lockable Storage']
+
+COLORS = ['White', 'Black', 'Grey', 'Blue', '']
+
+CHECKLIST_HEADERS = ['Booth #', 'Section', 'Exhibitor Name', 'Quantity', 'Item Name',
+                     'Special Instructions', 'Status', 'Date', 'Hour']
+
+def sheet_rows(orders: int, booths: int = None, seed: int = 7) -> List[List[str]]:
+    """
+    Raw Orders sheet rows (header first) as gspread's get_all_values returns them
+
+    Args:
+        orders: Number of data rows
+        booths: Number of distinct booths (defaults to one per 8 orders)
+        seed: Random seed, so every run sees the same sheet
+    """
+    rng = random.Random(seed)
+    booths = booths or max(1, orders // 8)
+    rows = [list(ORDER_HEADERS)]
+    for row in range(orders):
+        booth = rng.randrange(booths)
+        rows.append([
+            str(100 + booth),
+            f'Section {booth % 12 + 1}',
+            f'Exhibitor {booth:04d}, LLC',
+            rng.choice(ITEMS),
+            rng.choice(COLORS),
+            str(rng.randint(1, 8)),
+            f'06/{rng.randint(1, 28):02d}/2025',
+            f'{rng.randint(7, 18):02d}:{rng.randint(0, 59):02d}:00',
+            rng.choice(SHEET_STATUSES),
+            rng.choice(['Furniture', 'Electrical', 'Graphics', 'Booth']),
+            '',
+            rng.choice(['', '', 'Rush delivery requested', 'Leave with booth staff']),
+            f'user{rng.randint(1, 20)}@expo.example'
+        ])
+    return rows
+
+def downloaded_rows(orders: int, booths: int = None, seed: int = 7) -> List[List[str]]:
+    """sheet_rows as gspread decodes them from the API response: every cell a distinct string"""
+    return json.loads(json.dumps(sheet_rows(orders, booths, seed)))
+
+def sheets_manager():
+    """A GoogleSheetsManager used only for its parsers (no credentials, no network)"""
+    from sheets_integration import GoogleSheetsManager
+
+    logging.getLogger('sheets_integration').setLevel(logging.CRITICAL)
+    return GoogleSheetsManager(credentials_path='/nonexistent/credentials.json')
+
+def parsed_orders(orders: int, booths: int = None, seed: int = 7) -> List[Dict]:
+    """Synthetic orders parsed by the production sheet parser"""
+    return sheets_manager().parse_orders_data(sheet_rows(orders, booths, seed))
+
+def checklist_rows(items: int, booths: int = None, seed: int = 7) -> List[List[str]]:
+    """
+    Checklist sheet rows (header first) in the CHECKLIST_COLUMNS layout
+
+    Args:
+        items: Number of data rows
+        booths: Number of distinct booths (defaults to one per 8 items)
+        seed: Random seed, so every run sees the same checklist
+    """
+    rng = random.Random(seed)
+    booths = booths or max(1, items // 8)
+    rows = [list(CHECKLIST_HEADERS)]
+    for row in range(items):
+        booth = rng.randrange(booths)
+        rows.append([
+            str(100 + booth),
+            f'Section {booth % 12 + 1}',
+            f'Exhibitor {booth:04d}, LLC',
+            str(rng.randint(1, 8)),
+            rng.choice(ITEMS),
+            rng.choice(['', '', 'Deliver before 9am', 'Call on arrival']),
+            rng.choice(['TRUE', 'FALSE', 'FALSE']),
+            f'06/{rng.randint(1, 28):02d}/2025',
+            f'{rng.randint(7, 18):02d}:00'
+        ])
+    return rows
+
+def markdown_table(rows: List[List[str]], preamble: bool = True) -> str:
+    """Render rows (header first) as the markdown table ChatLLM answers with, optionally wrapped in its prose"""
+    lines = ['Here are the rows from the checklist sheet:', ''] if preamble else []
+    lines.append('| ' + ' | '.join(rows[0]) + ' |')
+    lines.append('|' + '---|' * len(rows[0]))
+    lines.extend('| ' + ' | '.join(row) + ' |' for row in rows[1:])
+    if preamble:
+        lines.extend(['', 'Let me know if you need any other rows.'])
+    return '\n'.join(lines)
+
+def checklist_table(items: int, booths: int = None, seed: int = 7, preamble: bool = True) -> str:
+    """ChatLLM checklist response of items rows (see checklist_rows and markdown_table)"""
+    return markdown_table(checklist_rows(items, booths, seed), preamble)
+
+def chatllm_orders(orders: int, booths: int = None, seed: int = 7) -> str:
+    """ChatLLM orders response in the field-per-line layout AbacusManager._parse_chatllm_response reads"""
+    rng = random.Random(seed)
+    booths = booths or max(1, orders // 8)
+    lines = []
+    for row in range(orders):
+        booth = rng.randrange(booths)
+        lines.extend([
+            f'Booth #: A-{100 + booth}',
+            f'Exhibitor Name: Exhibitor {booth:04d}, LLC',
+            f'Item: {rng.choice(ITEMS)}',
+            f'Status: {rng.choice(SHEET_STATUSES)}',
+            ''
+        ])
+    return '\n'.join(lines)
+
+def parsed_checklist(items: int, booths: int = None, seed: int = 7) -> List[Dict]:
+    """Synthetic checklist items parsed by the production table parser"""
+    from checklist_parser import parse_checklist_table
+
+    return parse_checklist_table(checklist_table(items, booths, seed))
@@ -0,0 +1,223 @@
+# benchmarks/load.py
+# End-to-end load test: N booth tablets polling their booth's orders and checklist,
+# against the app in-process on fake Sheets and Abacus backends (or a live --url)
+#
+#   python -m benchmarks.load --tablets 200 --duration 60 --interval 5
+#   python -m benchmarks.load --url http://localhost:5000 --tablets 50
+
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+ENDPOINTS = ('orders', 'checklist')
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class Recorder:
+    """Latency and status of every request, by endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.forced = Counter()
+
+    def record(self, endpoint: str, status: int, seconds: float, forced: bool):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+            if forced:
+                self.forced[endpoint] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for endpoint, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            endpoints[endpoint] = {
+                'requests': len(latencies),
+                'force_refreshes': self.forced[endpoint],
+                'statuses': {str(status): n for status, n in sorted(self.statuses[endpoint].items())},
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p90_ms': percentile(latencies, 0.90) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'max_ms': latencies[-1] * 1000
+            }
+        total = sum(row['requests'] for row in endpoints.values())
+        return {
+            'elapsed_seconds': elapsed,
+            'requests': total,
+            'requests_per_second': total / elapsed if elapsed else 0.0,
+            'endpoints': endpoints
+        }
+
+class Tablet(threading.Thread):
+    """
+    One booth tablet: polls its booth's orders and checklist every interval seconds
+
+    Like the browser it replaces, it revalidates with the ETag it was last
+    sent; now and then the user presses refresh, which adds force_refresh=true.
+    """
+
+    def __init__(self, booth: str, get, recorder: Recorder, stop: threading.Event, interval: float,
+                 force_refresh: float, seed: int):
+        super().__init__(name=f'tablet-{booth}', daemon=True)
+        self.booth = booth
+        self.get = get
+        self.recorder = recorder
+        self.stop = stop
+        self.interval = interval
+        self.force_refresh = force_refresh
+        self.rng = random.Random(seed)
+        self.etags = {}
+
+    def run(self):
+        # Tablets are switched on over the first interval, not all at once
+        if self.stop.wait(self.rng.uniform(0, self.interval)):
+            return
+        while not self.stop.is_set():
+            forced = self.rng.random() < self.force_refresh
+            for endpoint in ENDPOINTS:
+                path = f'/api/{endpoint}/booth/{self.booth}' + ('?force_refresh=true' if forced else '')
+                headers = {'If-None-Match': self.etags[endpoint]} if endpoint in self.etags and not forced else {}
+                started = time.perf_counter()
+                try:
+                    status, etag = self.get(path, headers)
+                except Exception:
+                    status, etag = 599, None
+                self.recorder.record(endpoint, status, time.perf_counter() - started, forced)
+                if etag:
+                    self.etags[endpoint] = etag
+            # Poll every interval seconds with +/-20% drift between tablets
+            if self.stop.wait(self.interval * self.rng.uniform(0.8, 1.2)):
+                return
+
+def in_process_client(args):
+    """Import the app with fake backends installed; returns (get, upstream stats)"""
+    os.environ.setdefault('ABACUS_API_KEY', 'load-test-key')
+    os.environ.setdefault('CACHE_BACKEND', 'memory')
+
+    import abacus_pool
+    import app
+    from benchmarks.fakes import FakeAbacus, FakeGspreadClient, FakeUpstream
+    from sheets_integration import GoogleSheetsManager
+
+    sheets = FakeUpstream('sheets', args.sheets_latency, args.sheets_latency * args.jitter, args.error_rate)
+    abacus = FakeUpstream('abacus', args.abacus_latency, args.abacus_latency * args.jitter, args.error_rate)
+    abacus_pool.set_client_factory(FakeAbacus(abacus, args.checklist_items, booths=args.booths).client_factory)
+    app.gs_manager = GoogleSheetsManager(
+        client=FakeGspreadClient(sheets, args.orders, booths=args.booths, edit_every=args.edit_every),
+        incremental_sync=os.environ.get('SHEETS_INCREMENTAL_SYNC', 'true').lower() == 'true',
+        quota=app.SHEETS_QUOTA
+    )
+    app.CACHE.clear()
+
+    local = threading.local()
+
+    def get(path, headers):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.app.test_client()
+        response = client.get(path, headers=headers)
+        response.get_data()
+        return response.status_code, response.headers.get('ETag')
+
+    def upstream_stats():
+        return {
+            'sheets': sheets.stats(),
+            'abacus': abacus.stats(),
+            'sheets_sync': dict(app.gs_manager.sync_stats),
+            'sheets_quota': app.SHEETS_QUOTA.stats(),
+            'upstream_flights': app.UPSTREAM_FLIGHTS.stats()
+        }
+
+    return get, upstream_stats
+
+def http_client(url: str):
+    """Poll a running server; upstream calls are not visible from outside, so none are reported"""
+    import requests
+
+    local = threading.local()
+
+    def get(path, headers):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.get(url.rstrip('/') + path, headers=headers, timeout=60)
+        return response.status_code, response.headers.get('ETag')
+
+    return get, lambda: None
+
+def run(args) -> Dict:
+    """Run the load test described by the parsed command line; returns the report"""
+    # Orders and checklist share one set of booths, so every tablet has both
+    args.booths = booths = args.booths or max(1, args.orders // 8)
+    get, upstream_stats = http_client(args.url) if args.url else in_process_client(args)
+    recorder = Recorder()
+    stop = threading.Event()
+    tablets = [Tablet(str(100 + n % booths), get, recorder, stop, args.interval, args.force_refresh, seed=n)
+               for n in range(args.tablets)]
+
+    started = time.perf_counter()
+    for tablet in tablets:
+        tablet.start()
+    stop.wait(args.duration)
+    stop.set()
+    for tablet in tablets:
+        tablet.join()
+    elapsed = time.perf_counter() - started
+
+    report = recorder.summary(elapsed)
+    report['config'] = {key: value for key, value in vars(args).items() if key != 'json'}
+    report['upstream'] = upstream_stats()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test booth tablets against fake or live backends")
+    parser.add_argument('--tablets', type=int, default=50, help='Booth tablets polling at once')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run')
+    parser.add_argument('--interval', type=float, default=10, help='Seconds between polls per tablet')
+    parser.add_argument('--force-refresh', type=float, default=0.05, help='Fraction of polls that force a refresh')
+    parser.add_argument('--url', help='Poll this running server instead of the app in-process on fakes')
+    parser.add_argument('--orders', type=int, default=5000, help='Rows in the fake Orders sheet')
+    parser.add_argument('--checklist-items', type=int, default=2000, help='Rows in the fake checklist sheet')
+    parser.add_argument('--booths', type=int, help='Distinct booths (defaults to one per 8 orders)')
+    parser.add_argument('--sheets-latency', type=float, default=0.3, help='Mean seconds per fake Sheets call')
+    parser.add_argument('--abacus-latency', type=float, default=3.0, help='Mean seconds per fake ChatLLM answer')
+    parser.add_argument('--jitter', type=float, default=0.3, help='Latency jitter as a fraction of the mean')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of fake upstream calls that fail')
+    parser.add_argument('--edit-every', type=float, default=30, help='Seconds between fake sheet edits (0: never)')
+    parser.add_argument('--json', help='Also write the report as JSON here')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    report = run(args)
+
+    print(f"{args.tablets} tablets for {report['elapsed_seconds']:.0f}s: "
+          f"{report['requests']} requests, {report['requests_per_second']:.1f} req/s")
+    print(f"{'endpoint':<10} {'requests':>9} {'forced':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+    for endpoint, row in report['endpoints'].items():
+        print(f"{endpoint:<10} {row['requests']:>9} {row['force_refreshes']:>7} {row['p50_ms']:>9.1f} "
+              f"{row['p90_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}  {row['statuses']}")
+    if report['upstream']:
+        for name in ('sheets', 'abacus'):
+            stats = report['upstream'][name]
+            print(f"{name} upstream: {stats['total_calls']} calls {stats['calls']}, {stats['total_errors']} injected errors")
+        print(f"sheets sync: {report['upstream']['sheets_sync']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
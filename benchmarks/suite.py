@@ -0,0 +1,268 @@
+# benchmarks/suite.py
+# Offline microbenchmark suite: parsers, cache backends and every cache-served Flask
+# route on synthetic data, written as JSON so runs on two commits can be compared
+#
+#   python -m benchmarks.suite --output before.json
+#   python -m benchmarks.suite --output after.json --compare before.json
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fixtures import (checklist_table, chatllm_orders, downloaded_rows, parsed_checklist,
+                                 parsed_orders, sheets_manager)
+
+RESULTS_FORMAT = 1
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> Dict:
+    """
+    Time fn, calling it enough times per sample that each sample lasts about min_time / repeat
+
+    Returns:
+        Dict with calls per sample and best and median seconds per call
+    """
+    fn()  # warm-up: imports, lazily built indexes, cached bodies
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / repeat or calls >= 1 << 20:
+            break
+        calls *= 2
+
+    samples = [elapsed / calls]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - started) / calls)
+    return {'calls': calls, 'best': min(samples), 'median': statistics.median(samples)}
+
+def _result(group: str, name: str, size: int, timing: Dict) -> Dict:
+    return {
+        'group': group,
+        'name': name,
+        'size': size,
+        'calls': timing['calls'],
+        'best_us': timing['best'] * 1e6,
+        'median_us': timing['median'] * 1e6,
+        'ops_per_second': 1 / timing['best']
+    }
+
+def bench_parsers(sizes: List[int], min_time: float) -> List[Dict]:
+    """Orders sheet parser, checklist table parser (whole and chunk-fed) and ChatLLM orders parser"""
+    import app
+    from abacus_integration import AbacusManager
+    from checklist_parser import iter_checklist_items
+
+    manager = sheets_manager()
+    abacus = AbacusManager()
+    results = []
+    for size in sizes:
+        rows = downloaded_rows(size)
+        results.append(_result('parsers', 'parse_orders_data', size,
+                               measure(lambda: manager.parse_orders_data(rows), min_time)))
+
+        table = checklist_table(size)
+        chunks = [table[i:i + 64] for i in range(0, len(table), 64)]
+        results.append(_result('parsers', 'parse_checklist_response', size,
+                               measure(lambda: app.parse_checklist_response(table), min_time)))
+        results.append(_result('parsers', 'parse_checklist_response booth', size,
+                               measure(lambda: app.parse_checklist_response(table, '101'), min_time)))
+        results.append(_result('parsers', 'iter_checklist_items 64B chunks', size,
+                               measure(lambda: list(iter_checklist_items(chunks)), min_time)))
+
+        response = chatllm_orders(size)
+        results.append(_result('parsers', '_parse_chatllm_response', size,
+                               measure(lambda: abacus._parse_chatllm_response(response), min_time)))
+    return results
+
+def _cache_backends(directory: str) -> Dict[str, Callable[[], object]]:
+    from cache import create_cache
+
+    backends = {
+        'memory': lambda: create_cache('memory'),
+        'sqlite': lambda: create_cache('sqlite', path=os.path.join(directory, 'bench-cache.db'))
+    }
+    if os.environ.get('REDIS_URL'):
+        backends['redis'] = lambda: create_cache('redis', url=os.environ['REDIS_URL'])
+    return backends
+
+def bench_cache(sizes: List[int], min_time: float) -> List[Dict]:
+    """get, lookup and set of an orders snapshot on each cache backend (redis when REDIS_URL is set)"""
+    from orders_snapshot import OrdersSnapshot
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            snapshot = OrdersSnapshot(parsed_orders(size))
+            small = {'booth_number': '101', 'items': 3}
+            for backend, create in _cache_backends(directory).items():
+                cache = create()
+                cache.clear()
+                cache.set('all_orders', snapshot)
+                cache.set('checklist_101', small)
+                results.extend([
+                    _result('cache', f'{backend} get snapshot', size,
+                            measure(lambda: cache.get('all_orders', max_age=120), min_time)),
+                    _result('cache', f'{backend} lookup snapshot', size,
+                            measure(lambda: cache.lookup('all_orders', 120, 900), min_time)),
+                    _result('cache', f'{backend} set snapshot', size,
+                            measure(lambda: cache.set('all_orders', snapshot), min_time)),
+                    _result('cache', f'{backend} get small', size,
+                            measure(lambda: cache.get('checklist_101', max_age=120), min_time)),
+                    _result('cache', f'{backend} miss', size,
+                            measure(lambda: cache.get('checklist_missing', max_age=120), min_time))
+                ])
+                cache.clear()
+    return results
+
+# Cache-served GET routes; the SSE stream never ends, /api/checklist/test needs a live
+# ChatLLM session and /api/clear-cache would drop the snapshots being served
+ROUTES = (
+    ('/api/health', {}),
+    ('/api/abacus-status', {}),
+    ('/api/orders', {}),
+    ('/api/orders', {'Accept-Encoding': 'gzip'}),
+    ('/api/orders?status=delivered&fields=id,booth_number,status', {}),
+    ('/api/orders?limit=100', {}),
+    ('/api/orders/booth/101', {}),
+    ('/api/orders/changes?since={version}', {}),
+    ('/api/checklist', {}),
+    ('/api/checklist/booth/101', {}),
+    ('/api/stats', {}),
+    ('/api/booth/101/dashboard', {})
+)
+
+def bench_routes(sizes: List[int], min_time: float) -> List[Dict]:
+    """Each route through the Flask test client, served from injected synthetic snapshots"""
+    import app
+    from checklist_snapshot import ChecklistSnapshot
+    from orders_snapshot import OrdersSnapshot
+
+    client = app.app.test_client()
+    results = []
+    for size in sizes:
+        orders = OrdersSnapshot(parsed_orders(size))
+        app.CACHE.clear()
+        app.set_cache('all_orders', orders)
+        app.set_cache('checklist_snapshot', ChecklistSnapshot(parsed_checklist(size)))
+        app.ORDERS_HISTORY.record(orders)
+
+        for path, headers in ROUTES:
+            url = path.format(version=orders.version)
+            name = f"GET {path}" + (f" [{headers['Accept-Encoding']}]" if headers else '')
+            status = client.get(url, headers=headers).status_code
+            if status != 200:
+                raise RuntimeError(f"{url} returned {status}")
+            results.append(_result('routes', name, size,
+                                   measure(lambda: client.get(url, headers=headers).get_data(), min_time)))
+
+        revalidate = {'If-None-Match': f'"{orders.version}"'}
+        results.append(_result('routes', 'GET /api/orders [304]', size,
+                               measure(lambda: client.get('/api/orders', headers=revalidate).get_data(), min_time)))
+    app.CACHE.clear()
+    return results
+
+GROUPS = {
+    'parsers': bench_parsers,
+    'cache': bench_cache,
+    'routes': bench_routes
+}
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(groups=tuple(GROUPS), sizes=(1000, 10000), min_time: float = 0.2) -> Dict:
+    """Run the selected benchmark groups; returns the machine-readable results document"""
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault('CACHE_BACKEND', 'memory')
+    try:
+        # Keep stdout for the JSON document (abacus_integration prints on import without abacusai)
+        with contextlib.redirect_stdout(sys.stderr):
+            results = []
+            for group in groups:
+                results.extend(GROUPS[group](list(sizes), min_time))
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        'format': RESULTS_FORMAT,
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': list(sizes),
+        'results': results
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Match results by (group, name, size) and report the change in best time
+
+    Returns:
+        One row per benchmark present in both runs, with its ratio (current / baseline)
+        and whether it is slower than the baseline by more than threshold
+    """
+    previous = {(row['group'], row['name'], row['size']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        before = previous.get((row['group'], row['name'], row['size']))
+        if before is None:
+            continue
+        ratio = row['best_us'] / before['best_us']
+        rows.append(dict(row, baseline_us=before['best_us'], ratio=ratio, regression=ratio > 1 + threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--groups', nargs='+', choices=list(GROUPS), default=list(GROUPS), help='Benchmark groups to run')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Synthetic data sizes in rows')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Approximate seconds measured per benchmark')
+    parser.add_argument('--output', help='Write the JSON results here (default: stdout)')
+    parser.add_argument('--compare', help='Baseline JSON results from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown counted as a regression (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    document = run(args.groups, args.sizes, args.min_time)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"{'group':<8} {'benchmark':<62} {'size':>7} {'best us':>12} {'median us':>12}")
+        for row in document['results']:
+            print(f"{row['group']:<8} {row['name']:<62} {row['size']:>7} "
+                  f"{row['best_us']:>12.1f} {row['median_us']:>12.1f}")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(document, baseline, args.threshold)
+        print(f"\nCompared with {baseline.get('commit') or args.compare}", file=sys.stderr)
+        for row in rows:
+            flag = ' REGRESSION' if row['regression'] else ''
+            print(f"{row['group']:<8} {row['name']:<62} {row['size']:>7} "
+                  f"{row['baseline_us']:>12.1f} -> {row['best_us']:>12.1f} ({row['ratio']:.2f}x){flag}",
+                  file=sys.stderr)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+# booth_updates.py
+# Server-Sent Events fan-out: one watcher checks the shared snapshots for booth
+# changes and pushes each change, encoded once, to every subscriber of that booth
+
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from response_encoding import dumps
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TooManySubscribers(Exception):
+    """Raised when the process is already streaming to max_subscribers clients"""
+
+def format_event(event: str, data, event_id: Optional[str] = None) -> str:
+    """Encode one Server-Sent Event"""
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {dumps(data).decode('utf-8')}")
+    return '\n'.join(lines) + '\n\n'
+
+# A booth update as queued for a subscriber: (source, snapshot loaded_at, version, encoded event)
+Update = Tuple[str, datetime, str, str]
+
+class Subscription:
+    """One streaming client: a bounded queue of updates for its booth, and what it was last sent per source"""
+
+    def __init__(self, booth: str, queue_size: int):
+        self.booth = booth
+        self.events = queue.Queue(maxsize=queue_size)
+        self.dropped = False
+        self.sent: Dict[str, Tuple[datetime, str]] = {}
+
+    def is_news(self, source: str, loaded_at: datetime, version: str) -> bool:
+        """Whether an update is newer than what the client already has from source"""
+        sent = self.sent.get(source)
+        return sent is None or (version != sent[1] and loaded_at > sent[0])
+
+class BoothUpdates:
+    """
+    Booth update hub - tracks streaming subscribers and what each booth last received
+
+    A single watcher thread runs while anyone is subscribed. Every interval
+    (or as soon as wake() is called after a cache refresh) it calls check with
+    the subscribed booths; check reports versions through publish_if_changed,
+    which builds and encodes a booth's payload once per change no matter how
+    many tablets are watching it. Idle subscribers cost a blocked thread and
+    a heartbeat comment, never an upstream request.
+
+    A client subscribes before its initial payload is built, so a change
+    published in between is queued rather than lost. Updates are ordered by
+    the loaded_at of the snapshot they were built from, and a queued update
+    no newer than what the client was already sent is dropped.
+    """
+
+    def __init__(self, check: Callable[[List[str]], None], interval: float = 30,
+                 heartbeat: float = 15, max_subscribers: int = 500, queue_size: int = 16):
+        """
+        Initialize the hub
+
+        Args:
+            check: Called on the watcher thread with the subscribed booths
+            interval: Seconds between checks when nothing wakes the watcher
+            heartbeat: Seconds between keep-alive comments on an idle stream
+            max_subscribers: Maximum concurrent streams in this process
+            queue_size: Events buffered per subscriber before it is dropped as too slow
+        """
+        self.check = check
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._versions: Dict[tuple, str] = {}
+        self._watcher = None
+        self._published = 0
+        self._dropped = 0
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, booth: str) -> Subscription:
+        """
+        Register a client for a booth, before its initial payload is built
+
+        Args:
+            booth: Booth number the client watches
+
+        Raises:
+            TooManySubscribers: If the process is at max_subscribers
+        """
+        subscription = Subscription(booth, self.queue_size)
+        with self._lock:
+            if sum(len(subscribers) for subscribers in self._subscribers.values()) >= self.max_subscribers:
+                raise TooManySubscribers(f"Already streaming to {self.max_subscribers} clients")
+            self._subscribers.setdefault(booth, []).append(subscription)
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher = threading.Thread(target=self._watch, name='booth-updates', daemon=True)
+                self._watcher.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a client, forgetting its booth's versions when nobody else watches it"""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.booth, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.booth, None)
+                for key in [key for key in self._versions if key[0] == subscription.booth]:
+                    del self._versions[key]
+
+    def wake(self):
+        """Check for changes now (call after a snapshot was refreshed)"""
+        self._wake.set()
+
+    def publish_if_changed(self, booth: str, source: str, version: str, loaded_at: datetime,
+                           build: Callable[[], Dict]) -> bool:
+        """
+        Push a booth's payload for source to its subscribers if version is new to them
+
+        Args:
+            booth: Booth number
+            source: Event name, e.g. 'orders' or 'checklist'
+            version: Current content version of the booth's data from source
+            loaded_at: When the snapshot holding that version was loaded
+            build: Builds the payload; only called when the version changed
+        """
+        with self._lock:
+            if self._versions.get((booth, source)) == version or booth not in self._subscribers:
+                return False
+
+        update = (source, loaded_at, version, format_event(source, build(), event_id=version))
+        with self._lock:
+            if booth not in self._subscribers:
+                return False
+            self._versions[(booth, source)] = version
+            subscribers = list(self._subscribers[booth])
+            self._published += 1
+
+        for subscription in subscribers:
+            try:
+                subscription.events.put_nowait(update)
+            except queue.Full:
+                # A client that stopped reading is disconnected instead of buffering without bound
+                subscription.dropped = True
+                with self._lock:
+                    self._dropped += 1
+                self.unsubscribe(subscription)
+        logger.info(f"📡 Pushed {source} update for booth {booth} to {len(subscribers)} subscribers")
+        return True
+
+    def stream(self, subscription: Subscription, initial: List[Update]) -> Iterator[str]:
+        """
+        Encoded events for one client: the initial updates, then newer updates and heartbeats until it leaves
+
+        Args:
+            subscription: The client's subscription (see subscribe)
+            initial: Updates built after subscribing, e.g. the booth's orders and checklist
+        """
+        try:
+            with self._lock:
+                for source, _, version, _ in initial:
+                    self._versions.setdefault((subscription.booth, source), version)
+            yield f"retry: {int(self.heartbeat * 1000)}\n\n"
+            for source, loaded_at, version, event in initial:
+                subscription.sent[source] = (loaded_at, version)
+                yield event
+            while not subscription.dropped:
+                try:
+                    source, loaded_at, version, event = subscription.events.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Published between subscribing and building the initial payload, or already superseded
+                if not subscription.is_news(source, loaded_at, version):
+                    continue
+                subscription.sent[source] = (loaded_at, version)
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def _watch(self):
+        """Watcher loop; exits once the last subscriber has left"""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                booths = list(self._subscribers)
+                if not booths:
+                    self._watcher = None
+                    return
+            try:
+                self.check(booths)
+            except Exception as e:
+                logger.error(f"Booth update check failed: {e}")
+
+    def stats(self) -> Dict:
+        """Subscriber and push counters"""
+        with self._lock:
+            return {
+                'subscribers': sum(len(subscribers) for subscribers in self._subscribers.values()),
+                'booths': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'published': self._published,
+                'dropped': self._dropped
+            }
@@ -0,0 +1,718 @@
+# cache.py
+# Bounded caches with LRU eviction, TTL expiry and memory accounting - in-process,
+# or shared between gunicorn workers through SQLite (disk or /dev/shm) or Redis
+
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lookup states returned by BoundedCache.lookup
+FRESH = 'fresh'
+STALE = 'stale'
+MISS = 'miss'
+
+_SAMPLE_SIZE = 32
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate the memory held by a value in bytes
+
+    Large containers are sampled and extrapolated so sizing a snapshot of
+    tens of thousands of orders stays cheap. The result is an estimate for
+    budgeting, not an exact measurement.
+    """
+    size = sys.getsizeof(value)
+    if _depth > 6:
+        return size
+
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+
+    # Objects that share references internally (e.g. indexes over one list) size themselves
+    approx_size = getattr(value, 'approx_size', None)
+    if callable(approx_size):
+        return approx_size()
+
+    if isinstance(value, dict):
+        items = list(value.items()) if len(value) <= _SAMPLE_SIZE else [
+            item for _, item in zip(range(_SAMPLE_SIZE), value.items())
+        ]
+        if not items:
+            return size
+        sampled = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in items)
+        return size + sampled * len(value) // len(items)
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value) if len(value) <= _SAMPLE_SIZE else [
+            item for _, item in zip(range(_SAMPLE_SIZE), value)
+        ]
+        if not items:
+            return size
+        sampled = sum(estimate_size(item, _depth + 1) for item in items)
+        return size + sampled * len(value) // len(items)
+
+    if hasattr(value, '__dict__'):
+        return size + estimate_size(vars(value), _depth + 1)
+
+    slots = getattr(type(value), '__slots__', ())
+    return size + sum(estimate_size(getattr(value, name, None), _depth + 1) for name in slots)
+
+class CacheCounters:
+    """Hit, stale-hit and miss counters per namespace, plus eviction and expiry totals"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.by_namespace: Dict[str, Dict[str, int]] = {}
+
+    def record(self, namespace: str, state: str):
+        """Count one lookup result"""
+        with self._lock:
+            counters = self.by_namespace.setdefault(namespace, {'hits': 0, 'stale_hits': 0, 'misses': 0})
+            if state == FRESH:
+                self.hits += 1
+                counters['hits'] += 1
+            elif state == STALE:
+                self.stale_hits += 1
+                counters['stale_hits'] += 1
+            else:
+                self.misses += 1
+                counters['misses'] += 1
+
+    def as_dict(self, entries_by_namespace: Dict[str, int]) -> Dict:
+        """Counters in the shape reported by /api/health"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'namespaces': {
+                    namespace: dict(counters, entries=entries_by_namespace.get(namespace, 0))
+                    for namespace, counters in self.by_namespace.items()
+                }
+            }
+
+def classify(age: Optional[float], max_age: float, max_stale: Optional[float]) -> str:
+    """Classify an entry age as FRESH, STALE or MISS"""
+    if age is None:
+        return MISS
+    if age < max_age:
+        return FRESH
+    if max_stale is not None and age < max_stale:
+        return STALE
+    return MISS
+
+class CacheEntry:
+    """A cached value with the wall-clock time it was stored and its estimated size"""
+
+    __slots__ = ('value', 'stored_at', 'size', 'namespace')
+
+    def __init__(self, value: Any, stored_at: float, size: int, namespace: str):
+        self.value = value
+        self.stored_at = stored_at
+        self.size = size
+        self.namespace = namespace
+
+class BoundedCache:
+    """
+    Bounded cache - LRU eviction by entry count, byte budget and namespace
+
+    Entries older than max_age are swept actively (at most every
+    sweep_interval seconds, piggybacking on cache traffic) instead of
+    lingering until the worker restarts. Freshness is decided per lookup,
+    so an entry can be served stale while it is younger than max_age.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 256 * 1024 * 1024,
+                 max_age: float = 900, namespace_limits: Optional[Dict[str, int]] = None,
+                 namespace_of: Optional[Callable[[str], str]] = None, sweep_interval: float = 60):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of entries across all namespaces
+            max_bytes: Approximate memory budget across all entries
+            max_age: Seconds after which an entry is expired and swept
+            namespace_limits: Maximum entries per namespace, e.g. {'checklist': 1000}
+            namespace_of: Maps a key to its namespace (defaults to the key itself)
+            sweep_interval: Minimum seconds between expiry sweeps
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.namespace_limits = dict(namespace_limits or {})
+        self.namespace_of = namespace_of or (lambda key: key)
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.RLock()
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._namespaces: Dict[str, 'OrderedDict[str, None]'] = {}
+        self._bytes = 0
+        self._last_sweep = time.time()
+        self.counters = CacheCounters()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def lookup(self, key: str, max_age: float, max_stale: Optional[float] = None) -> Tuple[Any, Optional[float], str]:
+        """
+        Look up a key and classify it as fresh, stale or missing
+
+        Args:
+            key: Cache key
+            max_age: Entries younger than this are fresh
+            max_stale: Entries younger than this (but not fresh) are returned as stale;
+                None means expired entries count as misses
+
+        Returns:
+            Tuple of (value, age_seconds, state); value and age are None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._entries.get(key)
+            age = now - entry.stored_at if entry is not None else None
+            state = classify(age, max_age, max_stale)
+
+            self.counters.record(self.namespace_of(key), state)
+            if state == MISS:
+                return None, None, MISS
+
+            self._touch(key, entry)
+            return entry.value, age, state
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Any:
+        """Value for key if it is younger than max_age (default: the cache max_age), else None"""
+        value, _, _ = self.lookup(key, self.max_age if max_age is None else max_age)
+        return value
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since key was stored, or None (does not count as a hit or refresh LRU order)"""
+        entry = self._entries.get(key)
+        return time.time() - entry.stored_at if entry is not None else None
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Store a value, evicting least recently used entries to stay within limits"""
+        now = time.time()
+        namespace = self.namespace_of(key)
+        entry = CacheEntry(value, stored_at or now, estimate_size(value), namespace)
+
+        with self._lock:
+            self._maybe_sweep(now)
+            self._remove(key)
+            self._entries[key] = entry
+            self._namespaces.setdefault(namespace, OrderedDict())[key] = None
+            self._bytes += entry.size
+            self._enforce_limits(namespace, keep=key)
+
+    def delete(self, key: str):
+        """Remove a key if present"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """Remove every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self._bytes = 0
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove every entry older than max_age and return how many were removed"""
+        now = now or time.time()
+        with self._lock:
+            self._last_sweep = now
+            expired = [key for key, entry in self._entries.items() if now - entry.stored_at >= self.max_age]
+            for key in expired:
+                self._remove(key)
+            self.counters.expirations += len(expired)
+        if expired:
+            logger.info(f"🧹 Swept {len(expired)} expired cache entries")
+        return len(expired)
+
+    def stats(self) -> Dict:
+        """Size, hit/miss and eviction counters"""
+        with self._lock:
+            entries_by_namespace = {namespace: len(keys) for namespace, keys in self._namespaces.items()}
+            return dict(self.counters.as_dict(entries_by_namespace),
+                        backend=self.backend,
+                        entries=len(self._entries),
+                        max_entries=self.max_entries,
+                        approx_bytes=self._bytes,
+                        max_bytes=self.max_bytes)
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Refresh leases only matter across processes; a single process always holds them"""
+        return True
+
+    def release_lease(self, key: str):
+        """No-op for the in-process cache"""
+
+    def _touch(self, key: str, entry: CacheEntry):
+        self._entries.move_to_end(key)
+        self._namespaces[entry.namespace].move_to_end(key)
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            keys = self._namespaces.get(entry.namespace)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._namespaces[entry.namespace]
+        return entry
+
+    def _evict(self, key: str):
+        self._remove(key)
+        self.counters.evictions += 1
+
+    def _enforce_limits(self, namespace: str, keep: str):
+        limit = self.namespace_limits.get(namespace)
+        keys = self._namespaces.get(namespace)
+        while limit is not None and keys and len(keys) > limit:
+            self._evict(next(iter(keys)))
+
+        # The entry being stored is the most recently used, so it is only reached when it is alone
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._evict(oldest)
+
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+class _DecodedValues:
+    """Small per-process LRU of unpickled values, keyed by (key, stored_at)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+
+    def get(self, key: str, stored_at: float) -> Tuple[bool, Any]:
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is None or cached[0] != stored_at:
+                return False, None
+            self._values.move_to_end(key)
+            return True, cached[1]
+
+    def put(self, key: str, stored_at: float, value: Any):
+        with self._lock:
+            self._values[key] = (stored_at, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def discard(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+class SQLiteCache:
+    """
+    Shared cache - one SQLite file used by every worker on the host
+
+    Values are pickled once per write; each worker keeps the unpickled value
+    for the current version of a key, so reads of a large snapshot only pay
+    for a timestamp query. Pointing the path at /dev/shm keeps the store in
+    shared memory. Refresh leases let one worker fetch while the others wait
+    for its result instead of calling upstream themselves.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048,
+                 max_bytes: int = 256 * 1024 * 1024, max_age: float = 900,
+                 namespace_limits: Optional[Dict[str, int]] = None,
+                 namespace_of: Optional[Callable[[str], str]] = None, sweep_interval: float = 60):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (defaults to /dev/shm when available, else the temp dir)
+            max_entries: Maximum number of entries across all namespaces
+            max_bytes: Budget for the pickled size of all entries
+            max_age: Seconds after which an entry is expired and swept
+            namespace_limits: Maximum entries per namespace, e.g. {'checklist': 1000}
+            namespace_of: Maps a key to its namespace (defaults to the key itself)
+            sweep_interval: Minimum seconds between expiry sweeps
+        """
+        shm = '/dev/shm'
+        default_dir = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else tempfile.gettempdir()
+        self.path = path or os.path.join(default_dir, 'expo_cache.sqlite3')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.namespace_limits = dict(namespace_limits or {})
+        self.namespace_of = namespace_of or (lambda key: key)
+        self.sweep_interval = sweep_interval
+
+        self.counters = CacheCounters()
+        self._decoded = _DecodedValues()
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._last_sweep = time.time()
+
+        with self._connect() as db:
+            db.execute("""CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY, namespace TEXT NOT NULL, stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+            db.execute("CREATE INDEX IF NOT EXISTS cache_namespace ON cache (namespace, accessed_at)")
+            db.execute("""CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)""")
+        logger.info(f"Shared SQLite cache at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")
+            self._local.db = db
+        return db
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __contains__(self, key):
+        return self._connect().execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is not None
+
+    def lookup(self, key: str, max_age: float, max_stale: Optional[float] = None) -> Tuple[Any, Optional[float], str]:
+        """Look up a key and classify it as fresh, stale or missing (see BoundedCache.lookup)"""
+        now = time.time()
+        self._maybe_sweep(now)
+        db = self._connect()
+        row = db.execute("SELECT stored_at, accessed_at FROM cache WHERE key = ?", (key,)).fetchone()
+        age = now - row[0] if row else None
+        state = classify(age, max_age, max_stale)
+
+        value = None
+        if state != MISS:
+            stored_at = row[0]
+            found, value = self._decoded.get(key, stored_at)
+            if not found:
+                blob = db.execute("SELECT value FROM cache WHERE key = ? AND stored_at = ?",
+                                  (key, stored_at)).fetchone()
+                if blob is None:
+                    # Replaced or evicted by another worker between the two queries
+                    state, value, age = MISS, None, None
+                else:
+                    value = pickle.loads(blob[0])
+                    self._decoded.put(key, stored_at, value)
+            # Bump LRU order at most once a second to keep reads mostly read-only
+            if state != MISS and now - row[1] > 1:
+                db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+        self.counters.record(self.namespace_of(key), state)
+        return value, age, state
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Any:
+        """Value for key if it is younger than max_age (default: the cache max_age), else None"""
+        value, _, _ = self.lookup(key, self.max_age if max_age is None else max_age)
+        return value
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since key was stored, or None"""
+        row = self._connect().execute("SELECT stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        return time.time() - row[0] if row else None
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Store a value, evicting least recently used entries to stay within limits"""
+        now = time.time()
+        stored_at = stored_at or now
+        namespace = self.namespace_of(key)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._maybe_sweep(now)
+
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, namespace, stored_at, now, len(blob), blob))
+            self._enforce_limits(db, namespace, keep=key)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        self._decoded.put(key, stored_at, value)
+
+    def delete(self, key: str):
+        """Remove a key if present"""
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+        self._decoded.discard(key)
+
+    def clear(self):
+        """Remove every entry, for every worker (counters are kept)"""
+        self._connect().execute("DELETE FROM cache")
+        self._decoded.discard()
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove every entry older than max_age and return how many were removed"""
+        now = now or time.time()
+        self._last_sweep = now
+        db = self._connect()
+        removed = db.execute("DELETE FROM cache WHERE stored_at <= ?", (now - self.max_age,)).rowcount
+        db.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+        self.counters.expirations += removed
+        if removed:
+            logger.info(f"🧹 Swept {removed} expired shared cache entries")
+        return removed
+
+    def stats(self) -> Dict:
+        """Size, hit/miss and eviction counters (counters are per worker, sizes are shared)"""
+        db = self._connect()
+        entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        entries_by_namespace = dict(db.execute("SELECT namespace, COUNT(*) FROM cache GROUP BY namespace"))
+        return dict(self.counters.as_dict(entries_by_namespace),
+                    backend=self.backend,
+                    path=self.path,
+                    entries=entries,
+                    max_entries=self.max_entries,
+                    approx_bytes=size,
+                    max_bytes=self.max_bytes)
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Try to become the one worker refreshing key for the next ttl seconds"""
+        now = time.time()
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now))
+            acquired = db.execute("INSERT OR IGNORE INTO leases VALUES (?, ?, ?)",
+                                  (key, self._owner, now + ttl)).rowcount == 1
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return acquired
+
+    def release_lease(self, key: str):
+        """Release a lease held by this worker"""
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def _enforce_limits(self, db: sqlite3.Connection, namespace: str, keep: str):
+        evicted = 0
+        limit = self.namespace_limits.get(namespace)
+        if limit is not None:
+            evicted += db.execute("""DELETE FROM cache WHERE key IN (
+                SELECT key FROM cache WHERE namespace = ? AND key != ?
+                ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)""", (namespace, keep, max(limit - 1, 0))).rowcount
+
+        evicted += db.execute("""DELETE FROM cache WHERE key IN (
+            SELECT key FROM cache WHERE key != ?
+            ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)""", (keep, max(self.max_entries - 1, 0))).rowcount
+
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in db.execute("SELECT key, size FROM cache WHERE key != ? ORDER BY accessed_at",
+                                        (keep,)).fetchall():
+                db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                evicted += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self.counters.evictions += evicted
+
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+class RedisCache:
+    """
+    Shared cache - a local Redis-compatible server used by every worker
+
+    Entries expire through Redis TTLs (max_age), and per-namespace limits are
+    kept with one access-ordered sorted set per namespace. Overall memory is
+    bounded by the server's own maxmemory/eviction policy.
+    """
+
+    backend = 'redis'
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'expo:',
+                 max_age: float = 900, namespace_limits: Optional[Dict[str, int]] = None,
+                 namespace_of: Optional[Callable[[str], str]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            url: Redis URL
+            prefix: Prefix for every key this cache writes
+            max_age: Seconds after which an entry expires
+            namespace_limits: Maximum entries per namespace, e.g. {'checklist': 1000}
+            namespace_of: Maps a key to its namespace (defaults to the key itself)
+        """
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.max_age = max_age
+        self.namespace_limits = dict(namespace_limits or {})
+        self.namespace_of = namespace_of or (lambda key: key)
+        self.counters = CacheCounters()
+        self._decoded = _DecodedValues()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        logger.info(f"Shared Redis cache at {url}")
+
+    def _key(self, key: str, part: str) -> str:
+        return f"{self.prefix}{part}:{key}"
+
+    def __len__(self):
+        return sum(self.redis.zcard(key) for key in self.redis.scan_iter(f"{self.prefix}ns:*"))
+
+    def __contains__(self, key):
+        return bool(self.redis.exists(self._key(key, 'ts')))
+
+    def lookup(self, key: str, max_age: float, max_stale: Optional[float] = None) -> Tuple[Any, Optional[float], str]:
+        """Look up a key and classify it as fresh, stale or missing (see BoundedCache.lookup)"""
+        now = time.time()
+        namespace = self.namespace_of(key)
+        raw = self.redis.get(self._key(key, 'ts'))
+        stored_at = float(raw) if raw is not None else None
+        age = now - stored_at if stored_at is not None else None
+        state = classify(age, max_age, max_stale)
+
+        value = None
+        if state != MISS:
+            found, value = self._decoded.get(key, stored_at)
+            if not found:
+                blob = self.redis.get(self._key(key, 'value'))
+                entry = pickle.loads(blob) if blob is not None else None
+                if entry is None or entry[0] != stored_at:
+                    state, value, age = MISS, None, None
+                else:
+                    value = entry[1]
+                    self._decoded.put(key, stored_at, value)
+            if state != MISS:
+                self.redis.zadd(self._key(namespace, 'ns'), {key: now})
+
+        self.counters.record(namespace, state)
+        return value, age, state
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Any:
+        """Value for key if it is younger than max_age (default: the cache max_age), else None"""
+        value, _, _ = self.lookup(key, self.max_age if max_age is None else max_age)
+        return value
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since key was stored, or None"""
+        raw = self.redis.get(self._key(key, 'ts'))
+        return time.time() - float(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Store a value with a max_age TTL, evicting past the namespace limit"""
+        now = time.time()
+        stored_at = stored_at or now
+        namespace = self.namespace_of(key)
+        ttl = max(int(self.max_age - (now - stored_at)), 1)
+        blob = pickle.dumps((stored_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+
+        pipe = self.redis.pipeline()
+        pipe.set(self._key(key, 'value'), blob, ex=ttl)
+        pipe.set(self._key(key, 'ts'), repr(stored_at), ex=ttl)
+        pipe.zadd(self._key(namespace, 'ns'), {key: now})
+        pipe.zremrangebyscore(self._key(namespace, 'ns'), 0, now - self.max_age)
+        pipe.execute()
+        self._decoded.put(key, stored_at, value)
+
+        limit = self.namespace_limits.get(namespace)
+        if limit is not None:
+            excess = self.redis.zrange(self._key(namespace, 'ns'), 0, -limit - 1)
+            for old in excess:
+                self.delete(old.decode())
+                self.counters.evictions += 1
+
+    def delete(self, key: str):
+        """Remove a key if present"""
+        pipe = self.redis.pipeline()
+        pipe.delete(self._key(key, 'value'), self._key(key, 'ts'))
+        pipe.zrem(self._key(self.namespace_of(key), 'ns'), key)
+        pipe.execute()
+        self._decoded.discard(key)
+
+    def clear(self):
+        """Remove every entry this cache wrote, for every worker (counters are kept)"""
+        keys = list(self.redis.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.redis.delete(*keys)
+        self._decoded.discard()
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Redis expires entries itself; only trim namespace indexes"""
+        now = now or time.time()
+        for key in self.redis.scan_iter(f"{self.prefix}ns:*"):
+            self.redis.zremrangebyscore(key, 0, now - self.max_age)
+        return 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters (per worker) and entry counts per namespace (shared)"""
+        entries_by_namespace = {
+            key.decode()[len(self.prefix) + 3:]: self.redis.zcard(key)
+            for key in self.redis.scan_iter(f"{self.prefix}ns:*")
+        }
+        return dict(self.counters.as_dict(entries_by_namespace),
+                    backend=self.backend,
+                    entries=sum(entries_by_namespace.values()))
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Try to become the one worker refreshing key for the next ttl seconds"""
+        return bool(self.redis.set(self._key(key, 'lease'), self._owner, nx=True, ex=max(int(ttl), 1)))
+
+    def release_lease(self, key: str):
+        """Release a lease held by this worker"""
+        lease = self._key(key, 'lease')
+        if self.redis.get(lease) == self._owner.encode():
+            self.redis.delete(lease)
+
+def create_cache(backend: str = 'memory', **options):
+    """
+    Create the cache selected by configuration
+
+    Args:
+        backend: 'memory' (per process), 'sqlite' (shared on one host) or 'redis'
+        options: Limits passed to the cache, plus path (sqlite) or url (redis)
+
+    Returns:
+        BoundedCache, SQLiteCache or RedisCache
+    """
+    backend = (backend or 'memory').lower()
+    if backend == 'redis':
+        for unused in ('max_entries', 'max_bytes', 'sweep_interval', 'path'):
+            options.pop(unused, None)
+        return RedisCache(**options)
+    options.pop('url', None)
+    if backend == 'sqlite':
+        return SQLiteCache(**options)
+    options.pop('path', None)
+    return BoundedCache(**options)
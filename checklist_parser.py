@@ -0,0 +1,180 @@
+# checklist_parser.py
+# Incremental parser for the markdown checklist tables ChatLLM returns: fed text chunks
+# as they arrive, it yields each checklist item as soon as its table row is complete
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Checklist fields, the header keywords that locate them and where they sit when the
+# header does not name them: (field, keywords, default column, default value)
+CHECKLIST_FIELDS = (
+    ('booth', ('booth',), 0, ''),
+    ('section', ('section',), 1, ''),
+    ('exhibitor', ('exhibitor',), 2, ''),
+    ('quantity', ('quantity',), 3, '1'),
+    ('item', ('item',), 4, ''),
+    ('instructions', ('instruction',), 5, ''),
+    ('status', ('status',), 6, 'FALSE'),
+    ('date', ('date',), 7, ''),
+    ('hour', ('hour', 'time'), 8, '')
+)
+
+# Status cell values that mark an item as completed
+COMPLETED_VALUES = frozenset(('TRUE', 'CHECKED', 'YES', '1', 'COMPLETE', 'DONE'))
+
+_SEPARATOR_CHARS = frozenset('-: ')
+
+def resolve_header(line: str) -> Dict[str, int]:
+    """
+    Map each checklist field to its column in a table header line
+
+    Args:
+        line: Header line, e.g. "| Booth # | Section | Exhibitor Name | ... |"
+
+    Returns:
+        Dict of field name to column index, for the fields the header names
+    """
+    indices = {}
+    headers = [h.strip() for h in line.split('|') if h.strip()]
+    for i, header in enumerate(headers):
+        header_lower = header.lower().replace('#', '').replace(' ', '')
+        for field, keywords, _, _ in CHECKLIST_FIELDS:
+            if any(keyword in header_lower for keyword in keywords):
+                indices[field] = i
+                break
+        else:
+            # A bare "Name" column is the exhibitor unless the header already named one
+            if 'name' in header_lower:
+                indices.setdefault('exhibitor', i)
+    return indices
+
+class ChecklistTableParser:
+    """
+    Checklist table parser - turns a ChatLLM table response into checklist items, chunk by chunk
+
+    Text is buffered only up to the last newline seen, so each complete row is
+    parsed once, when the chunk that ends it arrives. The header is detected
+    once and resolved to a fixed column layout that every row reuses. Items
+    are numbered per booth filter exactly as the whole-response parser did.
+    """
+
+    def __init__(self, booth_number: Optional[str] = None):
+        """
+        Initialize the parser
+
+        Args:
+            booth_number: Only yield rows for this booth (every row when None)
+        """
+        self.booth_number = str(booth_number) if booth_number else None
+        self.header: Optional[Dict[str, int]] = None
+        self.count = 0
+        self.skipped = 0
+        self._layout = None
+        self._pending: List[str] = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk of response text and return the items it completed"""
+        if '\n' not in chunk:
+            self._pending.append(chunk)
+            return []
+
+        self._pending.append(chunk)
+        lines = ''.join(self._pending).split('\n')
+        self._pending = [lines.pop()]
+        return [item for item in map(self._parse_line, lines) if item is not None]
+
+    def close(self) -> List[Dict]:
+        """Parse whatever follows the last newline (the final row of a response with no trailing newline)"""
+        tail = ''.join(self._pending)
+        self._pending = []
+        item = self._parse_line(tail)
+        return [item] if item is not None else []
+
+    def _parse_line(self, line: str) -> Optional[Dict]:
+        line = line.strip()
+        if not line:
+            return None
+
+        if self._layout is None:
+            # The header is the table row whose cells name the booth column and most of the others;
+            # prose or a data row that merely mentions a booth leaves the layout unresolved
+            cells = [cell for cell in line.split('|') if cell.strip()] if '|' in line else []
+            header = resolve_header(line) if cells else {}
+            if 'booth' in header and len(header) * 2 > len(cells):
+                self.header = header
+                self._layout = tuple((self.header.get(field, column), default)
+                                     for field, _, column, default in CHECKLIST_FIELDS)
+                logger.info(f"📋 Found checklist header: {self.header}")
+            return None
+
+        if '|' not in line:
+            return None
+
+        try:
+            return self._parse_row(line)
+        except Exception as e:
+            self.skipped += 1
+            logger.error(f"❌ Error parsing checklist line: {line} - {e}")
+            return None
+
+    def _parse_row(self, line: str) -> Optional[Dict]:
+        # Outer pipes of a markdown row would shift every column by one
+        columns = [col.strip() for col in line.strip('|').split('|')]
+
+        # Skip markdown separator rows such as |---|:---:|
+        if all(set(col) <= _SEPARATOR_CHARS for col in columns):
+            return None
+
+        width = len(columns)
+        booth_col = self._layout[0][0]
+        if booth_col >= width:
+            return None
+        row_booth = columns[booth_col]
+        if self.booth_number and row_booth != self.booth_number:
+            return None
+
+        (_, section, exhibitor, quantity_str, item_name, instructions,
+         status_str, date_str, hour_str) = [columns[i] if i < width else default for i, default in self._layout]
+
+        try:
+            quantity = int(quantity_str)
+        except ValueError:
+            quantity = 1
+
+        completed = status_str.upper() in COMPLETED_VALUES
+        self.count += 1
+        return {
+            'id': f"CHK-{row_booth}-{self.count:03d}",
+            'booth_number': row_booth,
+            'section': section,
+            'exhibitor_name': exhibitor,
+            'quantity': quantity,
+            'item_name': item_name,
+            'special_instructions': instructions,
+            'status': completed,
+            'date': date_str,
+            'hour': hour_str,
+            'completed': completed,
+            'priority': 1 if not completed else 5
+        }
+
+def iter_checklist_items(chunks: Iterable[str], booth_number: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield checklist items from a stream of response text chunks as each row completes
+
+    Args:
+        chunks: Response text in arrival order (one chunk for a complete response)
+        booth_number: Only yield rows for this booth (every row when None)
+    """
+    parser = ChecklistTableParser(booth_number)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+def parse_checklist_table(content: str, booth_number: Optional[str] = None) -> List[Dict]:
+    """Parse a complete ChatLLM checklist table response"""
+    return list(iter_checklist_items((content,), booth_number))
@@ -0,0 +1,145 @@
+# checklist_snapshot.py
+# One bulk load of the checklist sheet, partitioned by booth once per load
+
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from cache import estimate_size
+from versioning import EMPTY_VERSION, content_versions
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ChecklistSnapshot:
+    """
+    Checklist snapshot - every checklist item plus a booth index over them
+
+    Items are sorted by priority (incomplete first) and renumbered per booth
+    when the snapshot is built, so a booth lookup is a dictionary hit that
+    returns the same list a per-booth query used to. Completion rollups per
+    booth and section are materialized in the same pass. Booths missing from
+    the snapshot have no checklist items; looking them up never needs a refetch.
+    """
+
+    def __init__(self, items: Iterable[Dict], source: str = 'Abacus AI',
+                 loaded_at: Optional[datetime] = None):
+        """
+        Build a snapshot and its booth index
+
+        Args:
+            items: Parsed checklist items for every booth
+            source: Where the items came from ('Abacus AI', 'mock', ...)
+            loaded_at: When the items were loaded (defaults to now)
+        """
+        self.items = sorted(items, key=lambda item: item['priority'])
+        self.source = source
+        self.loaded_at = loaded_at or datetime.now()
+
+        self._by_booth = {}
+        self._booth_stats = {}
+        self._section_stats = {}
+        self._totals = _new_rollup()
+        for item in self.items:
+            booth = str(item['booth_number'])
+            booth_items = self._by_booth.setdefault(booth, [])
+            booth_items.append(item)
+            item['id'] = f"CHK-{item['booth_number']}-{len(booth_items):03d}"
+
+            booth_stats = self._booth_stats.get(booth)
+            if booth_stats is None:
+                booth_stats = self._booth_stats[booth] = _new_rollup(booth=booth, exhibitor_name=item['exhibitor_name'])
+            section_stats = self._section_stats.get(item['section'])
+            if section_stats is None:
+                section_stats = self._section_stats[item['section']] = _new_rollup(section=item['section'])
+
+            for rollup in (booth_stats, section_stats, self._totals):
+                _count(rollup, item['completed'])
+
+        for rollup in (*self._booth_stats.values(), *self._section_stats.values(), self._totals):
+            _finish(rollup)
+
+        self.version, self._booth_versions, _ = content_versions(
+            self.items, lambda item: str(item['booth_number']))
+
+        logger.info(f"Partitioned {len(self.items)} checklist items across {len(self._by_booth)} booths")
+
+    def approx_size(self) -> int:
+        """Approximate memory in bytes, counting each item once (the index shares references)"""
+        return (estimate_size(self.items) + sys.getsizeof(self._by_booth)
+                + sum(sys.getsizeof(items) for items in self._by_booth.values())
+                + estimate_size(self._booth_stats) + estimate_size(self._section_stats))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def for_booth(self, booth_number: str) -> List[Dict]:
+        """Checklist items for a booth number, incomplete items first"""
+        return list(self._by_booth.get(str(booth_number), ()))
+
+    def select(self, status: Optional[List[str]] = None, section: Optional[List[str]] = None,
+               date: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Checklist items matching every given filter, in snapshot order
+
+        Args:
+            status: 'completed' and/or 'pending'
+            section: Accepted sections, matched exactly
+            date: Accepted completion dates, matched exactly as they appear in the sheet
+        """
+        completed = {value == 'completed' for value in status or () if value in ('completed', 'pending')}
+        sections, dates = set(section or ()), set(date or ())
+
+        return [item for item in self.items
+                if (not status or item['completed'] in completed)
+                and (not sections or item['section'] in sections)
+                and (not dates or item['date'] in dates)]
+
+    def booths(self) -> List[str]:
+        """Booth numbers present in the snapshot"""
+        return list(self._by_booth)
+
+    def booth_version(self, booth_number: str) -> str:
+        """Content version of a booth's checklist items"""
+        return self._booth_versions.get(str(booth_number), EMPTY_VERSION)
+
+    def booth_stats(self, booth_number: str) -> Dict:
+        """Completed and pending counts for a booth number; zeros for a booth with no items"""
+        rollup = self._booth_stats.get(str(booth_number))
+        if rollup is None:
+            return _new_rollup(booth=str(booth_number))
+        return dict(rollup)
+
+    def stats(self) -> Dict:
+        """
+        Show-wide checklist completion, overall and per booth and section
+
+        The rollups are materialized when the snapshot is built and returned
+        as-is, so callers must treat the result as read-only.
+        """
+        return {
+            'totals': self._totals,
+            'by_booth': list(self._booth_stats.values()),
+            'by_section': list(self._section_stats.values())
+        }
+
+def _new_rollup(**labels) -> Dict:
+    """Empty completion rollup carrying the labels of the group it counts"""
+    return dict(labels, total_items=0, completed_items=0, pending_items=0, completion_percentage=0)
+
+def _count(rollup: Dict, completed: bool):
+    rollup['total_items'] += 1
+    if completed:
+        rollup['completed_items'] += 1
+    else:
+        rollup['pending_items'] += 1
+
+def _finish(rollup: Dict) -> Dict:
+    if rollup['total_items']:
+        rollup['completion_percentage'] = round(rollup['completed_items'] / rollup['total_items'] * 100, 1)
+    return rollup
@@ -139,6 +139,32 @@ function App() {
 
   const API_BASE = 'https://test-expo-flow.onrender.com/api';
 
+  // When the data was loaded upstream, from the Age header (booth payloads carry no timestamps)
+  const dataLoadedAt = (response) => new Date(Date.now() - (Number(response.headers.get('Age')) || 0) * 1000);
+
+  // Server-Timing phases slower than this are logged, to see where a slow booth load went
+  const SLOW_PHASE_MS = 250;
+  const logSlowPhases = (response, label) => {
+    const header = response.headers.get('Server-Timing');
+    if (!header) return;
+    const phases = header.split(',').map((entry) => {
+      const [name, ...params] = entry.trim().split(';');
+      const phase = { name };
+      params.forEach((param) => {
+        const [key, value] = param.split('=');
+        if (key === 'dur') phase.dur = parseFloat(value);
+        if (key === 'desc') phase.desc = value.replace(/"/g, '');
+      });
+      return phase;
+    });
+    const slow = phases.filter((phase) => phase.name !== 'total' && phase.dur >= SLOW_PHASE_MS);
+    if (slow.length > 0) {
+      const total = phases.find((phase) => phase.name === 'total');
+      console.warn(`Slow ${label} (${total ? total.dur.toFixed(0) : '?'} ms):`,
+        slow.map((phase) => `${phase.name}${phase.desc ? ` (${phase.desc})` : ''} ${phase.dur.toFixed(0)} ms`).join(', '));
+    }
+  };
+
   const fetchOrdersByBooth = async (boothNum, forceRefresh = false) => {
     setLoading(true);
     try {
@@ -146,6 +172,7 @@ function App() {
       
       const url = `${API_BASE}/orders/booth/${encodeURIComponent(boothNum)}${forceRefresh ? '?force_refresh=true' : ''}`;
       const response = await fetch(url);
+      logSlowPhases(response, `orders for booth ${boothNum}`);
       if (!response.ok) throw new Error('Failed to fetch orders');
       
       const data = await response.json();
@@ -153,7 +180,7 @@ function App() {
       
       const sortedOrders = sortOrdersByStatus(data.orders || []);
       setOrders(sortedOrders);
-      setLastUpdated(new Date(data.last_updated));
+      setLastUpdated(dataLoadedAt(response));
       generateNotifications(sortedOrders);
       
       // Set exhibitor name from API response
@@ -216,13 +243,14 @@ function App() {
       
       const url = `${API_BASE}/checklist/booth/${encodeURIComponent(boothNum)}${forceRefresh ? '?force_refresh=true' : ''}`;
       const response = await fetch(url);
+      logSlowPhases(response, `checklist for booth ${boothNum}`);
       if (!response.ok) throw new Error('Failed to fetch checklist');
       
       const data = await response.json();
       console.log('Checklist Response:', data);
       
       setChecklist(data.checklist_items || []);
-      setLastUpdated(new Date(data.last_updated));
+      setLastUpdated(dataLoadedAt(response));
       
       // Set exhibitor name from API response
       if (data.exhibitor_name) {
@@ -443,6 +471,33 @@ function App() {
     }
   };
 
+  // Live updates - the server pushes order and checklist changes for the booth over one stream
+  const streaming = stage === 'orders' || stage === 'checklist';
+  useEffect(() => {
+    if (!streaming || !boothNumber || typeof EventSource === 'undefined') {
+      return undefined;
+    }
+
+    const source = new EventSource(`${API_BASE}/stream/booth/${encodeURIComponent(boothNumber)}`);
+    source.addEventListener('orders', (event) => {
+      const data = JSON.parse(event.data);
+      console.log('Orders update:', data);
+      const sortedOrders = sortOrdersByStatus(data.orders || []);
+      setOrders(sortedOrders);
+      setLastUpdated(new Date(data.last_updated));
+      generateNotifications(sortedOrders);
+    });
+    source.addEventListener('checklist', (event) => {
+      const data = JSON.parse(event.data);
+      console.log('Checklist update:', data);
+      setChecklist(data.checklist_items || []);
+      setLastUpdated(new Date(data.last_updated));
+    });
+
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [streaming, boothNumber]);
+
   if (stage === 'intro') {
     return (
       <div className="min-h-screen bg-white flex items-center justify-center overflow-hidden">
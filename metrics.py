@@ -0,0 +1,158 @@
+# metrics.py
+# Prometheus text-format metrics: counters and histograms updated on the request path,
+# plus collectors that read existing stats (cache, pools, snapshots) only when scraped
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """
+    Counter - monotonically increasing count per label set
+
+    inc() is a dict update under a lock, cheap enough for every request.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name}_total {self.documentation}', f'# TYPE {self.name}_total counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f'{self.name}_total{_labels(self.labelnames, key)} {_number(value)}')
+        return lines
+
+class Histogram:
+    """
+    Histogram - observations counted into fixed buckets per label set
+
+    observe() finds its bucket with one bisect and bumps a plain counter;
+    cumulative bucket counts are only computed when the metrics are scraped.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = REQUEST_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the seconds spent in the with block (also when it raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, list(counts), total) for key, (counts, total) in self._series.items())
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+# A collector returns (name, type, help, [(labels, value), ...]) families read at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+class Registry:
+    """Metrics and scrape-time collectors rendered together as one exposition"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = REQUEST_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, collect: Callable[[], Iterable[Family]]):
+        """Register a function read on every scrape (usable as a decorator)"""
+        self._collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, kind, documentation, samples in collect():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry; each gunicorn worker exposes its own series
+REGISTRY = Registry()
+
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    'upstream_request_duration_seconds', 'Seconds per upstream call, by backend and operation',
+    ('backend', 'operation'), buckets=UPSTREAM_BUCKETS)
+
+UPSTREAM_ERRORS = REGISTRY.counter(
+    'upstream_errors', 'Upstream calls that failed, by backend and operation', ('backend', 'operation'))
@@ -0,0 +1,96 @@
+# order_record.py
+# Compact parsed order: __slots__ instead of a per-row dict, repeated strings interned,
+# and the fields every sheet order shares kept once on the class
+
+import sys
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Dict, List
+
+class OrderRecord(Mapping):
+    """
+    Order record - one parsed Orders sheet row, read like the order dict it replaces
+
+    Supports order['status'], order.get('section', ''), 'item' in order and
+    dict(order), so indexes, filters and projections work unchanged, while
+    to_dict() builds the API dictionary only when a response is serialized.
+    Values repeated across rows (booth, exhibitor, item, section, ...) are
+    interned by the parser so every row shares one string, description is
+    derived from the item, and the constant fields live on the class.
+    """
+
+    __slots__ = ('id', 'booth_number', 'exhibitor_name', 'item', 'color', 'quantity', 'status',
+                 'order_date', 'comments', 'section', 'type', 'user', 'hour')
+
+    # Fields of the API order dictionary, in the order it has always been serialized
+    FIELDS = ('id', 'booth_number', 'exhibitor_name', 'item', 'description', 'color', 'quantity',
+              'status', 'order_date', 'comments', 'section', 'type', 'user', 'hour',
+              'abacus_ai_processed', 'data_source')
+
+    # Constant for every order parsed from the sheet
+    abacus_ai_processed = True
+    data_source = 'Google Sheets via Abacus AI'
+
+    def __init__(self, id: str, booth_number: str, exhibitor_name: str, item: str, color: str,
+                 quantity: int, status: str, order_date: str, comments: str, section: str,
+                 type: str, user: str, hour: str):
+        # Plain stores: the parser interns whole columns at once (see intern_column)
+        self.id = id
+        self.booth_number = booth_number
+        self.exhibitor_name = exhibitor_name
+        self.item = item
+        self.color = color
+        self.quantity = quantity
+        self.status = status
+        self.order_date = order_date
+        self.comments = comments
+        self.section = section
+        self.type = type
+        self.user = user
+        self.hour = hour
+
+    @property
+    def description(self) -> str:
+        return f"Order from Google Sheets: {self.item}"
+
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in _FIELD_SET
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
+
+    def __repr__(self):
+        return f"OrderRecord(id={self.id!r}, booth_number={self.booth_number!r}, status={self.status!r})"
+
+    def to_dict(self) -> Dict:
+        """The API order dictionary"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+_FIELD_SET = frozenset(OrderRecord.FIELDS)
+
+# A record's slot values after its ID, in declaration order: the content its API dictionary is
+# derived from, hashed for content versions without building that dictionary
+record_content = attrgetter(*OrderRecord.__slots__[1:])
+
+# Fields whose values repeat across rows and are shared as interned strings
+INTERNED_FIELDS = frozenset(('booth_number', 'exhibitor_name', 'item', 'color', 'status',
+                             'order_date', 'section', 'type', 'user'))
+
+def intern_column(values: List[str]) -> List[str]:
+    """Intern a whole column of parsed values in one pass"""
+    return list(map(sys.intern, values))
@@ -0,0 +1,209 @@
+# orders_snapshot.py
+# One parsed load of the Orders sheet with lookup indexes built once per load
+
+import copy
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from cache import estimate_size
+from order_record import OrderRecord, record_content
+from versioning import EMPTY_VERSION, content_versions
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OrdersSnapshot:
+    """
+    Orders snapshot - the parsed order list plus hash indexes over it
+
+    Indexes are built once when the snapshot is created, so every booth,
+    exhibitor, status or section lookup costs O(matches) instead of a scan
+    over the whole sheet. Status rollups per booth, section and exhibitor are
+    materialized in the same pass. A snapshot is never mutated after it is built,
+    so its content version (and each booth's and order's) is hashed once, up front.
+    """
+
+    def __init__(self, orders: Iterable[Dict], source: str = 'Google Sheets',
+                 loaded_at: Optional[datetime] = None):
+        """
+        Build a snapshot and its indexes
+
+        Args:
+            orders: Parsed order dictionaries
+            source: Where the orders came from ('Google Sheets', 'mock', ...)
+            loaded_at: When the orders were loaded (defaults to now)
+        """
+        self.orders = list(orders)
+        self.source = source
+        self.loaded_at = loaded_at or datetime.now()
+
+        self._by_booth = {}
+        self._by_exhibitor = {}
+        self._by_status = {}
+        self._by_section = {}
+        self._exhibitors = {}
+        self._booth_stats = {}
+        self._section_stats = {}
+        self._totals = _new_rollup()
+        self._build_indexes()
+        self.version, self._booth_versions, self.record_versions = content_versions(
+            self.orders, lambda order: order['booth_number'].lower(), key_of=lambda order: order['id'],
+            values_of=_order_content)
+
+    def _build_indexes(self):
+        """Index every order by booth, exhibitor, status and section and roll up their statuses in one pass"""
+        for order in self.orders:
+            booth = order['booth_number']
+            name = order['exhibitor_name']
+            status = order['status']
+            section = order.get('section', '')
+
+            self._by_booth.setdefault(booth.lower(), []).append(order)
+            self._by_exhibitor.setdefault(name.lower(), []).append(order)
+            self._by_status.setdefault(status, []).append(order)
+            self._by_section.setdefault(section, []).append(order)
+
+            summary = self._exhibitors.get(name)
+            if summary is None:
+                summary = self._exhibitors[name] = _new_rollup(name=name, booth=booth)
+            booth_stats = self._booth_stats.get(booth.lower())
+            if booth_stats is None:
+                booth_stats = self._booth_stats[booth.lower()] = _new_rollup(booth=booth, exhibitor_name=name)
+            section_stats = self._section_stats.get(section)
+            if section_stats is None:
+                section_stats = self._section_stats[section] = _new_rollup(section=section)
+
+            for rollup in (summary, booth_stats, section_stats, self._totals):
+                _count(rollup, status)
+
+        for rollup in (*self._exhibitors.values(), *self._booth_stats.values(),
+                       *self._section_stats.values(), self._totals):
+            _finish(rollup)
+
+        logger.info(f"Indexed {len(self.orders)} orders across {len(self._by_booth)} booths")
+
+    def revalidated(self, loaded_at: Optional[datetime] = None) -> 'OrdersSnapshot':
+        """Copy of this snapshot, sharing its orders and indexes, confirmed current at loaded_at"""
+        snapshot = copy.copy(self)
+        snapshot.loaded_at = loaded_at or datetime.now()
+        return snapshot
+
+    def approx_size(self) -> int:
+        """Approximate memory in bytes, counting each order once (indexes share references)"""
+        size = estimate_size(self.orders)
+        for index in (self._by_booth, self._by_exhibitor, self._by_status, self._by_section):
+            size += sys.getsizeof(index) + sum(sys.getsizeof(matches) for matches in index.values())
+        return (size + estimate_size(self._exhibitors) + estimate_size(self._booth_stats)
+                + estimate_size(self._section_stats) + estimate_size(self.record_versions))
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def for_booth(self, booth_number: str) -> List[Dict]:
+        """Orders for a booth number (case-insensitive)"""
+        return list(self._by_booth.get(str(booth_number).lower(), ()))
+
+    def for_exhibitor(self, exhibitor_name: str) -> List[Dict]:
+        """Orders for an exhibitor name (case-insensitive)"""
+        return list(self._by_exhibitor.get(exhibitor_name.lower(), ()))
+
+    def with_status(self, status: str) -> List[Dict]:
+        """Orders with a mapped API status such as 'delivered'"""
+        return list(self._by_status.get(status, ()))
+
+    def in_section(self, section: str) -> List[Dict]:
+        """Orders in a section, matched exactly as it appears in the sheet"""
+        return list(self._by_section.get(section, ()))
+
+    def select(self, status: Optional[List[str]] = None, section: Optional[List[str]] = None,
+               date: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Orders matching every given filter, in sheet order
+
+        Args:
+            status: Accepted mapped statuses, e.g. ['delivered', 'in-route']
+            section: Accepted sections, matched exactly
+            date: Accepted order dates, matched exactly as they appear in the sheet
+        """
+        statuses, sections, dates = set(status or ()), set(section or ()), set(date or ())
+
+        # A single status or section is already an index in sheet order; start from the smaller side
+        candidates = self.orders
+        if len(statuses) == 1:
+            candidates = self._by_status.get(next(iter(statuses)), [])
+        if len(sections) == 1:
+            in_section = self._by_section.get(next(iter(sections)), [])
+            if len(in_section) < len(candidates):
+                candidates = in_section
+
+        return [order for order in candidates
+                if (not statuses or order['status'] in statuses)
+                and (not sections or order.get('section', '') in sections)
+                and (not dates or order.get('order_date', '') in dates)]
+
+    def booths(self) -> List[str]:
+        """Booth numbers present in the snapshot (lowercased)"""
+        return list(self._by_booth)
+
+    def sections(self) -> List[str]:
+        """Sections present in the snapshot"""
+        return list(self._by_section)
+
+    def exhibitors(self) -> List[Dict]:
+        """Exhibitors with their total and delivered order counts"""
+        return [_copy_rollup(summary) for summary in self._exhibitors.values()]
+
+    def booth_version(self, booth_number: str) -> str:
+        """Content version of a booth's orders (case-insensitive)"""
+        return self._booth_versions.get(str(booth_number).lower(), EMPTY_VERSION)
+
+    def booth_stats(self, booth_number: str) -> Dict:
+        """Order counts by status for a booth number (case-insensitive); zeros for an unknown booth"""
+        rollup = self._booth_stats.get(str(booth_number).lower())
+        if rollup is None:
+            return _finish(_new_rollup(booth=booth_number))
+        return _copy_rollup(rollup)
+
+    def stats(self) -> Dict:
+        """
+        Show-wide order counts by status, overall and per booth, section and exhibitor
+
+        The rollups are materialized when the snapshot is built and returned
+        as-is, so callers must treat the result as read-only.
+        """
+        return {
+            'totals': self._totals,
+            'by_booth': list(self._booth_stats.values()),
+            'by_section': list(self._section_stats.values()),
+            'by_exhibitor': list(self._exhibitors.values())
+        }
+
+def _order_content(order) -> tuple:
+    """Values an order's digest is hashed from, without its ID (slot values for parsed records, sorted items for mock dicts)"""
+    if type(order) is OrderRecord:
+        return record_content(order)
+    return tuple(sorted(item for item in order.items() if item[0] != 'id'))
+
+def _new_rollup(**labels) -> Dict:
+    """Empty status rollup carrying the labels of the group it counts"""
+    return dict(labels, total_orders=0, delivered_orders=0, completion_percentage=0, by_status={})
+
+def _count(rollup: Dict, status: str):
+    rollup['total_orders'] += 1
+    rollup['by_status'][status] = rollup['by_status'].get(status, 0) + 1
+    if status == 'delivered':
+        rollup['delivered_orders'] += 1
+
+def _finish(rollup: Dict) -> Dict:
+    if rollup['total_orders']:
+        rollup['completion_percentage'] = round(rollup['delivered_orders'] / rollup['total_orders'] * 100, 1)
+    return rollup
+
+def _copy_rollup(rollup: Dict) -> Dict:
+    return dict(rollup, by_status=dict(rollup['by_status']))
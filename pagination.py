@@ -0,0 +1,134 @@
+# pagination.py
+# Cursor pagination, field projection and filter parsing for the list endpoints
+
+import base64
+import json
+from typing import Dict, Iterable, List, Optional
+
+from versioning import combine_versions
+
+class CursorError(ValueError):
+    """A cursor that could not be decoded, or that belongs to a different query"""
+
+class StaleCursorError(CursorError):
+    """A cursor issued for a snapshot version that is no longer current"""
+
+class ListQuery:
+    """
+    List query - filters, field projection and page position parsed from request args
+
+    Filters are lists of accepted values (comma-separated in the query string),
+    so ?status=delivered,in-route matches either status.
+    """
+
+    def __init__(self, filters: Optional[Dict[str, List[str]]] = None, fields: Optional[List[str]] = None,
+                 limit: Optional[int] = None, cursor: Optional[str] = None):
+        self.filters = filters or {}
+        self.fields = fields
+        self.limit = limit
+        self.cursor = cursor
+
+    @classmethod
+    def from_args(cls, args, filter_names: Iterable[str], max_limit: int) -> 'ListQuery':
+        """
+        Parse a query from request args
+
+        Args:
+            args: Request args (request.args)
+            filter_names: Filters the endpoint supports, e.g. ('status', 'section', 'date')
+            max_limit: Largest page size a client may ask for
+
+        Raises:
+            ValueError: If limit is not a whole number between 1 and max_limit
+        """
+        filters = {}
+        for name in filter_names:
+            values = _split(args.get(name))
+            if values:
+                filters[name] = values
+
+        limit = args.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValueError(f"limit must be a whole number, got {limit!r}")
+            if not 1 <= limit <= max_limit:
+                raise ValueError(f"limit must be between 1 and {max_limit}")
+
+        return cls(filters, _split(args.get('fields')) or None, limit, args.get('cursor') or None)
+
+    @property
+    def paginated(self) -> bool:
+        """Whether the client asked for a page rather than the whole list"""
+        return self.limit is not None or self.cursor is not None
+
+    @property
+    def is_plain(self) -> bool:
+        """Whether the query asks for the whole, unfiltered, unprojected list"""
+        return not (self.filters or self.fields or self.paginated)
+
+    def selection_key(self) -> str:
+        """Canonical form of the filters and fields; a cursor is only valid for the selection it was issued for"""
+        return json.dumps([sorted((name, sorted(values)) for name, values in self.filters.items()),
+                           self.fields], separators=(',', ':'))
+
+    def response_key(self) -> str:
+        """Canonical form of everything that shapes the response"""
+        return json.dumps([self.selection_key(), self.limit, self.cursor], separators=(',', ':'))
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in value.split(',') if part.strip()] if value else []
+
+def project(records: List[Dict], fields: Optional[List[str]]) -> List[Dict]:
+    """Keep only the requested fields of each record (all fields when fields is None)"""
+    if not fields:
+        return records
+    return [{field: record[field] for field in fields if field in record} for record in records]
+
+def encode_cursor(version: str, selection: str, offset: int) -> str:
+    """Opaque cursor for the record at offset in one snapshot version's selection"""
+    raw = json.dumps([version, combine_versions(selection), offset], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, version: str, selection: str) -> int:
+    """
+    Offset a cursor points at
+
+    Raises:
+        StaleCursorError: If the cursor was issued for another snapshot version
+        CursorError: If the cursor is malformed or was issued for other filters or fields
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_version, cursor_selection, offset = json.loads(raw)
+        offset = int(offset)
+    except (ValueError, TypeError):
+        raise CursorError("Malformed cursor")
+
+    if cursor_version != version:
+        raise StaleCursorError("The data changed since this cursor was issued; restart from the first page")
+    if cursor_selection != combine_versions(selection) or offset < 0:
+        raise CursorError("Cursor does not match these filters and fields")
+    return offset
+
+def paginate(records: List[Dict], version: str, query: ListQuery, default_limit: int) -> Dict:
+    """
+    One page of a selection, stable for as long as the snapshot version is current
+
+    Returns:
+        Page payload with the projected items, the total selection size and
+        the cursor for the next page (None on the last page)
+    """
+    selection = query.selection_key()
+    offset = decode_cursor(query.cursor, version, selection) if query.cursor else 0
+    page = records[offset:offset + (query.limit or default_limit)]
+    next_offset = offset + len(page)
+
+    return {
+        'items': project(page, query.fields),
+        'total': len(records),
+        'offset': offset,
+        'next_cursor': encode_cursor(version, selection, next_offset) if next_offset < len(records) else None,
+        'version': version
+    }
@@ -0,0 +1,202 @@
+# profiling.py
+# Opt-in per-request profiling for live traffic: a flagged request, or one request in
+# every N, is profiled and its report kept in memory under an ID for later retrieval
+
+import cProfile
+import hmac
+import io
+import itertools
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Profiler modes
+DETERMINISTIC = 'cprofile'
+SAMPLING = 'sampling'
+MODES = (DETERMINISTIC, SAMPLING)
+
+class StackSampler:
+    """
+    Stack sampler - records one thread's call stack every interval seconds
+
+    Much cheaper than cProfile for the profiled request, because nothing
+    runs on its thread: a background thread reads its current frame and
+    counts each distinct stack, in the folded format flame graph tools read.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Samples as folded stacks ("outer;...;inner count" per line)"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def report(self, top: int) -> str:
+        """Functions by share of samples in which they were running (self) or on the stack (total)"""
+        total = sum(self.samples.values())
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        lines = [f"{total} samples every {self.interval * 1000:.0f} ms", '', f"{'self %':>7} {'total %':>8}  function"]
+        for frame, count in inclusive.most_common(top):
+            lines.append(f"{own[frame] * 100 / total:>7.1f} {count * 100 / total:>8.1f}  {frame}")
+        return '\n'.join(lines) + '\n' if total else 'No samples (request finished within one interval)\n'
+
+class RequestProfile:
+    """A profiler running for one request"""
+
+    def __init__(self, mode: str, reason: str, path: str, method: str):
+        self.mode = mode
+        self.reason = reason
+        self.path = path
+        self.method = method
+        self.started = time.perf_counter()
+        if mode == SAMPLING:
+            self.profiler = StackSampler(threading.get_ident())
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        if self.mode == SAMPLING:
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+class RequestProfiler:
+    """
+    Request profiler - decides which requests to profile and keeps their reports
+
+    A request is profiled when it carries the flag (the _profile query
+    parameter or X-Profile header, naming the mode or just "1") and, if a
+    token is configured, the matching X-Profile-Token header; or when it is
+    the sample_every-th eligible request. Reports are kept for the last
+    max_profiles requests in this worker.
+    """
+
+    def __init__(self, enabled: bool = False, token: Optional[str] = None, sample_every: int = 0,
+                 sample_mode: str = SAMPLING, max_profiles: int = 50, top: int = 40):
+        """
+        Initialize the profiler
+
+        Args:
+            enabled: Whether profiling can happen at all
+            token: Admin token required to flag requests and read reports (None: not required)
+            sample_every: Profile one eligible request in this many (0: only flagged requests)
+            sample_mode: Profiler used for sampled requests (cprofile or sampling)
+            max_profiles: Reports retained before the oldest is dropped
+            top: Functions listed in a report
+        """
+        self.enabled = enabled
+        self.token = token
+        self.sample_every = sample_every
+        self.sample_mode = sample_mode if sample_mode in MODES else SAMPLING
+        self.max_profiles = max_profiles
+        self.top = top
+        self._requests = itertools.count(1)
+        self._lock = threading.Lock()
+        self._profiles: 'OrderedDict[str, Dict]' = OrderedDict()
+
+    def authorized(self, headers) -> bool:
+        """Whether a request may flag profiling or read reports"""
+        if not self.enabled:
+            return False
+        if not self.token:
+            return True
+        return hmac.compare_digest(headers.get('X-Profile-Token', ''), self.token)
+
+    def begin(self, request) -> Optional[RequestProfile]:
+        """Start profiling request if it is flagged or due to be sampled, else None"""
+        if not self.enabled:
+            return None
+        flag = request.args.get('_profile') or request.headers.get('X-Profile')
+        if flag and self.authorized(request.headers):
+            mode = flag if flag in MODES else DETERMINISTIC
+            return RequestProfile(mode, 'flag', request.path, request.method)
+        if self.sample_every and next(self._requests) % self.sample_every == 0:
+            return RequestProfile(self.sample_mode, 'sample', request.path, request.method)
+        return None
+
+    def finish(self, profile: RequestProfile, status: int) -> str:
+        """Stop a request's profiler and store its report; returns the profile ID"""
+        profile.stop()
+        duration = time.perf_counter() - profile.started
+
+        if profile.mode == SAMPLING:
+            report = profile.profiler.report(self.top)
+            data = profile.profiler.folded().encode()
+        else:
+            out = io.StringIO()
+            stats = pstats.Stats(profile.profiler, stream=out)
+            stats.sort_stats('cumulative').print_stats(self.top)
+            report = out.getvalue()
+            profile.profiler.create_stats()
+            data = marshal.dumps(profile.profiler.stats)
+
+        profile_id = uuid.uuid4().hex[:12]
+        record = {
+            'id': profile_id,
+            'path': profile.path,
+            'method': profile.method,
+            'status': status,
+            'mode': profile.mode,
+            'reason': profile.reason,
+            'duration_ms': round(duration * 1000, 2),
+            'created_at': datetime.now().isoformat(),
+            'report': report,
+            'data': data
+        }
+        with self._lock:
+            self._profiles[profile_id] = record
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        logger.info(f"🔬 Profiled {profile.method} {profile.path} ({profile.mode}, {record['duration_ms']} ms): {profile_id}")
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict]:
+        """Stored profiles, newest first, without their reports"""
+        with self._lock:
+            records = list(self._profiles.values())
+        return [{key: value for key, value in record.items() if key not in ('report', 'data')}
+                for record in reversed(records)]
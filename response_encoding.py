@@ -0,0 +1,134 @@
+# response_encoding.py
+# Fast JSON serialization and gzip/brotli compression for API responses, with the
+# encoded bytes of versioned payloads cached so repeat polls skip both steps
+
+import gzip
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from cache import BoundedCache
+
+# Optional fast paths - fall back to the standard library when they are not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IDENTITY = 'identity'
+GZIP = 'gzip'
+BROTLI = 'br'
+
+def json_default(value: Any) -> Any:
+    """JSON fallback for non-native values: records serialize through to_dict(), anything else as str"""
+    to_dict = getattr(value, 'to_dict', None)
+    return to_dict() if callable(to_dict) else str(value)
+
+def dumps(value: Any) -> bytes:
+    """Serialize a payload to compact UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=json_default).encode('utf-8')
+
+def supported_encodings() -> List[str]:
+    """Content codings this process can produce, most preferred first"""
+    return ([BROTLI] if brotli is not None else []) + [GZIP, IDENTITY]
+
+class EncodedBodies:
+    """
+    Encoded bodies - serializes and compresses response payloads
+
+    Bodies of versioned payloads (a payload that is a pure function of a
+    snapshot version) are kept per (key, version, encoding), so every poll
+    after the first for a version is a dictionary hit with no JSON encoding
+    and no compression.
+
+    Keys can be sorted into scopes with their own entry budgets (e.g. one
+    body per booth), which are added to max_entries rather than carved out
+    of it: hundreds of small per-booth bodies churning through their scope
+    never evict the few large bodies every client shares.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 gzip_level: int = 6, brotli_quality: int = 5,
+                 scope_of: Optional[Callable[[Hashable], str]] = None,
+                 scope_entries: Optional[Dict[str, int]] = None):
+        """
+        Initialize the body cache
+
+        Args:
+            max_entries: Maximum encoded bodies kept outside the scopes
+            max_bytes: Memory budget for encoded bodies
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli compression quality (0-11)
+            scope_of: Maps a key to its scope (every key is 'shared' when None)
+            scope_entries: Maximum encoded bodies per scope, e.g. {'booth': 2048}
+        """
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_entries = max_entries
+        self.scope_of = scope_of or (lambda key: 'shared')
+        self.scope_entries = dict(scope_entries or {})
+        self._bodies = BoundedCache(max_entries=max_entries + sum(self.scope_entries.values()), max_bytes=max_bytes,
+                                    namespace_limits=self.scope_entries,
+                                    namespace_of=lambda cache_key: self.scope_of(cache_key[0]))
+        self.encodes = 0
+
+    def negotiate(self, accept_encodings) -> str:
+        """Pick the best content coding the client accepts (a werkzeug Accept, e.g. request.accept_encodings)"""
+        return accept_encodings.best_match(supported_encodings(), default=IDENTITY) or IDENTITY
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress an identity body with a content coding"""
+        if encoding == BROTLI:
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == GZIP:
+            return gzip.compress(body, compresslevel=self.gzip_level)
+        return body
+
+    def encode(self, payload: Any, encoding: str, key: Optional[Hashable] = None,
+               version: Optional[str] = None) -> bytes:
+        """
+        Serialize and compress a payload
+
+        Args:
+            payload: JSON-serializable payload
+            encoding: Content coding from negotiate()
+            key: Identifies a versioned payload (e.g. the request path); omit
+                for payloads that change between requests
+            version: Snapshot version the payload was built from
+
+        Returns:
+            The encoded body
+        """
+        if key is None or version is None:
+            return self.compress(dumps(payload), encoding)
+
+        cache_key = (key, version, encoding)
+        body = self._bodies.get(cache_key)
+        if body is None:
+            # Other codings of the same version reuse its identity body
+            identity = self._bodies.get((key, version, IDENTITY)) if encoding != IDENTITY else None
+            if identity is None:
+                identity = dumps(payload)
+                self._bodies.set((key, version, IDENTITY), identity)
+            body = self.compress(identity, encoding)
+            if encoding != IDENTITY:
+                self._bodies.set(cache_key, body)
+            self.encodes += 1
+            logger.info(f"🗜️ Encoded {key} v{version[:8]} as {encoding}: {len(identity)} -> {len(body)} bytes")
+        return body
+
+    def stats(self) -> Dict:
+        """Body cache counters plus how many bodies were encoded"""
+        return dict(self._bodies.stats(), encodes=self.encodes,
+                    fast_json=orjson is not None, encodings=supported_encodings())
@@ -0,0 +1,113 @@
+# server_timing.py
+# Per-request phase timings (cache lookup, upstream fetch, parse, filter, serialize) for
+# the Server-Timing response header, recorded from wherever the phase runs
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+_current = threading.local()
+
+class Phase:
+    """One named phase; description says how it went (e.g. hit, coalesced, fetched)"""
+
+    __slots__ = ('name', 'description', 'seconds')
+
+    def __init__(self, name: str, description: Optional[str] = None):
+        self.name = name
+        self.description = description
+        self.seconds = 0.0
+
+class RequestTiming:
+    """
+    Request timing - the phases one request went through, in the order they started
+
+    Phases recorded more than once (two cache lookups, say) are added up
+    under one entry. Work handed to another thread - a background refresh,
+    a dashboard source - is not attributed to the request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Phase] = {}
+
+    def add(self, name: str, seconds: float, description: Optional[str] = None) -> Phase:
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name, description)
+        elif description and description != phase.description:
+            phase.description = f"{phase.description},{description}" if phase.description else description
+        phase.seconds += seconds
+        return phase
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """Server-Timing header value, durations in milliseconds, ending with the request total"""
+        entries = []
+        for phase in self.phases.values():
+            entry = phase.name
+            if phase.description:
+                entry += f';desc="{phase.description}"'
+            entries.append(f"{entry};dur={phase.seconds * 1000:.2f}")
+        entries.append(f"total;dur={self.total() * 1000:.2f}")
+        return ', '.join(entries)
+
+    def as_dict(self) -> Dict:
+        """Phases so far for a response's _timing field, milliseconds"""
+        return {
+            'phases': [dict(name=phase.name, ms=round(phase.seconds * 1000, 3),
+                            **({'desc': phase.description} if phase.description else {}))
+                       for phase in self.phases.values()],
+            'elapsed_ms': round(self.total() * 1000, 3)
+        }
+
+def begin() -> RequestTiming:
+    """Start timing the request running on this thread"""
+    timing = _current.timing = RequestTiming()
+    return timing
+
+def end() -> Optional[RequestTiming]:
+    """Stop attributing phases on this thread to a request; returns its timing"""
+    timing = getattr(_current, 'timing', None)
+    _current.timing = None
+    return timing
+
+def current() -> Optional[RequestTiming]:
+    """Timing of the request running on this thread, or None"""
+    return getattr(_current, 'timing', None)
+
+def record(name: str, seconds: float, description: Optional[str] = None):
+    """Add an already measured phase to the current request (no-op outside a request)"""
+    timing = getattr(_current, 'timing', None)
+    if timing is not None:
+        timing.add(name, seconds, description)
+
+class _Described:
+    __slots__ = ('description',)
+
+    def __init__(self, description: Optional[str]):
+        self.description = description
+
+@contextmanager
+def phase(name: str, description: Optional[str] = None):
+    """
+    Time the with block as a phase of the current request
+
+    The yielded object's description can be set inside the block, for
+    outcomes only known at the end (e.g. whether a fetch was coalesced).
+    """
+    described = _Described(description)
+    timing = getattr(_current, 'timing', None)
+    if timing is None:
+        yield described
+        return
+    # Registered up front so an enclosing phase is listed before the phases inside it
+    timing.add(name, 0.0)
+    started = time.perf_counter()
+    try:
+        yield described
+    finally:
+        timing.add(name, time.perf_counter() - started, described.description)
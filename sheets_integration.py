@@ -2,30 +2,117 @@
 # This script adapts your existing Google Sheets code for the API (NO PANDAS)
 
 import gspread
+from gspread.utils import absolute_range_name, fill_gaps, rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import logging
+import threading
+import time
 from datetime import datetime
+from itertools import count, zip_longest
 from typing import List, Dict, Optional
 
+import server_timing
+from metrics import UPSTREAM_ERRORS, UPSTREAM_SECONDS
+from order_record import OrderRecord, intern_column
+from orders_snapshot import OrdersSnapshot
+from sheets_quota import SheetsQuotaExceeded
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sheet status -> API status; anything else is 'in-process'
+ORDER_STATUS_MAP = {
+    'Delivered': 'delivered',
+    'Received': 'delivered',
+    'Out for delivery': 'out-for-delivery',
+    'In route from warehouse': 'in-route',
+    'In Process': 'in-process',
+    'cancelled': 'cancelled',
+    'Cancelled': 'cancelled'
+}
+
+# Columns parse_orders_data reads, in OrderRecord argument order, with the value
+# used when the sheet has no such column or the row is shorter than the header
+ORDER_COLUMNS = (
+    ('Booth #', ''),
+    ('Exhibitor Name', ''),
+    ('Item', ''),
+    ('Color', ''),
+    ('Quantity', '1'),
+    ('Status', ''),
+    ('Date', ''),
+    ('Comments', ''),
+    ('Section', ''),
+    ('Type', ''),
+    ('User', ''),
+    ('Hour', '')
+)
+
+# Sheet columns whose values repeat across rows; parsed values are interned
+ORDER_INTERNED_COLUMNS = frozenset(('Booth #', 'Exhibitor Name', 'Item', 'Color', 'Date',
+                                    'Section', 'Type', 'User'))
+
+class SheetSyncState:
+    """
+    Last synced copy of one worksheet and the change signal it was synced at
+    
+    The only place the raw rows are kept: the tail diff needs them, and
+    generation (bumped whenever they change) tells build_orders_snapshot
+    whether rows it was handed are still the ones its last snapshot parsed.
+    """
+    
+    def __init__(self):
+        self.rows = []
+        self.generation = 0
+        self.revision = None
+        self.synced_at = 0.0
+        self.full_synced_at = 0.0
+        self.lock = threading.Lock()
+
 class GoogleSheetsManager:
     """
     Google Sheets Manager - adapted from your existing code (NO PANDAS)
     """
     
-    def __init__(self, credentials_path: str = None):
+    def __init__(self, credentials_path: str = None, snapshot_ttl: int = 120,
+                 incremental_sync: bool = False, full_sync_interval: int = 600,
+                 mutable_columns: tuple = ('Status',), tail_overlap: int = 5, client=None, quota=None):
         """
         Initialize Google Sheets Manager
         
         Args:
             credentials_path: Path to your Google service account JSON file
+            snapshot_ttl: Seconds an orders snapshot is reused by the lookup helpers
+            incremental_sync: Make get_data check the spreadsheet revision first and
+                download only what changed (see get_data)
+            full_sync_interval: Seconds between full downloads in incremental mode, which
+                pick up edits outside mutable_columns and the appended tail
+            mutable_columns: Header names re-read on every incremental sync because rows
+                are edited in place there (delivery status)
+            tail_overlap: Already-synced rows re-read with the new tail to verify nothing
+                above it was inserted or deleted
+            client: Ready gspread client (or a stand-in with the same interface) used
+                instead of authorizing with credentials_path
+            quota: SheetsQuota every Sheets API read is paid from; reads it refuses raise
+                SheetsQuotaExceeded from get_data instead of returning []
         """
         self.credentials_path = credentials_path
-        self.gc = None
-        self.setup_client()
+        self.gc = client
+        self.quota = quota
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshots = {}  # (sheet_id, worksheet_name) -> (OrdersSnapshot, monotonic time, sync generation)
+        self.incremental_sync = incremental_sync
+        self.full_sync_interval = full_sync_interval
+        self.mutable_columns = tuple(mutable_columns)
+        self.tail_overlap = tail_overlap
+        self._sync_states = {}  # (sheet_id, worksheet_name) -> SheetSyncState
+        self._sync_states_lock = threading.Lock()
+        self.sync_stats = {'unchanged': 0, 'incremental': 0, 'full': 0}
+        self._spreadsheets = {}  # sheet_id -> gspread Spreadsheet
+        self._handles_lock = threading.Lock()
+        if self.gc is None:
+            self.setup_client()
     
     def setup_client(self):
         """Setup Google Sheets client"""
@@ -50,37 +137,219 @@ class GoogleSheetsManager:
             logger.error(f"Error setting up Google Sheets client: {e}")
             self.gc = None
     
-    def get_data(self, sheet_id: str, worksheet_name: str = "Orders") -> List[List]:
+    def _spend_quota(self, operation: str):
+        """Pay for one Sheets API read (raises SheetsQuotaExceeded when the budget is spent)"""
+        if self.quota is not None:
+            self.quota.spend(operation)
+    
+    def get_spreadsheet(self, sheet_id: str):
+        """
+        Get the spreadsheet handle for a sheet ID, opening it only the first time
+        
+        Args:
+            sheet_id: Google Sheet ID
+            
+        Returns:
+            gspread Spreadsheet
+        """
+        spreadsheet = self._spreadsheets.get(sheet_id)
+        if spreadsheet is None:
+            if not self.gc:
+                raise Exception("Google Sheets client not initialized")
+            self._spend_quota('open')
+            spreadsheet = self.gc.open_by_key(sheet_id)
+            with self._handles_lock:
+                spreadsheet = self._spreadsheets.setdefault(sheet_id, spreadsheet)
+        return spreadsheet
+    
+    def invalidate_handles(self, sheet_id: str = None):
+        """Forget cached spreadsheet handles (for one sheet ID, or all) so they are reopened on next use"""
+        with self._handles_lock:
+            if sheet_id is None:
+                self._spreadsheets.clear()
+            else:
+                self._spreadsheets.pop(sheet_id, None)
+    
+    def _batch_read(self, spreadsheet, ranges: List[str], operation: str) -> List[List[List]]:
+        """
+        Read A1 ranges of one spreadsheet in a single values batchGet call
+        
+        Every Sheets read in a refresh goes through here: a bare worksheet name
+        reads the whole worksheet without looking its handle up first.
+        
+        Args:
+            spreadsheet: gspread Spreadsheet (see get_spreadsheet)
+            ranges: Absolute A1 ranges (see gspread.utils.absolute_range_name)
+            operation: Name the read is paid for under in the quota log
+            
+        Returns:
+            Raw values of each range, in request order (rows not padded)
+        """
+        self._spend_quota(operation)
+        response = spreadsheet.values_batch_get(ranges)
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+    
+    def batch_get(self, sheet_id: str, ranges: List[str], operation: str = 'batch_get') -> List[List[List]]:
+        """
+        Read several ranges of one spreadsheet in a single values batchGet call
+        
+        Args:
+            sheet_id: Google Sheet ID
+            ranges: A1 ranges such as 'Orders!A2:M' or "'Orders'!C1:C40"; a bare
+                worksheet name reads the whole worksheet
+            operation: Name the read is paid for under in the quota log
+            
+        Returns:
+            Raw values of each range, in request order (rows not padded; see
+            gspread.utils.fill_gaps)
+            
+        Raises:
+            SheetsQuotaExceeded: If the quota budget cannot pay for the read
+        """
+        return self._batch_read(self.get_spreadsheet(sheet_id),
+                                [absolute_range_name(*self._split_range(r)) for r in ranges], operation)
+    
+    @staticmethod
+    def _split_range(range_name: str) -> tuple:
+        """Split 'Orders!A1:C' into ('Orders', 'A1:C'); a bare name is the whole worksheet"""
+        if '!' in range_name:
+            sheet_name, cells = range_name.rsplit('!', 1)
+            return sheet_name.strip("'"), cells
+        return range_name, None
+    
+    def get_data(self, sheet_id: str, worksheet_name: str = "Orders", incremental: bool = None) -> List[List]:
         """
         Get data from Google Sheets - NO PANDAS VERSION
         
+        In incremental mode the spreadsheet's Drive modifiedTime is checked first
+        and the previous rows are returned untouched when it has not changed.
+        When it has, only the appended tail and the mutable columns are read in
+        one batch call, falling back to a full download when rows were inserted
+        or deleted above the tail, or every full_sync_interval seconds.
+        
         Args:
             sheet_id: Google Sheet ID
             worksheet_name: Name of the worksheet
+            incremental: Override the manager's incremental_sync setting
             
         Returns:
             List of lists with the sheet data
         """
+        started = time.perf_counter()
         try:
             if not self.gc:
                 raise Exception("Google Sheets client not initialized")
             
-            # Open the spreadsheet
-            spreadsheet = self.gc.open_by_key(sheet_id)
-            worksheet = spreadsheet.worksheet(worksheet_name)
-            
-            # Get all values
-            data = worksheet.get_all_values()
+            if incremental is None:
+                incremental = self.incremental_sync
+            if incremental:
+                return self._sync_data(sheet_id, worksheet_name)
             
-            if not data:
+            # One batchGet on the cached spreadsheet handle (no worksheet metadata lookup)
+            values, = self._batch_read(self.get_spreadsheet(sheet_id), [absolute_range_name(worksheet_name)], 'get_data')
+            if not values:
                 return []
+            data = fill_gaps(values)
             
             logger.info(f"Successfully loaded {len(data)} rows from {worksheet_name}")
             return data
             
+        except SheetsQuotaExceeded:
+            raise
         except Exception as e:
             logger.error(f"Error getting data from sheet: {e}")
+            UPSTREAM_ERRORS.inc(backend='sheets', operation='get_data')
+            self.invalidate_handles(sheet_id)
             return []
+        finally:
+            elapsed = time.perf_counter() - started
+            UPSTREAM_SECONDS.observe(elapsed, backend='sheets', operation='get_data')
+            server_timing.record('sheets', elapsed)
+    
+    def _sync_state(self, sheet_id: str, worksheet_name: str) -> SheetSyncState:
+        with self._sync_states_lock:
+            return self._sync_states.setdefault((sheet_id, worksheet_name), SheetSyncState())
+    
+    def _sync_data(self, sheet_id: str, worksheet_name: str) -> List[List]:
+        """Incremental version of get_data (see get_data)"""
+        state = self._sync_state(sheet_id, worksheet_name)
+        
+        with state.lock:
+            spreadsheet = self.get_spreadsheet(sheet_id)
+            
+            # Cheap change signal: Drive modifiedTime (a Drive call, not Sheets read quota)
+            try:
+                revision = spreadsheet.get_lastUpdateTime()
+            except Exception as e:
+                logger.warning(f"Could not read revision for {worksheet_name}, syncing anyway: {e}")
+                revision = None
+            
+            now = time.time()
+            if state.rows and revision is not None and revision == state.revision:
+                state.synced_at = now
+                self.sync_stats['unchanged'] += 1
+                logger.info(f"{worksheet_name} unchanged since {revision}, skipping download")
+                return state.rows
+            
+            rows = None
+            if state.rows and now - state.full_synced_at < self.full_sync_interval:
+                rows = self._sync_tail(state, sheet_id, worksheet_name)
+                if rows is not None:
+                    self.sync_stats['incremental'] += 1
+            
+            if rows is None:
+                values, = self._batch_read(spreadsheet, [absolute_range_name(worksheet_name)], 'get_data')
+                rows = fill_gaps(values) if values else []
+                state.full_synced_at = now
+                self.sync_stats['full'] += 1
+                logger.info(f"Successfully loaded {len(rows)} rows from {worksheet_name} (full sync)")
+            
+            state.rows = rows
+            state.generation += 1
+            state.revision = revision
+            state.synced_at = now
+            return rows
+    
+    def _sync_tail(self, state: SheetSyncState, sheet_id: str, worksheet_name: str) -> Optional[List[List]]:
+        """
+        Read the appended tail and the mutable columns in one batch call
+        
+        Returns:
+            Updated rows, or None when the previous rows no longer line up and a
+            full download is needed
+        """
+        previous = state.rows
+        width = max(len(row) for row in previous)
+        header_idx = next((i for i, row in enumerate(previous) if any('Booth' in str(cell) for cell in row)), 0)
+        headers = [str(cell).strip() for cell in previous[header_idx]]
+        mutable = [headers.index(name) for name in self.mutable_columns if name in headers]
+        
+        start = max(len(previous) - self.tail_overlap, header_idx + 1)
+        last_col = rowcol_to_a1(1, width).rstrip('0123456789')
+        ranges = [f"{worksheet_name}!A{start + 1}:{last_col}"]
+        for col in mutable:
+            letter = rowcol_to_a1(1, col + 1).rstrip('0123456789')
+            ranges.append(f"{worksheet_name}!{letter}1:{letter}{start}")
+        
+        tail, *mutable_values = self.batch_get(sheet_id, ranges, 'sync_tail')
+        tail = fill_gaps(tail, cols=width) if tail else []
+        
+        # Overlapping rows must match outside the mutable columns, otherwise rows moved above the tail
+        overlap = previous[start:]
+        def fixed(row):
+            return [cell for i, cell in enumerate(row) if i not in mutable]
+        if len(tail) < len(overlap) or any(fixed(a) != fixed(b) for a, b in zip(tail, overlap)):
+            logger.info(f"{worksheet_name} changed above the synced tail, falling back to full sync")
+            return None
+        
+        rows = [list(row) for row in previous[:start]] + tail
+        for col, values in zip(mutable, mutable_values):
+            for row_idx in range(start):
+                rows[row_idx][col] = values[row_idx][0] if row_idx < len(values) and values[row_idx] else ''
+        
+        logger.info(f"Incremental sync of {worksheet_name}: {len(tail) - len(overlap)} new rows, "
+                    f"{len(mutable)} mutable columns refreshed")
+        return rows
     
     def get_worksheets(self, sheet_id: str) -> List[str]:
         """
@@ -96,7 +365,8 @@ class GoogleSheetsManager:
             if not self.gc:
                 return []
             
-            spreadsheet = self.gc.open_by_key(sheet_id)
+            spreadsheet = self.get_spreadsheet(sheet_id)
+            self._spend_quota('worksheets')
             worksheets = [ws.title for ws in spreadsheet.worksheets()]
             
             logger.info(f"Found worksheets: {worksheets}")
@@ -104,6 +374,7 @@ class GoogleSheetsManager:
             
         except Exception as e:
             logger.error(f"Error getting worksheets: {e}")
+            self.invalidate_handles(sheet_id)
             return []
     
     def map_order_status(self, sheet_status: str) -> str:
@@ -116,27 +387,21 @@ class GoogleSheetsManager:
         Returns:
             Mapped status for API
         """
-        status_mapping = {
-            'Delivered': 'delivered',
-            'Received': 'delivered',
-            'Out for delivery': 'out-for-delivery',
-            'In route from warehouse': 'in-route',
-            'In Process': 'in-process',
-            'cancelled': 'cancelled',
-            'Cancelled': 'cancelled'
-        }
-        
-        return status_mapping.get(sheet_status, 'in-process')
+        return ORDER_STATUS_MAP.get(sheet_status, 'in-process')
     
-    def parse_orders_data(self, data: List[List]) -> List[Dict]:
+    def parse_orders_data(self, data: List[List]) -> List[OrderRecord]:
         """
-        Parse raw data and convert to order dictionaries - NO PANDAS VERSION
+        Parse raw data and convert to order records - NO PANDAS VERSION
+        
+        Each needed column is resolved to its position once per header row and
+        extracted in one column-wise pass, so the per-row loop only assembles
+        records from values that are already stripped.
         
         Args:
             data: List of lists with raw sheet data
             
         Returns:
-            List of order dictionaries
+            List of compact order records (readable like order dictionaries)
         """
         orders = []
         
@@ -159,53 +424,53 @@ class GoogleSheetsManager:
                 headers = [str(cell).strip() for cell in data[0]]
                 header_row_idx = 0
             
-            logger.info(f"Using headers: {headers}")
-            
-            # Process data rows
-            for row_idx, row in enumerate(data[header_row_idx + 1:], start=header_row_idx + 1):
-                if not row or len(row) == 0:
-                    continue
-                
-                # Create dictionary from row data
-                row_dict = {}
-                for i, value in enumerate(row):
-                    if i < len(headers):
-                        row_dict[headers[i]] = str(value).strip()
-                
-                # Extract order data
-                booth_num = row_dict.get('Booth #', '').strip()
-                exhibitor_name = row_dict.get('Exhibitor Name', '').strip()
-                item = row_dict.get('Item', '').strip()
-                
+            logger.debug(f"Using headers: {headers}")
+            
+            body = data[header_row_idx + 1:]
+            # Transpose once; cells missing from short rows read as '' (the parser's default for
+            # every column - a blank Quantity still parses as 1)
+            sheet_columns = list(zip_longest(*body, fillvalue=''))
+            
+            def column(header, default):
+                indices = [i for i, name in enumerate(headers) if name == header]
+                if not indices:
+                    return [default] * len(body)
+                if len(indices) > 1:
+                    # A repeated header takes the last of its columns the row reaches
+                    return [str(row[[i for i in indices if i < len(row)][-1]]).strip() if indices[0] < len(row) else default
+                            for row in body]
+                cells = sheet_columns[indices[0]] if indices[0] < len(sheet_columns) else ('',) * len(body)
+                try:
+                    return list(map(str.strip, cells))
+                except TypeError:
+                    # Non-string cells (numbers from a mock or a typed export)
+                    return [str(cell).strip() for cell in cells]
+            
+            columns = [column(header, default) for header, default in ORDER_COLUMNS]
+            # Share one string per distinct booth, exhibitor, item, ... across all rows
+            columns = [intern_column(values) if header in ORDER_INTERNED_COLUMNS else values
+                       for (header, _), values in zip(ORDER_COLUMNS, columns)]
+            
+            # Few distinct quantities and statuses repeat across rows; convert each once
+            quantities = {}
+            status_of = ORDER_STATUS_MAP.get
+            
+            for (row_idx, booth_num, exhibitor_name, item, color, quantity, status, date,
+                 comments, section, order_type, user, hour) in zip(count(header_row_idx + 1), *columns):
                 # Skip rows without essential data
                 if not booth_num or not exhibitor_name:
                     continue
                 
-                # Create order ID
-                date = row_dict.get('Date', '').strip()
-                order_id = f"ORD-{date.replace('/', '-')}-{booth_num}-{row_idx}"
+                parsed_quantity = quantities.get(quantity)
+                if parsed_quantity is None:
+                    parsed_quantity = quantities[quantity] = self._safe_int(quantity)
                 
-                # Build order dictionary
-                order = {
-                    'id': order_id,
-                    'booth_number': booth_num,
-                    'exhibitor_name': exhibitor_name,
-                    'item': item,
-                    'description': f"Order from Google Sheets: {item}",
-                    'color': row_dict.get('Color', '').strip(),
-                    'quantity': self._safe_int(row_dict.get('Quantity', '1')),
-                    'status': self.map_order_status(row_dict.get('Status', '').strip()),
-                    'order_date': date,
-                    'comments': row_dict.get('Comments', '').strip(),
-                    'section': row_dict.get('Section', '').strip(),
-                    'type': row_dict.get('Type', '').strip(),
-                    'user': row_dict.get('User', '').strip(),
-                    'hour': row_dict.get('Hour', '').strip(),
-                    'abacus_ai_processed': True,
-                    'data_source': 'Google Sheets via Abacus AI'
-                }
-                
-                orders.append(order)
+                # Compact record; the order dict is only built when a response is serialized
+                orders.append(OrderRecord(
+                    f"ORD-{date.replace('/', '-')}-{booth_num}-{row_idx}",
+                    booth_num, exhibitor_name, item, color, parsed_quantity,
+                    status_of(status, 'in-process'), date, comments, section, order_type, user, hour
+                ))
             
             logger.info(f"Parsed {len(orders)} valid orders from Google Sheets")
             return orders
@@ -221,6 +486,60 @@ class GoogleSheetsManager:
         except (ValueError, TypeError):
             return default
     
+    def build_orders_snapshot(self, sheet_id: str, worksheet_name: str = "Orders") -> OrdersSnapshot:
+        """
+        Download and parse a worksheet into an indexed orders snapshot
+        
+        Args:
+            sheet_id: Google Sheet ID
+            worksheet_name: Name of the worksheet
+            
+        Returns:
+            OrdersSnapshot (empty if the sheet had no data)
+        """
+        data = self.get_data(sheet_id, worksheet_name)
+        
+        # Incremental sync hands back the same rows (same generation) when the sheet is unchanged
+        generation = self._rows_generation(sheet_id, worksheet_name, data) if data else None
+        previous = self._snapshots.get((sheet_id, worksheet_name))
+        if previous and generation is not None and previous[2] == generation:
+            snapshot = previous[0].revalidated()
+        else:
+            with server_timing.phase('parse'):
+                orders = self.parse_orders_data(data) if data else []
+            with server_timing.phase('index'):
+                snapshot = OrdersSnapshot(orders, source='Google Sheets')
+        self._snapshots[(sheet_id, worksheet_name)] = (snapshot, time.monotonic(), generation)
+        return snapshot
+    
+    def _rows_generation(self, sheet_id: str, worksheet_name: str, rows: List[List]) -> Optional[int]:
+        """Sync generation of rows if they are still the worksheet's synced rows, else None"""
+        state = self._sync_states.get((sheet_id, worksheet_name))
+        if state is None:
+            return None
+        with state.lock:
+            return state.generation if state.rows is rows else None
+    
+    def get_orders_snapshot(self, sheet_id: str, worksheet_name: str = "Orders",
+                            force_refresh: bool = False) -> OrdersSnapshot:
+        """
+        Get an orders snapshot, reusing the last one while it is younger than snapshot_ttl
+        
+        Args:
+            sheet_id: Google Sheet ID
+            worksheet_name: Name of the worksheet
+            force_refresh: Always download a fresh snapshot
+            
+        Returns:
+            OrdersSnapshot
+        """
+        cached = self._snapshots.get((sheet_id, worksheet_name))
+        if cached and not force_refresh:
+            snapshot, built_at, _ = cached
+            if time.monotonic() - built_at < self.snapshot_ttl:
+                return snapshot
+        return self.build_orders_snapshot(sheet_id, worksheet_name)
+    
     def get_orders_for_exhibitor(self, sheet_id: str, exhibitor_name: str) -> List[Dict]:
         """
         Get all orders for a specific exhibitor
@@ -233,21 +552,14 @@ class GoogleSheetsManager:
             List of orders for the exhibitor
         """
         try:
-            # Get raw data from main Orders sheet
-            data = self.get_data(sheet_id, "Orders")
+            snapshot = self.get_orders_snapshot(sheet_id)
             
-            if not data:
+            if not snapshot:
                 logger.warning("No data found in Orders sheet")
                 return []
             
-            # Parse all orders
-            all_orders = self.parse_orders_data(data)
-            
-            # Filter by exhibitor name (case-insensitive)
-            exhibitor_orders = [
-                order for order in all_orders 
-                if order['exhibitor_name'].lower() == exhibitor_name.lower()
-            ]
+            # Case-insensitive exhibitor index lookup
+            exhibitor_orders = snapshot.for_exhibitor(exhibitor_name)
             
             logger.info(f"Found {len(exhibitor_orders)} orders for {exhibitor_name}")
             return exhibitor_orders
@@ -267,32 +579,7 @@ class GoogleSheetsManager:
             List of exhibitor dictionaries
         """
         try:
-            data = self.get_data(sheet_id, "Orders")
-            
-            if not data:
-                return []
-            
-            all_orders = self.parse_orders_data(data)
-            
-            # Group by exhibitor
-            exhibitors = {}
-            for order in all_orders:
-                name = order['exhibitor_name']
-                booth = order['booth_number']
-                
-                if name not in exhibitors:
-                    exhibitors[name] = {
-                        'name': name,
-                        'booth': booth,
-                        'total_orders': 0,
-                        'delivered_orders': 0
-                    }
-                
-                exhibitors[name]['total_orders'] += 1
-                if order['status'] == 'delivered':
-                    exhibitors[name]['delivered_orders'] += 1
-            
-            return list(exhibitors.values())
+            return self.get_orders_snapshot(sheet_id).exhibitors()
             
         except Exception as e:
             logger.error(f"Error getting exhibitors: {e}")
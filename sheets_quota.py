@@ -0,0 +1,332 @@
+# sheets_quota.py
+# Google Sheets read quota budget: a token bucket spent by every Sheets API read, in this
+# process or shared between gunicorn workers (SQLite or Redis), and the policy that turns
+# a low balance into longer cache TTLs, debounced forced refreshes and throttled responses
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SheetsQuotaExceeded(Exception):
+    """A Sheets read was refused because the quota budget is spent"""
+
+def _check_rates(capacity: float, refill_per_second: float):
+    """Reject a bucket that could never grant or never refill a read"""
+    if capacity <= 0 or refill_per_second <= 0:
+        raise ValueError(f"Token bucket needs a positive capacity and refill rate "
+                         f"(got capacity={capacity}, refill_per_second={refill_per_second})")
+
+class TokenBucket:
+    """
+    Token bucket - capacity tokens, refilled continuously at refill_per_second
+
+    Tokens are refilled lazily from the time of the last acquisition, so an
+    idle bucket costs nothing.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize a full bucket
+
+        Args:
+            capacity: Most tokens the bucket holds (the burst a fresh budget allows)
+            refill_per_second: Tokens added per second (the sustained rate)
+        """
+        _check_rates(capacity, refill_per_second)
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if the bucket has them"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def available(self) -> float:
+        """Tokens in the bucket now"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+class SQLiteTokenBucket:
+    """Token bucket shared by every worker on the host through one SQLite row (see TokenBucket)"""
+
+    backend = 'sqlite'
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float, path: Optional[str] = None):
+        """
+        Initialize the bucket, creating it full if no worker has yet
+
+        Args:
+            name: Bucket name (one row per name)
+            capacity: Most tokens the bucket holds
+            refill_per_second: Tokens added per second
+            path: SQLite file (defaults to /dev/shm when available, else the temp dir)
+        """
+        _check_rates(capacity, refill_per_second)
+        shm = '/dev/shm'
+        default_dir = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else tempfile.gettempdir()
+        self.path = path or os.path.join(default_dir, 'expo_quota.sqlite3')
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._local = threading.local()
+
+        db = self._connect()
+        db.execute("""CREATE TABLE IF NOT EXISTS buckets (
+            name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)""")
+        db.execute("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)", (name, capacity, time.time()))
+        logger.info(f"Shared quota bucket {name} at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def _take(self, tokens: float) -> tuple:
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            stored, updated_at = db.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?",
+                                            (self.name,)).fetchone()
+            now = time.time()
+            available = min(self.capacity, stored + max(0.0, now - updated_at) * self.refill_per_second)
+            granted = available >= tokens
+            if granted:
+                available -= tokens
+            if tokens:
+                db.execute("UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                           (available, now, self.name))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return granted, available
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        return self._take(tokens)[0]
+
+    def available(self) -> float:
+        """Tokens in the bucket now, read without a write transaction (WAL readers never wait on writers)"""
+        stored, updated_at = self._connect().execute("SELECT tokens, updated_at FROM buckets WHERE name = ?",
+                                                     (self.name,)).fetchone()
+        return min(self.capacity, stored + max(0.0, time.time() - updated_at) * self.refill_per_second)
+
+# Refill and take in one atomic step: KEYS[1] = bucket hash; ARGV = capacity, refill per second, tokens
+_REDIS_TAKE = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * tonumber(ARGV[2]))
+local granted = 0
+if tokens >= tonumber(ARGV[3]) then
+  tokens = tokens - tonumber(ARGV[3])
+  granted = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / tonumber(ARGV[2])) + 60)
+return {granted, tostring(tokens)}
+"""
+
+class RedisTokenBucket:
+    """Token bucket shared by every worker through a Redis hash, refilled by a Lua script (see TokenBucket)"""
+
+    backend = 'redis'
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float,
+                 url: str = 'redis://localhost:6379/0', prefix: str = 'expo:'):
+        """
+        Initialize the bucket
+
+        Args:
+            name: Bucket name
+            capacity: Most tokens the bucket holds
+            refill_per_second: Tokens added per second
+            url: Redis URL
+            prefix: Prefix for the bucket's key
+        """
+        _check_rates(capacity, refill_per_second)
+        import redis  # optional dependency, only needed for a redis quota backend
+
+        self.redis = redis.Redis.from_url(url)
+        self.key = f"{prefix}quota:{name}"
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._take = self.redis.register_script(_REDIS_TAKE)
+        logger.info(f"Shared quota bucket {name} at {url}")
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        granted, _ = self._take(keys=[self.key], args=[self.capacity, self.refill_per_second, tokens])
+        return bool(granted)
+
+    def available(self) -> float:
+        """Tokens in the bucket now, read with HMGET and the server clock instead of the writing script"""
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hmget(self.key, 'tokens', 'updated_at')
+        pipeline.time()
+        (stored, updated_at), (seconds, microseconds) = pipeline.execute()
+        if stored is None or updated_at is None:
+            return float(self.capacity)
+        now = seconds + microseconds / 1000000
+        return min(self.capacity, float(stored) + max(0.0, now - float(updated_at)) * self.refill_per_second)
+
+def create_bucket(backend: str, name: str, capacity: float, refill_per_second: float,
+                  path: Optional[str] = None, url: Optional[str] = None):
+    """
+    Create the token bucket selected by configuration
+
+    Args:
+        backend: 'memory' (per process), 'sqlite' (shared on one host) or 'redis'
+        name: Bucket name, shared by every worker using the same backend
+        capacity: Most tokens the bucket holds
+        refill_per_second: Tokens added per second
+        path: SQLite file (sqlite backend)
+        url: Redis URL (redis backend)
+
+    Returns:
+        TokenBucket, SQLiteTokenBucket or RedisTokenBucket
+
+    Raises:
+        ValueError: If capacity or refill_per_second is not positive
+    """
+    backend = (backend or 'memory').lower()
+    if backend == 'redis':
+        return RedisTokenBucket(name, capacity, refill_per_second, url=url or 'redis://localhost:6379/0')
+    if backend == 'sqlite':
+        return SQLiteTokenBucket(name, capacity, refill_per_second, path=path)
+    return TokenBucket(capacity, refill_per_second)
+
+class SheetsQuota:
+    """
+    Sheets quota - the read budget GoogleSheetsManager spends, and how callers adapt to it
+
+    Every Sheets API read spends one token; a read the bucket cannot pay for
+    raises SheetsQuotaExceeded instead of reaching Google and coming back 429.
+    Below low_watermark of capacity the budget counts as low: cache TTLs are
+    stretched up to max_ttl_factor as the balance approaches zero, forced
+    refreshes of data younger than the (stretched) debounce window are served
+    from cache, and responses report the data as throttled.
+
+    The level is read from the bucket at most once per refill period (the
+    time one token takes to come back) and reused in between, so requests
+    served from cache never touch a shared bucket.
+    """
+
+    def __init__(self, bucket, low_watermark: float = 0.25, max_ttl_factor: float = 4.0,
+                 force_refresh_debounce: float = 30):
+        """
+        Initialize the budget
+
+        Args:
+            bucket: TokenBucket, SQLiteTokenBucket or RedisTokenBucket
+            low_watermark: Fraction of capacity below which the budget is low
+            max_ttl_factor: TTL multiplier when the bucket is empty
+            force_refresh_debounce: Seconds a snapshot is kept despite forced refreshes while the budget is low
+        """
+        self.bucket = bucket
+        self.low_watermark = low_watermark
+        self.max_ttl_factor = max_ttl_factor
+        self.force_refresh_debounce = force_refresh_debounce
+        self._lock = threading.Lock()
+        self._spent = 0
+        self._refused = 0
+        self._debounced = 0
+        self._refused_at = 0.0
+        self._level = None
+        self._level_at = 0.0
+
+    def spend(self, operation: str, tokens: float = 1):
+        """
+        Pay for one Sheets read
+
+        Raises:
+            SheetsQuotaExceeded: If the budget cannot cover it
+        """
+        if self.bucket.try_acquire(tokens):
+            with self._lock:
+                self._spent += tokens
+                self._level = None
+            return
+        with self._lock:
+            self._refused += 1
+            self._refused_at = time.monotonic()
+            self._level = None
+        logger.warning(f"⏳ Sheets quota spent, refusing {operation}")
+        raise SheetsQuotaExceeded(f"Sheets read quota spent ({operation})")
+
+    def level(self) -> float:
+        """Fraction of the bucket's capacity available, as read within the last refill period"""
+        now = time.monotonic()
+        with self._lock:
+            if self._level is not None and now - self._level_at < 1 / self.bucket.refill_per_second:
+                return self._level
+        level = max(0.0, min(1.0, self.bucket.available() / self.bucket.capacity))
+        with self._lock:
+            self._level, self._level_at = level, now
+        return level
+
+    def ttl_factor(self, level: Optional[float] = None) -> float:
+        """Cache TTL multiplier: 1 above the low watermark, rising to max_ttl_factor at an empty bucket"""
+        level = self.level() if level is None else level
+        if level >= self.low_watermark:
+            return 1.0
+        return 1.0 + (self.max_ttl_factor - 1.0) * (1.0 - level / self.low_watermark)
+
+    def allow_force_refresh(self, data_age: Optional[float], level: Optional[float] = None) -> bool:
+        """Whether a forced refresh of data this old may spend quota (always, unless the budget is low)"""
+        if data_age is None:
+            return True
+        level = self.level() if level is None else level
+        if level >= self.low_watermark or data_age >= self.force_refresh_debounce * self.ttl_factor(level):
+            return True
+        with self._lock:
+            self._debounced += 1
+        return False
+
+    def throttled(self, level: Optional[float] = None) -> bool:
+        """Whether data may be older than usual: the budget is low, or a read was refused in the last refill period"""
+        with self._lock:
+            refused_recently = time.monotonic() - self._refused_at < 1 / self.bucket.refill_per_second
+        return refused_recently or (self.level() if level is None else level) < self.low_watermark
+
+    def stats(self) -> Dict:
+        """Balance, policy state and counters"""
+        level = self.level()
+        with self._lock:
+            return {
+                'backend': self.bucket.backend,
+                'capacity': self.bucket.capacity,
+                'refill_per_minute': round(self.bucket.refill_per_second * 60, 2),
+                'level': round(level, 3),
+                'low': level < self.low_watermark,
+                'ttl_factor': round(self.ttl_factor(level), 2),
+                'spent': self._spent,
+                'refused': self._refused,
+                'debounced_force_refreshes': self._debounced
+            }
@@ -0,0 +1,100 @@
+# single_flight.py
+# Coalesces concurrent upstream loads so only one fetch per key is in flight
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """One in-flight fetch and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Single-flight group - at most one call per key runs at a time
+
+    Callers that arrive while a call for the same key is running wait for it
+    and receive its result (or its exception) instead of starting their own.
+    """
+
+    def __init__(self, namespace_of: Callable[[str], str] = None):
+        """
+        Args:
+            namespace_of: Maps a key to the namespace its counters are kept
+                under, so per-booth keys do not grow the stats without bound
+        """
+        self._namespace_of = namespace_of or (lambda key: key)
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._fetches = 0
+        self._coalesced = 0
+        self._coalesced_by_namespace: Dict[str, int] = {}
+
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn for key, or wait for the call already running for key
+
+        Args:
+            key: Coalescing key (usually the cache key)
+            fn: Function performing the upstream fetch
+
+        Returns:
+            Tuple of (result, coalesced) where coalesced is True when this
+            caller shared another caller's fetch
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                namespace = self._namespace_of(key)
+                self._coalesced_by_namespace[namespace] = self._coalesced_by_namespace.get(namespace, 0) + 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._fetches += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"🔗 Coalesced {call.waiters} waiting requests onto one fetch for {key}")
+
+        return call.result, False
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for key is currently running"""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict:
+        """Fetch and coalescing counters"""
+        with self._lock:
+            return {
+                'fetches': self._fetches,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls),
+                'coalesced_by_namespace': dict(self._coalesced_by_namespace)
+            }
@@ -0,0 +1,118 @@
+# snapshot_history.py
+# Recent snapshot versions, retained as per-record content hashes so a client that
+# last saw one of them can be sent only the records that changed since
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class SnapshotHistory:
+    """
+    Snapshot history - the last max_versions versions of a snapshot, by version
+
+    Each retained version costs one small hash per record (the snapshot's
+    record_versions), not a copy of the records. Deltas are memoized per
+    (since, current) pair because every console polling from the same version
+    asks for the same one.
+
+    Record IDs may depend on row position (orders are numbered by sheet row),
+    so the record hashes cover content without the ID: content that moved
+    from one ID to another means rows were inserted or deleted above others,
+    and the delta would be a bogus change of every later record, so the
+    client is told to resync instead.
+    """
+
+    def __init__(self, key_of: Callable[[Dict], str], max_versions: int = 10, max_deltas: int = 32):
+        """
+        Initialize the history
+
+        Args:
+            key_of: Maps a record to its ID (must match the snapshot's record_versions keys)
+            max_versions: Versions retained before the oldest is evicted
+            max_deltas: Computed deltas memoized
+        """
+        self.key_of = key_of
+        self.max_versions = max_versions
+        self.max_deltas = max_deltas
+        self._lock = threading.Lock()
+        self._versions: 'OrderedDict[str, Dict[str, bytes]]' = OrderedDict()
+        self._deltas: 'OrderedDict[tuple, Dict]' = OrderedDict()
+        self._resyncs = 0
+        self._shifts = 0
+
+    def record(self, snapshot):
+        """Retain a snapshot's version (a no-op when it is already retained)"""
+        with self._lock:
+            if snapshot.version in self._versions:
+                return
+            self._versions[snapshot.version] = snapshot.record_versions
+            while len(self._versions) > self.max_versions:
+                evicted, _ = self._versions.popitem(last=False)
+                logger.info(f"Evicted snapshot version {evicted[:8]} from history")
+
+    def changes(self, since: str, snapshot) -> Optional[Dict]:
+        """
+        Records added, changed and removed between a retained version and snapshot
+
+        Returns:
+            Dict with 'added' and 'changed' records and 'removed' IDs, or None
+            when since is no longer retained, or records moved between IDs,
+            and the client must resync
+        """
+        self.record(snapshot)
+        with self._lock:
+            old = self._versions.get(since)
+            if old is None:
+                self._resyncs += 1
+                return None
+            delta = self._deltas.get((since, snapshot.version), _MISSING)
+            if delta is not _MISSING:
+                self._deltas.move_to_end((since, snapshot.version))
+                if delta is None:
+                    self._resyncs += 1
+                return delta
+
+        current = snapshot.record_versions
+        added, changed = [], []
+        for record in snapshot:
+            previous = old.get(self.key_of(record))
+            if previous is None:
+                added.append(record)
+            elif previous != current[self.key_of(record)]:
+                changed.append(record)
+        removed = [key for key in old if key not in current]
+        delta = {'added': added, 'changed': changed, 'removed': removed}
+        
+        # Content that left one ID (changed or removed) and arrived at another (changed or added)
+        departed = {old[self.key_of(record)] for record in changed}
+        departed.update(old[key] for key in removed)
+        if departed and any(current[self.key_of(record)] in departed for records in (changed, added) for record in records):
+            logger.info(f"Records moved between versions {since[:8]} and {snapshot.version[:8]}, client must resync")
+            delta = None
+        
+        with self._lock:
+            self._deltas[(since, snapshot.version)] = delta
+            while len(self._deltas) > self.max_deltas:
+                self._deltas.popitem(last=False)
+            if delta is None:
+                self._resyncs += 1
+                self._shifts += 1
+        return delta
+
+    def stats(self) -> Dict:
+        """Retained versions and resync counters"""
+        with self._lock:
+            return {
+                'versions': len(self._versions),
+                'max_versions': self.max_versions,
+                'deltas': len(self._deltas),
+                'resyncs': self._resyncs,
+                'shifts': self._shifts
+            }
@@ -0,0 +1,68 @@
+# versioning.py
+# Content version hashes for snapshots, used as strong ETags on API responses
+
+import hashlib
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+_DIGEST_SIZE = 12
+_RECORD_DIGEST_SIZE = 8
+
+def _hasher():
+    return hashlib.blake2b(digest_size=_DIGEST_SIZE)
+
+def sorted_items(record: Dict) -> tuple:
+    """A dict record's (key, value) pairs in key order, so field order never changes its version"""
+    return tuple(sorted(record.items()))
+
+def content_versions(records: Iterable[Dict], group_of: Callable[[Dict], str],
+                     key_of: Optional[Callable[[Dict], str]] = None,
+                     values_of: Callable[[Dict], tuple] = sorted_items) -> Tuple[str, Dict[str, str], Dict[str, bytes]]:
+    """
+    Hash a list of records, each group of records within it and (optionally) each record, in one pass
+
+    Each record is hashed once, from the repr of its field values in a fixed
+    order (no JSON serialization); the group and overall versions hash those
+    record digests, and the same digests are returned per record. With key_of,
+    values_of may leave the ID out: record digests then compare content alone
+    (so a record that only changed ID is recognizable), and the ID is hashed
+    into the group and overall versions next to its digest.
+
+    Args:
+        records: Records in the order they are served
+        group_of: Maps a record to the group it is versioned under (e.g. its booth)
+        key_of: Maps a record to its ID; when given, every record's digest is returned too
+        values_of: Maps a record to a tuple of its field values in a fixed order
+            (defaults to sorted_items; OrderRecord passes its slot values)
+
+    Returns:
+        Tuple of (version of all records, {group: version of its records},
+        {record ID: version of the record}); the last is empty without key_of
+    """
+    overall = _hasher()
+    groups = {}
+    record_versions = {}
+    blake2b = hashlib.blake2b
+    for record in records:
+        digest = blake2b(repr(values_of(record)).encode(), digest_size=_RECORD_DIGEST_SIZE).digest()
+        if key_of is not None:
+            key = key_of(record)
+            record_versions[key] = digest
+            digest = key.encode() + digest
+        overall.update(digest)
+        group_key = group_of(record)
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = _hasher()
+        group.update(digest)
+    return overall.hexdigest(), {key: hasher.hexdigest() for key, hasher in groups.items()}, record_versions
+
+def combine_versions(*versions: str) -> str:
+    """Single version for a response built from several versioned sources"""
+    hasher = _hasher()
+    for version in versions:
+        hasher.update(version.encode())
+        hasher.update(b'|')
+    return hasher.hexdigest()
+
+# Version of a group that has no records, so an empty booth still gets a stable ETag
+EMPTY_VERSION = _hasher().hexdigest()